@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Build cache for the DevOps platform
+Content-addressed store of pipeline stage results, keyed by stage inputs
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every existing entry when the key derivation changes
+CACHE_KEY_VERSION = 1
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _expand(patterns: Sequence[str], root: Path) -> List[Path]:
+    """Files under root matching any of the glob patterns, sorted and de-duplicated"""
+    files = set()
+    for pattern in patterns:
+        files.update(path for path in root.glob(pattern) if path.is_file())
+    return sorted(files)
+
+
+class BuildCache:
+    """Local content-addressed cache of stage results with size-based eviction
+
+    Layout under root: objects/<sha256> holds output file contents, shared
+    between entries, and entries/<key>.json records a stage's outputs,
+    log and original duration. Entries are evicted least recently used
+    first once the store exceeds max_bytes.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 512 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def _objects(self) -> Path:
+        return self.root / 'objects'
+
+    @property
+    def _entries(self) -> Path:
+        return self.root / 'entries'
+
+    def stage_key(self, stage, cwd: str = None, dependency_keys: Sequence[str] = ()) -> str:
+        """Hash everything a stage's result depends on
+
+        That is the command, its declared environment, the path and content
+        of every file matching its input patterns, and the keys of the
+        stages it depends on.
+        """
+        root = Path(cwd or os.getcwd())
+        digest = hashlib.sha256()
+        digest.update(json.dumps({
+            'version': CACHE_KEY_VERSION,
+            'command': stage.command,
+            'env': sorted(stage.env.items()),
+            'dependencies': list(dependency_keys)
+        }).encode('utf-8'))
+        for path in _expand(stage.inputs, root):
+            digest.update(f"\0{path.relative_to(root).as_posix()}\0{_file_digest(path)}".encode())
+        return digest.hexdigest()
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the entry stored under key, or None"""
+        manifest = self._entries / f"{key}.json"
+        try:
+            with open(manifest) as f:
+                entry = json.load(f)
+            # Mark as recently used for eviction
+            os.utime(manifest)
+        except (FileNotFoundError, json.JSONDecodeError):
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return entry
+
+    def restore(self, entry: Dict[str, Any], cwd: str = None):
+        """Write an entry's output files back into the workspace"""
+        root = Path(cwd or os.getcwd())
+        for relpath, object_digest in entry['outputs'].items():
+            target = root / relpath
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(self._objects / object_digest, target)
+
+    def store(self, key: str, stage, result: Dict[str, Any], cwd: str = None) -> Dict[str, Any]:
+        """Record a successful stage result and its output files under key"""
+        root = Path(cwd or os.getcwd())
+        self._objects.mkdir(parents=True, exist_ok=True)
+        self._entries.mkdir(parents=True, exist_ok=True)
+
+        outputs = {path: _file_digest(path) for path in _expand(stage.outputs, root)}
+        entry = {
+            'key': key,
+            'stage': stage.name,
+            'outputs': {path.relative_to(root).as_posix(): object_digest
+                        for path, object_digest in outputs.items()},
+            'output': result.get('output', ''),
+            'duration': result['duration'],
+            'created_at': time.time()
+        }
+
+        # Under the lock so eviction never sees objects before their manifest
+        with self._lock:
+            for path, object_digest in outputs.items():
+                target = self._objects / object_digest
+                if not target.exists():
+                    self._write_atomic(target, path.read_bytes())
+            self._write_atomic(self._entries / f"{key}.json", json.dumps(entry).encode('utf-8'))
+            self._evict()
+        return entry
+
+    def _write_atomic(self, target: Path, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, target)
+
+    def _usage(self):
+        manifests = sorted(self._entries.glob('*.json'), key=lambda p: p.stat().st_mtime) \
+            if self._entries.exists() else []
+        objects = {p.name: p.stat().st_size for p in self._objects.iterdir()
+                   if not p.name.startswith('.tmp-')} if self._objects.exists() else {}
+        size = sum(objects.values()) + sum(p.stat().st_size for p in manifests)
+        return manifests, objects, size
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the store fits max_bytes
+
+        Objects are reference counted across entries and deleted with the
+        last entry that refers to them. Returns the number of entries evicted.
+        """
+        with self._lock:
+            return self._evict()
+
+    def _evict(self) -> int:
+        manifests, objects, size = self._usage()
+        if size <= self.max_bytes:
+            return 0
+
+        references = Counter()
+        outputs_of = {}
+        for manifest in manifests:
+            with open(manifest) as f:
+                outputs_of[manifest] = set(json.load(f)['outputs'].values())
+            references.update(outputs_of[manifest])
+
+        def drop_object(object_digest):
+            nonlocal size
+            if object_digest in objects:
+                (self._objects / object_digest).unlink()
+                size -= objects.pop(object_digest)
+
+        # Leftovers from interrupted stores
+        for object_digest in [d for d in objects if d not in references]:
+            drop_object(object_digest)
+
+        evicted = 0
+        while manifests and size > self.max_bytes:
+            manifest = manifests.pop(0)
+            size -= manifest.stat().st_size
+            manifest.unlink()
+            evicted += 1
+            for object_digest in outputs_of[manifest]:
+                references[object_digest] -= 1
+                if references[object_digest] == 0:
+                    drop_object(object_digest)
+
+        self._evictions += evicted
+        logger.info(f"Build cache evicted {evicted} entries")
+        return evicted
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get entry count, store size and hit/miss counters"""
+        with self._lock:
+            manifests, objects, size = self._usage()
+            lookups = self._hits + self._misses
+            return {
+                'root': str(self.root),
+                'entries': len(manifests),
+                'objects': len(objects),
+                'bytes': size,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'hit_rate': (self._hits / lookups * 100) if lookups > 0 else 0
+            }
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Capacity planning for the DevOps platform
+Sizes the EKS node group and RDS instance from measured load and a target request rate
+"""
+
+import math
+from typing import Dict, List, Any, Tuple
+
+# vCPU, memory GiB, on-demand USD/hour (us-west-2), max pods with the VPC CNI,
+# and sustained CPU baseline per vCPU (burstable types only)
+INSTANCE_TYPES = {
+    't3.medium': (2, 4, 0.0416, 17, 0.2),
+    't3.large': (2, 8, 0.0832, 35, 0.3),
+    't3.xlarge': (4, 16, 0.1664, 58, 0.4),
+    'm5.large': (2, 8, 0.096, 29, 1.0),
+    'm5.xlarge': (4, 16, 0.192, 58, 1.0),
+    'm5.2xlarge': (8, 32, 0.384, 58, 1.0),
+    'c5.xlarge': (4, 8, 0.17, 58, 1.0),
+    'c5.2xlarge': (8, 16, 0.34, 58, 1.0),
+}
+
+# Smallest first: class, vCPU, memory GiB, sustained CPU baseline per vCPU
+RDS_INSTANCE_CLASSES = [
+    ('db.t3.micro', 2, 1, 0.1),
+    ('db.t3.small', 2, 2, 0.2),
+    ('db.t3.medium', 2, 4, 0.2),
+    ('db.m5.large', 2, 8, 1.0),
+    ('db.m5.xlarge', 4, 16, 1.0),
+    ('db.m5.2xlarge', 8, 32, 1.0),
+    ('db.m5.4xlarge', 16, 64, 1.0),
+]
+
+# RDS PostgreSQL default: max_connections = DBInstanceClassMemory / 9531392
+RDS_BYTES_PER_CONNECTION = 9531392
+
+# Tunables plan_capacity accepts besides measurements and target_rps
+PLAN_OPTIONS = ('measured_cores', 'target_utilization', 'burst_factor', 'pod_cpu',
+                'pod_concurrency', 'memory_headroom', 'min_replicas', 'min_nodes', 'db_pool_size')
+
+# Per-node CPU (cores) and memory (GiB) taken by aws-node, kube-proxy and CoreDNS
+SYSTEM_POD_CPU = 0.2
+SYSTEM_POD_MEMORY_GIB = 0.3
+SYSTEM_PODS_PER_NODE = 3
+
+
+def eks_allocatable(instance_type: str) -> Tuple[float, float]:
+    """Cores and GiB left for pods after the EKS AMI's kubelet reservations"""
+    vcpu, memory_gib, _, max_pods, _ = INSTANCE_TYPES[instance_type]
+    reserved_millicores = 0
+    for core in range(vcpu):
+        reserved_millicores += (60, 10, 5, 5)[core] if core < 4 else 2.5
+    reserved_memory_mib = 255 + 11 * max_pods
+    # Plus the 100Mi hard eviction threshold
+    return vcpu - reserved_millicores / 1000, memory_gib - (reserved_memory_mib + 100) / 1024
+
+
+def _number(value, what: str, positive: bool = True) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or \
+            not math.isfinite(value) or value < 0 or (positive and value == 0):
+        raise ValueError(f"{what} must be a {'positive' if positive else 'non-negative'} number")
+    return float(value)
+
+
+def _count(value, what: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ValueError(f"{what} must be a non-negative integer")
+    return value
+
+
+def measured_load(measurements: Dict[str, Any], measured_cores: float = 1) -> Dict[str, float]:
+    """Throughput, CPU, memory and latency figures from PerformanceTest results
+
+    Throughput comes from the load simulation (or the concurrent test),
+    CPU from the average utilisation of measured_cores cores, memory from
+    the process RSS and DB time from the per-query latency. Missing,
+    non-numeric or out-of-range figures raise ValueError.
+    """
+    load = measurements.get('load_simulation') or {}
+    concurrent = measurements.get('concurrent') or {}
+    throughput = load.get('operations_per_second') or concurrent.get('throughput')
+    if isinstance(throughput, bool) or not isinstance(throughput, (int, float)) or \
+            not throughput > 0:
+        raise ValueError("Measurements need load_simulation.operations_per_second "
+                         "or concurrent.throughput")
+    measured_cores = _number(measured_cores, 'measured_cores')
+
+    cpu = measurements.get('cpu') or {}
+    memory = measurements.get('memory') or {}
+    database = measurements.get('database') or {}
+    if 'average_execution_time' in concurrent:
+        latency = _number(concurrent['average_execution_time'],
+                          'concurrent.average_execution_time')
+    elif load.get('operations_completed'):
+        if 'duration' not in load:
+            raise ValueError("load_simulation.operations_completed needs its duration")
+        latency = (_number(load['duration'], 'load_simulation.duration') /
+                   _number(load['operations_completed'], 'load_simulation.operations_completed'))
+    else:
+        latency = 1 / throughput
+    return {
+        'throughput_rps': float(throughput),
+        'cpu_cores': _number(cpu.get('average_percent', 100.0), 'cpu.average_percent',
+                             positive=False) / 100 * measured_cores,
+        'rss_mb': _number(memory.get('rss_mb', 256.0), 'memory.rss_mb'),
+        'latency_seconds': latency,
+        'db_seconds_per_request': _number(database.get('query_time', 0.0),
+                                          'database.query_time', positive=False)
+    }
+
+
+def _node_options(pod_cpu: float, pod_memory_gib: float, replicas: int,
+                  min_nodes: int) -> List[Dict[str, Any]]:
+    options = []
+    for instance_type, (vcpu, _, hourly, max_pods, baseline) in INSTANCE_TYPES.items():
+        cpu, memory = eks_allocatable(instance_type)
+        # Burstable types can only sustain their baseline without spending credits
+        cpu = min(cpu, vcpu * baseline) - SYSTEM_POD_CPU
+        memory -= SYSTEM_POD_MEMORY_GIB
+        pods_per_node = min(int(cpu // pod_cpu), int(memory // pod_memory_gib),
+                            max_pods - SYSTEM_PODS_PER_NODE)
+        if pods_per_node < 1:
+            continue
+        nodes = max(min_nodes, math.ceil(replicas / pods_per_node))
+        options.append({
+            'instance_type': instance_type,
+            'pods_per_node': pods_per_node,
+            'nodes': nodes,
+            'hourly_cost': round(nodes * hourly, 4)
+        })
+    return sorted(options, key=lambda option: (option['hourly_cost'], option['nodes']))
+
+
+def _rds_class(vcpu_required: float, connections: int) -> Tuple[str, List[str]]:
+    reasons = []
+    for instance_class, vcpu, memory_gib, baseline in RDS_INSTANCE_CLASSES:
+        max_connections = int(memory_gib * 1024 ** 3 // RDS_BYTES_PER_CONNECTION)
+        if vcpu * baseline >= vcpu_required and max_connections >= connections:
+            return instance_class, reasons
+        reasons.append(f"{instance_class} too small: {vcpu * baseline:g} sustained vCPU, "
+                       f"{max_connections} max_connections")
+    raise ValueError(f"No RDS class sustains {vcpu_required:.2f} vCPU "
+                     f"with {connections} connections")
+
+
+def plan_capacity(measurements: Dict[str, Any], target_rps: float, measured_cores: float = 1,
+                  target_utilization: float = 0.6, burst_factor: float = 2.0,
+                  pod_cpu: float = 1.0, pod_concurrency: int = 8, memory_headroom: float = 1.3,
+                  min_replicas: int = 2, min_nodes: int = 2,
+                  db_pool_size: int = 10) -> Dict[str, Any]:
+    """Node group and database sizing for target_rps, with the reasoning behind it
+
+    One pod is modelled as the measured process given pod_cpu cores: it
+    serves target_utilization of whichever limit it hits first, CPU
+    (cores per request from the measurement) or concurrency (Little's law:
+    pod_concurrency in-flight requests at the measured latency). The node
+    group is the cheapest instance type that fits the replicas, scaling up
+    to burst_factor times the target. The database must sustain the DB
+    time of every request and a db_pool_size connection pool per pod at
+    peak.
+    """
+    _number(target_rps, 'target_rps')
+    if not 0 < _number(target_utilization, 'target_utilization') <= 1:
+        raise ValueError("target_utilization must be in (0, 1]")
+    if _number(burst_factor, 'burst_factor') < 1:
+        raise ValueError("burst_factor must be at least 1")
+    _number(pod_cpu, 'pod_cpu')
+    _number(memory_headroom, 'memory_headroom')
+    if _count(pod_concurrency, 'pod_concurrency') == 0:
+        raise ValueError("pod_concurrency must be at least 1")
+    for value, what in ((min_replicas, 'min_replicas'), (min_nodes, 'min_nodes'),
+                        (db_pool_size, 'db_pool_size')):
+        _count(value, what)
+
+    load = measured_load(measurements, measured_cores)
+    rationale = []
+
+    cpu_per_request = load['cpu_cores'] / load['throughput_rps']
+    cpu_bound_rps = pod_cpu / cpu_per_request if cpu_per_request > 0 else math.inf
+    concurrency_bound_rps = pod_concurrency / load['latency_seconds']
+    pod_rps = min(cpu_bound_rps, concurrency_bound_rps) * target_utilization
+    limit = 'cpu' if cpu_bound_rps <= concurrency_bound_rps else 'concurrency'
+    rationale.append(
+        f"Measured {load['throughput_rps']:.1f} req/s using {load['cpu_cores']:.2f} cores: "
+        f"{cpu_per_request * 1000:.2f} ms CPU per request"
+    )
+    rationale.append(
+        f"A {pod_cpu:g}-core pod is {limit}-bound at "
+        f"{min(cpu_bound_rps, concurrency_bound_rps):.1f} req/s; planned at "
+        f"{target_utilization:.0%} utilisation = {pod_rps:.1f} req/s"
+    )
+
+    replicas = max(min_replicas, math.ceil(target_rps / pod_rps))
+    burst_replicas = max(replicas, math.ceil(target_rps * burst_factor / pod_rps))
+    pod_memory_gib = load['rss_mb'] * memory_headroom / 1024
+    rationale.append(
+        f"{target_rps:g} req/s needs {replicas} replicas ({burst_replicas} at "
+        f"{burst_factor:g}x burst), each requesting {pod_cpu:g} cores and "
+        f"{pod_memory_gib * 1024:.0f} MiB ({memory_headroom:g}x measured RSS)"
+    )
+
+    options = _node_options(pod_cpu, pod_memory_gib, replicas, min_nodes)
+    if not options:
+        raise ValueError(f"No instance type fits a pod of {pod_cpu:g} cores "
+                         f"and {pod_memory_gib:.1f} GiB")
+    chosen = options[0]
+    max_nodes = max(chosen['nodes'] + 1, math.ceil(burst_replicas / chosen['pods_per_node']))
+    rationale.append(
+        f"{chosen['instance_type']} fits {chosen['pods_per_node']} pods per node: "
+        f"{chosen['nodes']} nodes at ${chosen['hourly_cost']}/h is the cheapest of "
+        f"{len(options)} fitting types; scales to {max_nodes} nodes for burst"
+    )
+
+    db_vcpu = target_rps * burst_factor * load['db_seconds_per_request'] / target_utilization
+    connections = burst_replicas * db_pool_size
+    db_class, rejected = _rds_class(db_vcpu, connections)
+    rationale.extend(rejected)
+    rationale.append(
+        f"{db_class}: peak DB time needs {db_vcpu:.2f} sustained vCPU and "
+        f"{burst_replicas} pods x {db_pool_size} pooled connections = {connections}"
+    )
+
+    return {
+        'target_rps': target_rps,
+        'measured': load,
+        'pods': {
+            'replicas': replicas,
+            'burst_replicas': burst_replicas,
+            'cpu': pod_cpu,
+            'memory_mib': round(pod_memory_gib * 1024),
+            'capacity_rps': round(pod_rps, 2),
+            'limited_by': limit
+        },
+        'nodes': {**chosen, 'max_nodes': max_nodes, 'alternatives': options[1:4]},
+        'database': {
+            'instance_class': db_class,
+            'vcpu_required': round(db_vcpu, 3),
+            'connections': connections
+        },
+        'sizing': {
+            'desired_size': chosen['nodes'],
+            'min_size': min(min_nodes, chosen['nodes']),
+            'max_size': max_nodes,
+            'instance_types': [chosen['instance_type']],
+            'db_instance_class': db_class
+        },
+        'rationale': rationale
+    }
@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""
+Database connection management for the DevOps platform
+Pooled SQLite connections tuned for concurrent API traffic
+"""
+
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterator, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteFileBackend:
+    """SQLite database file on disk, journaled in WAL mode"""
+
+    name = 'sqlite'
+    # WAL lets readers run alongside the writer; SQLite's busy handler
+    # queues concurrent writers
+    serialize_writes = False
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def connect(self, timeout: float):
+        return sqlite3.connect(self.path, timeout=timeout, check_same_thread=False,
+                               isolation_level=None)
+
+    def configure(self, conn):
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+
+    def describe(self) -> str:
+        return f"sqlite:///{self.path}"
+
+    def close(self):
+        pass
+
+
+class _SharedCacheCursor(sqlite3.Cursor):
+    """Cursor that waits out shared-cache table locks
+
+    Shared-cache locks are table-level and fail at once with
+    SQLITE_LOCKED instead of going through busy_timeout, so a statement
+    that conflicts with another connection's transaction is retried
+    until the connection's lock_timeout. Only statements that changed
+    nothing before failing are retried.
+    """
+
+    def _retry(self, method, *args):
+        deadline = time.monotonic() + self.connection.lock_timeout
+        delay = 0.001
+        while True:
+            changes = self.connection.total_changes
+            try:
+                return method(*args)
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) or self.connection.total_changes != changes \
+                        or time.monotonic() >= deadline:
+                    raise
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+    def execute(self, sql, parameters=()):
+        return self._retry(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        # A list, so a retry can replay it
+        return self._retry(super().executemany, sql, list(seq_of_parameters))
+
+
+class _SharedCacheConnection(sqlite3.Connection):
+    lock_timeout = 5.0
+
+    def cursor(self, factory=_SharedCacheCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+class SQLiteMemoryBackend:
+    """Shared-cache in-memory SQLite database; nothing touches disk
+
+    The database lives as long as one connection to it is open, so the
+    backend keeps an anchor connection until close(). Shared-cache locks
+    are table-level and bypass busy_timeout, so the pool serializes
+    writers itself and a reader conflicting with a write transaction
+    waits for it to finish. Reads only ever see committed data, except on
+    connections borrowed with reporting=True. Meant for ephemeral
+    environments and tests.
+    """
+
+    name = 'memory'
+    serialize_writes = True
+
+    def __init__(self, database_name: str = None):
+        self.database_name = database_name or f"devops-{uuid.uuid4().hex}"
+        self.uri = f"file:{self.database_name}?mode=memory&cache=shared"
+        self._anchor = self.connect(timeout=5.0)
+
+    def connect(self, timeout: float):
+        conn = sqlite3.connect(self.uri, uri=True, timeout=timeout, check_same_thread=False,
+                               isolation_level=None, factory=_SharedCacheConnection)
+        conn.lock_timeout = timeout
+        return conn
+
+    def configure(self, conn):
+        pass
+
+    def describe(self) -> str:
+        return f"memory://{self.database_name}"
+
+    def close(self):
+        if self._anchor is not None:
+            self._anchor.close()
+            self._anchor = None
+
+
+def create_backend(database_url: str):
+    """Create a storage backend from a database URL
+
+    'memory://' or 'memory://<name>' (also ':memory:') selects the
+    in-memory backend; 'sqlite:///<path>' or a plain path selects a file.
+    """
+    if database_url == ':memory:':
+        return SQLiteMemoryBackend()
+    if database_url.startswith('memory://'):
+        return SQLiteMemoryBackend(database_url[len('memory://'):] or None)
+    if database_url.startswith('sqlite:///'):
+        return SQLiteFileBackend(database_url[len('sqlite:///'):])
+    return SQLiteFileBackend(database_url)
+
+
+class ConnectionPool:
+    """Thread-safe pool of SQLite connections over a storage backend"""
+
+    def __init__(self, db_path, max_connections: int = 5,
+                 busy_timeout_ms: int = 5000, acquire_timeout: float = 30.0,
+                 cache_size_kb: int = 8192, lock_wait_threshold: float = 0.001):
+        # db_path is a database URL/path or an already constructed backend
+        self.backend = create_backend(db_path) if isinstance(db_path, str) else db_path
+        self.db_path = db_path
+        self.max_connections = max_connections
+        self.busy_timeout_ms = busy_timeout_ms
+        self.acquire_timeout = acquire_timeout
+        self.cache_size_kb = cache_size_kb
+        self.lock_wait_threshold = lock_wait_threshold
+        # Called as observer(kind, seconds, failed) after each read ('read')
+        # or write ('write') block, e.g. by metrics.instrument_pool
+        self.observer = None
+
+        # LIFO so the most recently used (warmest) connection is reused first
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'pool_waits': 0,
+            'lock_waits': 0,
+            'lock_wait_seconds': 0.0,
+            'lock_timeouts': 0
+        }
+
+    def _create_connection(self):
+        """Open a new connection and apply the tuned pragmas"""
+        # Autocommit: transactions are managed explicitly
+        conn = self.backend.connect(timeout=self.busy_timeout_ms / 1000)
+        self.backend.configure(conn)
+        conn.execute(f'PRAGMA busy_timeout = {int(self.busy_timeout_ms)}')
+        conn.execute(f'PRAGMA cache_size = -{int(self.cache_size_kb)}')
+        conn.execute('PRAGMA temp_store = MEMORY')
+        return conn
+
+    def _increment(self, counter: str, amount=1):
+        with self._lock:
+            self._stats[counter] += amount
+
+    def acquire(self):
+        """Check a connection out of the pool"""
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        try:
+            conn = self._idle.get_nowait()
+            self._increment('hits')
+            return conn
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.max_connections
+            if can_create:
+                self._created += 1
+                self._stats['misses'] += 1
+
+        if can_create:
+            try:
+                return self._create_connection()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        # Pool exhausted: wait for another thread to return a connection
+        self._increment('pool_waits')
+        try:
+            return self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"Timed out after {self.acquire_timeout}s waiting for a database connection"
+            )
+
+    def release(self, conn):
+        """Return a connection to the pool"""
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+            with self._lock:
+                self._created -= 1
+            return
+        self._idle.put(conn)
+
+    def _observe(self, kind: str, start_time: float, failed: bool):
+        observer = self.observer
+        if observer is not None:
+            observer(kind, time.perf_counter() - start_time, failed)
+
+    @contextmanager
+    def connection(self, reporting: bool = False):
+        """Borrow a connection for reads (autocommit)
+
+        reporting=True is for long read-only scans such as exports: on the
+        shared-cache memory backend they read uncommitted, so they hold no
+        table locks that writers would wait on, and may see rows a write
+        later rolls back. Never use it for reads that feed a decision or
+        a write. WAL databases ignore it; their readers never block.
+        """
+        start_time = time.perf_counter()
+        conn = self.acquire()
+        failed = True
+        try:
+            if reporting:
+                conn.execute('PRAGMA read_uncommitted = true')
+            yield conn
+            failed = False
+        finally:
+            if reporting:
+                conn.execute('PRAGMA read_uncommitted = false')
+            self.release(conn)
+            self._observe('read', start_time, failed)
+
+    @contextmanager
+    def transaction(self):
+        """Borrow a connection inside a write transaction, committed on success"""
+        block_start = time.perf_counter()
+        conn = self.acquire()
+        write_lock = self._write_lock if self.backend.serialize_writes else None
+        locked = False
+        failed = True
+        try:
+            start_time = time.perf_counter()
+            if write_lock is not None:
+                locked = write_lock.acquire(timeout=self.busy_timeout_ms / 1000)
+                if not locked:
+                    self._increment('lock_timeouts')
+                    raise sqlite3.OperationalError("database is locked")
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+            except sqlite3.OperationalError as e:
+                if 'locked' in str(e):
+                    self._increment('lock_timeouts')
+                raise
+            waited = time.perf_counter() - start_time
+            if waited > self.lock_wait_threshold:
+                with self._lock:
+                    self._stats['lock_waits'] += 1
+                    self._stats['lock_wait_seconds'] += waited
+
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+                failed = False
+        finally:
+            if locked:
+                write_lock.release()
+            self.release(conn)
+            self._observe('write', block_start, failed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['connections'] = self._created
+        stats['idle'] = self._idle.qsize()
+        stats['max_connections'] = self.max_connections
+        stats['backend'] = self.backend.name
+        requests = stats['hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] / requests * 100) if requests > 0 else 0
+        return stats
+
+    def close(self):
+        """Close all idle connections; busy ones are closed on release"""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+        self.backend.close()
+        logger.info("Database connection pool closed")
+
+
+class DirectWriter:
+    """Runs each write operation immediately in its own transaction"""
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    def submit(self, operation: Callable) -> Future:
+        """Run operation(conn) in a transaction; returns an already resolved future"""
+        future = Future()
+        try:
+            with self.pool.transaction() as conn:
+                result = operation(conn)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        return {'mode': 'direct'}
+
+    def close(self):
+        pass
+
+
+class WriteBehindQueue:
+    """Bounded write queue drained by a single writer thread
+
+    SQLite allows one writer at a time, so instead of every request thread
+    committing on its own, operations are queued and one thread applies
+    them in group-committed transactions of up to max_batch_size. Each
+    operation runs in its own savepoint, so a failing one only fails its
+    own future. submit() blocks while the queue is full (backpressure) and
+    raises TimeoutError after put_timeout seconds. Queued writes are
+    flushed on close() and at interpreter exit.
+    """
+
+    _STOP = object()
+
+    def __init__(self, pool: ConnectionPool, max_queue_size: int = 10000,
+                 max_batch_size: int = 500, put_timeout: float = 30.0):
+        self.pool = pool
+        self.max_queue_size = max_queue_size
+        self.max_batch_size = max_batch_size
+        self.put_timeout = put_timeout
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        # Held from the closed check to the put, so nothing is queued after _STOP;
+        # separate from _lock, which the writer thread needs while submit() waits
+        self._submit_lock = threading.Lock()
+        self._closed = False
+        self._stats = {
+            'submitted': 0,
+            'committed': 0,
+            'failed': 0,
+            'batches': 0,
+            'max_batch_size_seen': 0,
+            'backpressure_waits': 0,
+            'rejected': 0
+        }
+        self._thread = threading.Thread(target=self._run, name='sqlite-write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, operation: Callable) -> Future:
+        """Queue operation(conn); the future resolves once its batch commits"""
+        future = Future()
+        item = (future, operation)
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("Write-behind queue is closed")
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                with self._lock:
+                    self._stats['backpressure_waits'] += 1
+                try:
+                    self._queue.put(item, timeout=self.put_timeout)
+                except queue.Full:
+                    with self._lock:
+                        self._stats['rejected'] += 1
+                    raise TimeoutError(
+                        f"Write queue full ({self.max_queue_size} pending) for {self.put_timeout}s"
+                    )
+
+        with self._lock:
+            self._stats['submitted'] += 1
+        return future
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                self._queue.task_done()
+                return
+
+            batch = [item]
+            stop = False
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop = True
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+
+            self._commit_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _commit_batch(self, batch):
+        results = []
+        failed = 0
+        try:
+            with self.pool.transaction() as conn:
+                for future, operation in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    conn.execute('SAVEPOINT write_behind_op')
+                    try:
+                        result = operation(conn)
+                    except Exception as e:
+                        conn.execute('ROLLBACK TO write_behind_op')
+                        conn.execute('RELEASE write_behind_op')
+                        future.set_exception(e)
+                        failed += 1
+                    else:
+                        conn.execute('RELEASE write_behind_op')
+                        results.append((future, result))
+        except Exception as e:
+            # BEGIN, a savepoint or the commit failed: nothing in this batch was
+            # written, including operations that never got to run
+            logger.error(f"Write-behind batch of {len(batch)} failed: {e}")
+            for future, _ in batch:
+                if future.done():
+                    continue
+                if future.running() or future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+                    failed += 1
+            results = []
+
+        for future, result in results:
+            future.set_result(result)
+
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['committed'] += len(results)
+            self._stats['failed'] += failed
+            self._stats['max_batch_size_seen'] = max(self._stats['max_batch_size_seen'], len(batch))
+
+    def flush(self):
+        """Block until every queued write has been committed"""
+        self._queue.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue depth and batching counters"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['mode'] = 'write_behind'
+        stats['queue_depth'] = self._queue.qsize()
+        stats['max_queue_size'] = self.max_queue_size
+        stats['average_batch_size'] = (
+            (stats['committed'] + stats['failed']) / stats['batches'] if stats['batches'] else 0
+        )
+        return stats
+
+    def close(self):
+        """Flush queued writes and stop the writer thread"""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(self._STOP)
+        self._thread.join()
+        atexit.unregister(self.close)
+        logger.info("Write-behind queue flushed and closed")
+
+
+def iter_keyset(pool: ConnectionPool, table: str, columns: Sequence[str], after_id: int = 0,
+                where: str = None, params: Sequence = (), batch_size: int = 500,
+                page_size: int = 5000) -> Iterator[tuple]:
+    """Stream rows of a table in id order without loading them into memory
+
+    Rows come from a cursor drained with fetchmany(batch_size). Every
+    page_size rows the connection goes back to the pool and the next page
+    resumes from the last id seen, so long exports neither pin a pooled
+    connection nor hold one read transaction open for their whole run.
+    Pages are read on reporting connections, so on the memory backend a
+    long export never holds up writers.
+    The first column must be the table's integer id.
+    """
+    condition = f"AND ({where})" if where else ''
+    sql = f'''
+        SELECT {', '.join(columns)} FROM {table}
+        WHERE id > ? {condition}
+        ORDER BY id LIMIT ?
+    '''
+    last_id = after_id
+    while True:
+        page_rows = 0
+        with pool.connection(reporting=True) as conn:
+            cursor = conn.execute(sql, (last_id, *params, page_size))
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield row
+                    page_rows += len(rows)
+                    last_id = rows[-1][0]
+            finally:
+                # Finalize the statement before the connection is reused,
+                # including when the consumer stops reading early
+                cursor.close()
+        if page_rows < page_size:
+            return
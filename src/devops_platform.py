@@ -16,134 +16,266 @@ IBM DevOps and Software Engineering Professional Certificate including:
 import os
 import sys
 import json
+import hashlib
+import argparse
+import io
 import logging
+import re
 import subprocess
-import sqlite3
+import tarfile
+import time
+import zlib
+import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
-from flask import Flask, request, jsonify
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import count, islice
+from typing import Dict, List, Any, Iterable, Iterator, Tuple, Union
+from flask import Flask, Response, request, jsonify
 import yaml
 
+from build_cache import BuildCache
+from capacity_planner import PLAN_OPTIONS, plan_capacity
+from cache import LRUCache
+from database import ConnectionPool, DirectWriter, WriteBehindQueue, iter_keyset
+from metrics import (CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry, instrument_app,
+                     instrument_pool)
+from migrations import migrate, current_version, SPRINT_ROLLUP_SOURCE_SQL
+from pipeline_registry import PipelineRegistry
+from pipeline_runner import PipelineDAG, PipelineRunner, default_stages, format_report
+from prometheus_rules import validate_rules
+from prometheus_sharding import MAX_SHARDS, estimate_series_per_shard
+from report_ingestion import ReportStore
+from shard_planner import durations_from_junit, plan_shards
+from template_store import TemplateStore
+import terraform_analysis
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Platform configuration, overridable through the environment.
+# DEVOPS_DATABASE_URL: a file path / 'sqlite:///<path>', or 'memory://' for
+# an in-memory database (ephemeral previews, test runs)
+DATABASE_URL = os.environ.get('DEVOPS_DATABASE_URL', 'devops_platform.db')
+WRITE_BEHIND = os.environ.get('DEVOPS_WRITE_BEHIND', '').lower() in ('1', 'true', 'yes')
+PIPELINE_CACHE_SIZE = int(os.environ.get('DEVOPS_PIPELINE_CACHE_SIZE', '256'))
+BUILD_CACHE_DIR = os.environ.get('DEVOPS_BUILD_CACHE_DIR', '.build-cache')
+BUILD_CACHE_MB = int(os.environ.get('DEVOPS_BUILD_CACHE_MB', '512'))
+# DEVOPS_TEMPLATE_STORE_DIR: persist generated Terraform files there; unset keeps them in memory
+TEMPLATE_STORE_DIR = os.environ.get('DEVOPS_TEMPLATE_STORE_DIR') or None
+TEMPLATE_CACHE_MB = int(os.environ.get('DEVOPS_TEMPLATE_CACHE_MB', '16'))
+
 class AgileProjectManager:
     """Agile project management and tracking"""
     
-    def __init__(self, db_path='devops_platform.db'):
+    STORY_COLUMNS = ('id', 'sprint_id', 'title', 'description', 'story_points',
+                     'priority', 'status', 'assigned_to', 'created_at')
+    
+    def __init__(self, db_path='devops_platform.db', pool_size: int = 5,
+                 busy_timeout_ms: int = 5000, write_behind: bool = False,
+                 write_queue_size: int = 10000, write_batch_size: int = 500):
+        # db_path accepts any database URL understood by database.create_backend
         self.db_path = db_path
+        self.pool = ConnectionPool(db_path, max_connections=pool_size,
+                                   busy_timeout_ms=busy_timeout_ms)
+        self._burndown_cache = {}
         self.init_database()
+        
+        # Writes either commit inline or go through a single batching writer thread
+        if write_behind:
+            self.writer = WriteBehindQueue(self.pool, max_queue_size=write_queue_size,
+                                           max_batch_size=write_batch_size)
+        else:
+            self.writer = DirectWriter(self.pool)
+    
+    def _write(self, operation, wait: bool = True):
+        """Submit operation(conn) to the writer; returns its result, or a Future if not waiting"""
+        future = self.writer.submit(operation)
+        return future.result() if wait else future
+    
+    def _check_sprint_open(self, cursor, sprint_id: int = None, story_id: int = None):
+        """Raise ValueError if the sprint, or the story's sprint, is closed
+        
+        Called inside write operations: the write lock is held, so the
+        sprint cannot be closed between the check and the write.
+        """
+        if story_id is not None:
+            row = cursor.execute('''
+                SELECT s.id, s.status FROM user_stories u JOIN sprints s ON s.id = u.sprint_id
+                WHERE u.id = ?
+            ''', (story_id,)).fetchone()
+        else:
+            row = cursor.execute('SELECT id, status FROM sprints WHERE id = ?',
+                                 (sprint_id,)).fetchone()
+        if row and row[1] == 'closed':
+            raise ValueError(f"Sprint {row[0]} is closed; its stories can no longer change")
     
     def init_database(self):
         """Initialize project management database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS sprints (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                sprint_name TEXT NOT NULL,
-                start_date DATE NOT NULL,
-                end_date DATE NOT NULL,
-                status TEXT DEFAULT 'planning',
-                velocity INTEGER DEFAULT 0,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_stories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                sprint_id INTEGER,
-                title TEXT NOT NULL,
-                description TEXT,
-                story_points INTEGER DEFAULT 1,
-                priority TEXT DEFAULT 'medium',
-                status TEXT DEFAULT 'backlog',
-                assigned_to TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (sprint_id) REFERENCES sprints (id)
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS deployments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                application_name TEXT NOT NULL,
-                version TEXT NOT NULL,
-                environment TEXT NOT NULL,
-                status TEXT DEFAULT 'pending',
-                deployed_at DATETIME,
-                rollback_version TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
-        logger.info("DevOps platform database initialized")
+        applied = migrate(self.pool)
+        logger.info(f"DevOps platform database initialized "
+                    f"(schema version {self.get_schema_version()}, {len(applied)} migrations applied)")
+    
+    def get_schema_version(self) -> int:
+        """Get the current database schema version"""
+        with self.pool.connection() as conn:
+            return current_version(conn)
     
-    def create_sprint(self, sprint_name: str, duration_weeks: int = 2):
-        """Create a new sprint"""
+    def create_sprint(self, sprint_name: str, duration_weeks: int = 2,
+                      wait: bool = True) -> Union[int, Future]:
+        """Create a new sprint
+        
+        Returns the sprint ID, or with wait=False a Future resolving to it.
+        """
         start_date = datetime.now().date()
         end_date = start_date + timedelta(weeks=duration_weeks)
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        def operation(conn):
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO sprints (sprint_name, start_date, end_date, velocity)
+                VALUES (?, ?, ?, NULL)
+            ''', (sprint_name, start_date.isoformat(), end_date.isoformat()))
+            sprint_id = cursor.lastrowid
+            logger.info(f"Sprint created: {sprint_name} (ID: {sprint_id})")
+            return sprint_id
         
-        cursor.execute('''
-            INSERT INTO sprints (sprint_name, start_date, end_date)
-            VALUES (?, ?, ?)
-        ''', (sprint_name, start_date, end_date))
+        return self._write(operation, wait)
+    
+    def add_user_story(self, sprint_id: int, title: str, description: str, 
+                      story_points: int = 1, priority: str = 'medium',
+                      wait: bool = True) -> Union[int, Future]:
+        """Add user story to sprint
         
-        sprint_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        Returns the story ID, or with wait=False a Future resolving to it.
+        """
+        def operation(conn):
+            cursor = conn.cursor()
+            self._check_sprint_open(cursor, sprint_id)
+            cursor.execute('''
+                INSERT INTO user_stories 
+                (sprint_id, title, description, story_points, priority)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (sprint_id, title, description, story_points, priority))
+            story_id = cursor.lastrowid
+            logger.info(f"User story added: {title} (ID: {story_id})")
+            return story_id
         
-        logger.info(f"Sprint created: {sprint_name} (ID: {sprint_id})")
-        return sprint_id
+        return self._write(operation, wait)
     
-    def add_user_story(self, sprint_id: int, title: str, description: str, 
-                      story_points: int = 1, priority: str = 'medium'):
-        """Add user story to sprint"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def add_user_stories(self, sprint_id: int, stories: List[Dict[str, Any]],
+                         chunk_size: int = None) -> List[int]:
+        """Add many user stories to a sprint in a single transaction
+        
+        Each story is a dict with 'title' and optional 'description',
+        'points' (or 'story_points') and 'priority'. When chunk_size is
+        given, every chunk is committed in its own transaction.
+        Returns the assigned story IDs in input order.
+        """
+        if chunk_size is not None and (isinstance(chunk_size, bool) or
+                                       not isinstance(chunk_size, int) or chunk_size < 1):
+            raise ValueError("chunk_size must be a positive integer")
+        
+        rows = []
+        for story in stories:
+            if not isinstance(story, dict) or not story.get('title'):
+                raise ValueError("Every user story needs a title")
+            points = story.get('points', story.get('story_points', 1))
+            if isinstance(points, bool) or not isinstance(points, int) or points < 0:
+                raise ValueError(f"Story points of '{story['title']}' must be a "
+                                 "non-negative integer")
+            rows.append((
+                sprint_id,
+                story['title'],
+                story.get('description', ''),
+                points,
+                story.get('priority', 'medium')
+            ))
+        
+        if not rows:
+            return []
         
-        cursor.execute('''
-            INSERT INTO user_stories 
-            (sprint_id, title, description, story_points, priority)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (sprint_id, title, description, story_points, priority))
+        def insert_chunk(chunk):
+            def operation(conn):
+                cursor = conn.cursor()
+                self._check_sprint_open(cursor, sprint_id)
+                cursor.executemany('''
+                    INSERT INTO user_stories 
+                    (sprint_id, title, description, story_points, priority)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', chunk)
+                # The write lock is held for the whole transaction, so the
+                # AUTOINCREMENT IDs of this chunk are contiguous
+                last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+                return list(range(last_id - len(chunk) + 1, last_id + 1))
+            return operation
         
-        story_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        chunk_size = chunk_size or len(rows)
+        futures = [self.writer.submit(insert_chunk(rows[offset:offset + chunk_size]))
+                   for offset in range(0, len(rows), chunk_size)]
+        story_ids = [story_id for future in futures for story_id in future.result()]
         
-        logger.info(f"User story added: {title} (ID: {story_id})")
-        return story_id
+        logger.info(f"{len(story_ids)} user stories added to sprint {sprint_id}")
+        return story_ids
     
-    def get_sprint_metrics(self, sprint_id: int):
-        """Get sprint metrics and burndown data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def update_user_story(self, story_id: int, status: str = None,
+                          story_points: int = None) -> bool:
+        """Update a user story's status and/or story points"""
+        changes = {}
+        if status is not None:
+            changes['status'] = status
+        if story_points is not None:
+            changes['story_points'] = story_points
+        if not changes:
+            raise ValueError("Nothing to update: pass status and/or story_points")
         
-        # Get sprint info
-        cursor.execute('SELECT * FROM sprints WHERE id = ?', (sprint_id,))
-        sprint = cursor.fetchone()
+        assignments = ', '.join(f"{column} = ?" for column in changes)
         
-        # Get user stories
-        cursor.execute('''
-            SELECT status, COUNT(*), SUM(story_points)
-            FROM user_stories WHERE sprint_id = ?
-            GROUP BY status
-        ''', (sprint_id,))
+        def operation(conn):
+            cursor = conn.cursor()
+            self._check_sprint_open(cursor, story_id=story_id)
+            cursor.execute(f'UPDATE user_stories SET {assignments} WHERE id = ?',
+                           (*changes.values(), story_id))
+            return cursor.rowcount > 0
         
-        story_metrics = {}
-        for row in cursor.fetchall():
-            story_metrics[row[0]] = {'count': row[1], 'points': row[2] or 0}
+        updated = self._write(operation)
+        
+        if updated:
+            logger.info(f"User story {story_id} updated: {changes}")
+        return updated
+    
+    def delete_user_story(self, story_id: int) -> bool:
+        """Delete a user story"""
+        def operation(conn):
+            cursor = conn.cursor()
+            self._check_sprint_open(cursor, story_id=story_id)
+            cursor.execute('DELETE FROM user_stories WHERE id = ?', (story_id,))
+            return cursor.rowcount > 0
         
-        conn.close()
+        deleted = self._write(operation)
+        
+        if deleted:
+            logger.info(f"User story {story_id} deleted")
+        return deleted
+    
+    def get_sprint_metrics(self, sprint_id: int):
+        """Get sprint metrics and burndown data"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            
+            # Get sprint info
+            cursor.execute('SELECT * FROM sprints WHERE id = ?', (sprint_id,))
+            sprint = cursor.fetchone()
+            
+            # Story totals are maintained incrementally in sprint_rollups
+            cursor.execute('''
+                SELECT status, story_count, story_points
+                FROM sprint_rollups WHERE sprint_id = ?
+            ''', (sprint_id,))
+            
+            story_metrics = {}
+            for row in cursor.fetchall():
+                story_metrics[row[0]] = {'count': row[1], 'points': row[2]}
         
         total_points = sum(metrics['points'] for metrics in story_metrics.values())
         completed_points = story_metrics.get('done', {}).get('points', 0)
@@ -155,34 +287,476 @@ class AgileProjectManager:
             'completed_points': completed_points,
             'completion_rate': (completed_points / total_points * 100) if total_points > 0 else 0
         }
+    
+    def close_sprint(self, sprint_id: int) -> bool:
+        """Close a sprint and record its velocity; stories and burndown are final from here on"""
+        def operation(conn):
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE sprints SET
+                    status = 'closed',
+                    closed_at = COALESCE(closed_at, CURRENT_TIMESTAMP),
+                    velocity = COALESCE((
+                        SELECT story_points FROM sprint_rollups
+                        WHERE sprint_id = sprints.id AND status = 'done'
+                    ), 0)
+                WHERE id = ?
+            ''', (sprint_id,))
+            return cursor.rowcount > 0
+        
+        closed = self._write(operation)
+        
+        if closed:
+            logger.info(f"Sprint {sprint_id} closed")
+        return closed
+    
+    def get_portfolio_metrics(self, sprint_ids: List[int] = None, start_date: str = None,
+                              end_date: str = None, velocity_window: int = 3) -> Dict[str, Any]:
+        """Get metrics for many sprints in one aggregate query
+        
+        Sprints are selected by ID and/or by start date range (ISO dates,
+        inclusive). Rolling velocity averages completed points over the last
+        velocity_window sprints in start date order. Closed sprints whose
+        velocity was never stored get it written back.
+        """
+        filters = []
+        params = []
+        if sprint_ids:
+            filters.append(f"id IN ({', '.join('?' * len(sprint_ids))})")
+            params.extend(sprint_ids)
+        if start_date:
+            filters.append('start_date >= ?')
+            params.append(start_date)
+        if end_date:
+            filters.append('start_date <= ?')
+            params.append(end_date)
+        where = ('WHERE ' + ' AND '.join(filters)) if filters else ''
+        
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                WITH totals AS (
+                    SELECT s.id, s.sprint_name, s.start_date, s.end_date, s.status,
+                           s.velocity AS stored_velocity,
+                           COALESCE(SUM(r.story_count), 0) AS story_count,
+                           COALESCE(SUM(r.story_points), 0) AS total_points,
+                           COALESCE(SUM(CASE WHEN r.status = 'done' THEN r.story_points END), 0)
+                               AS completed_points
+                    FROM (SELECT * FROM sprints {where}) AS s
+                    LEFT JOIN sprint_rollups r ON r.sprint_id = s.id
+                    GROUP BY s.id
+                )
+                SELECT id, sprint_name, start_date, end_date, status, stored_velocity,
+                       story_count, total_points, completed_points,
+                       AVG(CASE WHEN status = 'closed' AND stored_velocity IS NOT NULL
+                                THEN stored_velocity ELSE completed_points END)
+                           OVER (ORDER BY start_date, id
+                                 ROWS BETWEEN ? PRECEDING AND CURRENT ROW)
+                FROM totals
+                ORDER BY start_date, id
+            ''', (*params, max(velocity_window, 1) - 1))
+            rows = cursor.fetchall()
+        
+        sprints = []
+        velocity_updates = []
+        for row in rows:
+            (sprint_id, sprint_name, sprint_start, sprint_end, status, stored_velocity,
+             story_count, total_points, completed_points, rolling_velocity) = row
+            # Only a velocity never recorded (NULL) is filled in; a stored 0 is history
+            if status == 'closed' and stored_velocity is None:
+                velocity_updates.append((completed_points, sprint_id))
+            sprints.append({
+                'sprint_id': sprint_id,
+                'sprint_name': sprint_name,
+                'start_date': sprint_start,
+                'end_date': sprint_end,
+                'status': status,
+                'story_count': story_count,
+                'total_points': total_points,
+                'completed_points': completed_points,
+                'completion_rate': (completed_points / total_points * 100) if total_points > 0 else 0,
+                'velocity': (stored_velocity if status == 'closed' and stored_velocity is not None
+                             else completed_points),
+                'rolling_velocity': rolling_velocity
+            })
+        
+        if velocity_updates:
+            self._write(lambda conn: conn.executemany(
+                'UPDATE sprints SET velocity = ? WHERE id = ?', velocity_updates
+            ))
+            logger.info(f"Stored velocity for {len(velocity_updates)} closed sprints")
+        
+        total_points = sum(sprint['total_points'] for sprint in sprints)
+        completed_points = sum(sprint['completed_points'] for sprint in sprints)
+        closed = [sprint['velocity'] for sprint in sprints if sprint['status'] == 'closed']
+        
+        return {
+            'sprints': sprints,
+            'summary': {
+                'sprint_count': len(sprints),
+                'total_points': total_points,
+                'completed_points': completed_points,
+                'completion_rate': (completed_points / total_points * 100) if total_points > 0 else 0,
+                'average_velocity': (sum(closed) / len(closed)) if closed else 0
+            }
+        }
+    
+    def get_burndown(self, sprint_id: int) -> List[Dict[str, Any]]:
+        """Get remaining and total story points per sprint day
+        
+        Replays the story_events log for the sprint in a single windowed
+        query. Open sprints run up to today and closed ones up to the day
+        they were closed. Closed sprints reject story changes, so their
+        burndown is cached after the first call.
+        """
+        if sprint_id in self._burndown_cache:
+            return self._burndown_cache[sprint_id]
+        
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                WITH RECURSIVE sprint AS (
+                    SELECT start_date, end_date, status,
+                           MAX(start_date, MIN(end_date,
+                               CASE WHEN status = 'closed'
+                                    THEN COALESCE(date(closed_at, 'localtime'), end_date)
+                                    ELSE date('now', 'localtime')
+                               END)) AS last_day
+                    FROM sprints WHERE id = :sprint_id
+                ),
+                days (day) AS (
+                    SELECT start_date FROM sprint
+                    UNION ALL
+                    SELECT date(day, '+1 day') FROM days, sprint WHERE day < sprint.last_day
+                ),
+                changes AS (
+                    SELECT MIN(MAX(date(e.created_at, 'localtime'), s.start_date), s.last_day) AS day,
+                           SUM(
+                               (CASE WHEN e.new_status = 'done' THEN 0 ELSE COALESCE(e.new_points, 0) END)
+                             - (CASE WHEN e.old_status = 'done' THEN 0 ELSE COALESCE(e.old_points, 0) END)
+                           ) AS remaining_delta,
+                           SUM(COALESCE(e.new_points, 0) - COALESCE(e.old_points, 0)) AS total_delta
+                    FROM story_events e, sprint s
+                    WHERE e.sprint_id = :sprint_id
+                    GROUP BY 1
+                )
+                SELECT days.day,
+                       SUM(COALESCE(changes.remaining_delta, 0)) OVER (ORDER BY days.day),
+                       SUM(COALESCE(changes.total_delta, 0)) OVER (ORDER BY days.day),
+                       sprint.status
+                FROM days
+                CROSS JOIN sprint
+                LEFT JOIN changes ON changes.day = days.day
+                ORDER BY days.day
+            ''', {'sprint_id': sprint_id})
+            rows = cursor.fetchall()
+        
+        burndown = [
+            {'date': row[0], 'remaining_points': row[1], 'total_points': row[2]}
+            for row in rows
+        ]
+        
+        if rows and rows[0][3] == 'closed':
+            self._burndown_cache[sprint_id] = burndown
+        return burndown
+    
+    def iter_user_stories(self, after_id: int = 0, sprint_id: int = None,
+                          batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Stream user stories in id order, resuming after after_id"""
+        where, params = ('sprint_id = ?', (sprint_id,)) if sprint_id is not None else (None, ())
+        for row in iter_keyset(self.pool, 'user_stories', self.STORY_COLUMNS, after_id,
+                               where, params, batch_size=batch_size):
+            yield dict(zip(self.STORY_COLUMNS, row))
+    
+    def check_sprint_rollups(self) -> List[Dict[str, Any]]:
+        """Compare sprint_rollups against user_stories and report any drift"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT sprint_id, status,
+                       SUM(expected_count), SUM(expected_points),
+                       SUM(actual_count), SUM(actual_points)
+                FROM (
+                    SELECT sprint_id, status, story_count AS expected_count,
+                           story_points AS expected_points,
+                           0 AS actual_count, 0 AS actual_points
+                    FROM (''' + SPRINT_ROLLUP_SOURCE_SQL + ''' GROUP BY sprint_id, status)
+                    UNION ALL
+                    SELECT sprint_id, status, 0, 0, story_count, story_points
+                    FROM sprint_rollups
+                )
+                GROUP BY sprint_id, status
+                HAVING SUM(expected_count) != SUM(actual_count)
+                    OR SUM(expected_points) != SUM(actual_points)
+            ''')
+            rows = cursor.fetchall()
+        
+        return [
+            {
+                'sprint_id': row[0],
+                'status': row[1],
+                'expected': {'count': row[2], 'points': row[3]},
+                'actual': {'count': row[4], 'points': row[5]}
+            }
+            for row in rows
+        ]
+    
+    def rebuild_sprint_rollups(self) -> int:
+        """Recompute sprint_rollups from user_stories"""
+        def operation(conn):
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM sprint_rollups')
+            cursor.execute('INSERT INTO sprint_rollups ' + SPRINT_ROLLUP_SOURCE_SQL +
+                           ' GROUP BY sprint_id, status')
+            return cursor.rowcount
+        
+        rows = self._write(operation)
+        
+        logger.info(f"Sprint rollups rebuilt ({rows} rows)")
+        return rows
+    
+    def get_database_stats(self):
+        """Get connection pool statistics"""
+        return self.pool.stats()
+    
+    def get_write_stats(self):
+        """Get writer statistics (queue depth and batch sizes in write-behind mode)"""
+        return self.writer.stats()
+    
+    def close(self):
+        """Flush pending writes and close database connections"""
+        self.writer.close()
+        self.pool.close()
+
+class DeploymentTracker:
+    """Deployment ledger backed by the deployments table"""
+    
+    STATUSES = ('pending', 'deployed', 'failed', 'rolled_back')
+    COLUMNS = ('id', 'application_name', 'version', 'environment', 'status',
+               'deployed_at', 'rollback_version', 'created_at')
+    MAX_HISTORY_PAGE = 500
+    
+    def __init__(self, pool: ConnectionPool, writer=None):
+        self.pool = pool
+        self.writer = writer or DirectWriter(pool)
+    
+    def _validate_status(self, status: str):
+        if status not in self.STATUSES:
+            raise ValueError(f"Invalid deployment status '{status}', expected one of {self.STATUSES}")
+    
+    def _to_dict(self, row):
+        return dict(zip(self.COLUMNS, row))
+    
+    def record_deployments(self, deployments: List[Dict[str, Any]]) -> List[int]:
+        """Record many deployments in a single transaction
+        
+        Each deployment is a dict with 'application_name', 'version',
+        'environment' and optional 'status' (default 'deployed') and
+        'rollback_version'. When no rollback version is given, the version
+        currently live for that application and environment is used.
+        Returns the assigned deployment IDs in input order.
+        """
+        rows = []
+        for deployment in deployments:
+            missing = [key for key in ('application_name', 'version', 'environment')
+                       if not deployment.get(key)]
+            if missing:
+                raise ValueError(f"Deployment is missing {', '.join(missing)}")
+            status = deployment.get('status', 'deployed')
+            self._validate_status(status)
+            rows.append({
+                'application_name': deployment['application_name'],
+                'version': deployment['version'],
+                'environment': deployment['environment'],
+                'status': status,
+                'rollback_version': deployment.get('rollback_version')
+            })
+        
+        if not rows:
+            return []
+        
+        def operation(conn):
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO deployments
+                (application_name, version, environment, status, deployed_at, rollback_version)
+                VALUES (
+                    :application_name, :version, :environment, :status,
+                    CASE WHEN :status = 'deployed' THEN CURRENT_TIMESTAMP END,
+                    COALESCE(:rollback_version, (
+                        SELECT version FROM deployments
+                        WHERE application_name = :application_name
+                          AND environment = :environment
+                          AND status = 'deployed'
+                        ORDER BY id DESC LIMIT 1
+                    ))
+                )
+            ''', rows)
+            last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+            return list(range(last_id - len(rows) + 1, last_id + 1))
+        
+        deployment_ids = self.writer.submit(operation).result()
+        logger.info(f"{len(rows)} deployments recorded")
+        return deployment_ids
+    
+    def record_deployment(self, application_name: str, version: str, environment: str,
+                          status: str = 'deployed', rollback_version: str = None) -> int:
+        """Record a single deployment"""
+        return self.record_deployments([{
+            'application_name': application_name,
+            'version': version,
+            'environment': environment,
+            'status': status,
+            'rollback_version': rollback_version
+        }])[0]
+    
+    def update_deployment_status(self, deployment_id: int, status: str) -> bool:
+        """Change a deployment's status, e.g. once a rollout finishes or is rolled back"""
+        self._validate_status(status)
+        def operation(conn):
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE deployments SET
+                    status = ?,
+                    deployed_at = CASE WHEN ? = 'deployed'
+                                       THEN COALESCE(deployed_at, CURRENT_TIMESTAMP)
+                                       ELSE deployed_at END
+                WHERE id = ?
+            ''', (status, status, deployment_id))
+            return cursor.rowcount > 0
+        
+        updated = self.writer.submit(operation).result()
+        
+        if updated:
+            logger.info(f"Deployment {deployment_id} marked {status}")
+        return updated
+    
+    def get_live_version(self, application_name: str, environment: str):
+        """Get the most recent successful deployment for an application and environment"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT {', '.join(self.COLUMNS)} FROM deployments
+                WHERE application_name = ? AND environment = ? AND status = 'deployed'
+                ORDER BY id DESC LIMIT 1
+            ''', (application_name, environment))
+            row = cursor.fetchone()
+        
+        return self._to_dict(row) if row else None
+    
+    def iter_deployments(self, after_id: int = 0, application_name: str = None,
+                         batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Stream deployments in id order, resuming after after_id"""
+        where, params = ('application_name = ?', (application_name,)) if application_name else (None, ())
+        for row in iter_keyset(self.pool, 'deployments', self.COLUMNS, after_id,
+                               where, params, batch_size=batch_size):
+            yield self._to_dict(row)
+    
+    def get_deployment_history(self, application_name: str, environment: str = None,
+                               before_id: int = None, limit: int = 50) -> Dict[str, Any]:
+        """Get deployments newest first, one keyset page at a time
+        
+        Pass the returned next_before_id as before_id to fetch the next page.
+        limit must be from 1 to MAX_HISTORY_PAGE.
+        """
+        if isinstance(limit, bool) or not isinstance(limit, int) or \
+                not 1 <= limit <= self.MAX_HISTORY_PAGE:
+            raise ValueError(f"limit must be an integer from 1 to {self.MAX_HISTORY_PAGE}")
+        filters = ['application_name = ?']
+        params = [application_name]
+        if environment:
+            filters.append('environment = ?')
+            params.append(environment)
+        if before_id:
+            filters.append('id < ?')
+            params.append(before_id)
+        
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT {', '.join(self.COLUMNS)} FROM deployments
+                WHERE {' AND '.join(filters)}
+                ORDER BY id DESC LIMIT ?
+            ''', (*params, limit))
+            rows = cursor.fetchall()
+        
+        return {
+            'deployments': [self._to_dict(row) for row in rows],
+            'next_before_id': rows[-1][0] if len(rows) == limit else None
+        }
 
 class CICDPipelineEngine:
     """CI/CD pipeline automation engine"""
     
-    def __init__(self):
-        self.pipelines = {}
-        self.builds = {}
+    # Test paths are pasted into shell steps, so only plain path characters
+    TEST_PATH_PATTERN = re.compile(r'[\w./-]+', re.ASCII)
+    # GitLab accepts parallel: 2 to 200; Jenkins gets one branch per shard
+    MAX_TEST_SHARDS = 200
     
-    def create_jenkins_pipeline(self, app_name: str, git_repo: str):
-        """Create Jenkins pipeline configuration"""
-        jenkinsfile = f"""
-pipeline {{
-    agent any
+    def __init__(self, render_cache_size: int = 256, pool: ConnectionPool = None,
+                 writer=None, registry_hot_size: int = 128, build_history_size: int = 100,
+                 build_cache: BuildCache = None):
+        self.pipelines = PipelineRegistry(pool, writer, hot_size=registry_hot_size)
+        self.build_cache = build_cache
+        # Reports of local pipeline runs, most recent kept
+        self.builds = LRUCache(build_history_size)
+        self._build_numbers = count(1)
+        # Rendered configs depend only on the generator inputs
+        self.render_cache = LRUCache(render_cache_size)
     
-    environment {{
-        APP_NAME = '{app_name}'
-        DOCKER_REGISTRY = 'your-registry.com'
-        KUBECONFIG = credentials('kubeconfig')
-    }}
+    def plan_test_shards(self, test_shards: int, test_files: List[str] = None,
+                         test_durations: Dict[str, float] = None):
+        """Get the per-shard test file lists for the generators, as nested tuples
+        
+        Files default to those with recorded durations. Returns None when
+        there is nothing to plan: a single shard, or no known test files,
+        in which case sharded configs split the files evenly at CI time.
+        Paths go into shell steps as they are, so anything but plain path
+        characters is a ValueError.
+        """
+        if isinstance(test_shards, bool) or not isinstance(test_shards, int) or \
+                not 1 <= test_shards <= self.MAX_TEST_SHARDS:
+            raise ValueError(f"test_shards must be an integer from 1 to {self.MAX_TEST_SHARDS}")
+        test_files = test_files or sorted(test_durations or {})
+        if test_shards == 1 or not test_files:
+            return None
+        if not isinstance(test_files, (list, tuple)):
+            raise ValueError("test_files must be a list of paths")
+        for test_file in test_files:
+            if not isinstance(test_file, str) or not self.TEST_PATH_PATTERN.fullmatch(test_file):
+                raise ValueError(f"Invalid test file path: {test_file!r}")
+        return tuple(tuple(shard['files'])
+                     for shard in plan_shards(test_files, test_shards, test_durations))
     
-    stages {{
-        stage('Checkout') {{
-            steps {{
-                git branch: 'main', url: '{git_repo}'
-            }}
-        }}
+    def create_jenkins_pipeline(self, app_name: str, git_repo: str, test_shards: int = 1,
+                                test_files: List[str] = None,
+                                test_durations: Dict[str, float] = None,
+                                dependency_cache: bool = False):
+        """Create Jenkins pipeline configuration
         
-        stage('Test') {{
+        With test_shards > 1 the Test stage runs as parallel branches, split
+        by historical duration when test_files (and test_durations from
+        JUnit reports) are given. With dependency_cache, pip downloads are
+        cached per requirements.txt hash (Job Cacher plugin) and the image
+        is built with BuildKit against a registry layer cache.
+        """
+        shard_plan = self.plan_test_shards(test_shards, test_files, test_durations)
+        jenkinsfile = self.render_cache.get_or_create(
+            ('jenkins', app_name, git_repo, test_shards, shard_plan, dependency_cache),
+            lambda: self._render_jenkinsfile(app_name, git_repo, test_shards, shard_plan,
+                                             dependency_cache)
+        )
+        
+        self.pipelines.register(app_name, 'jenkins', jenkinsfile, git_repo)
+        
+        return jenkinsfile
+    
+    def _render_jenkins_test_stage(self, test_shards: int, shard_plan) -> str:
+        """Render the Jenkins Test stage, as parallel shard branches when test_shards > 1"""
+        publish_coverage = ("publishCoverage adapters: [coberturaAdapter('coverage.xml')], "
+                            "sourceFileResolver: sourceFiles('STORE_LAST_BUILD')")
+        if test_shards == 1:
+            return f"""        stage('Test') {{
             steps {{
                 script {{
                     sh 'python -m pytest tests/ --junitxml=test-results.xml'
@@ -193,32 +767,133 @@ pipeline {{
             post {{
                 always {{
                     junit 'test-results.xml'
-                    publishCoverage adapters: [coberturaAdapter('coverage.xml')], sourceFileResolver: sourceFiles('STORE_LAST_BUILD')
+                    {publish_coverage}
                 }}
             }}
+        }}"""
+        
+        branches = []
+        for shard in range(1, (len(shard_plan) if shard_plan else test_shards) + 1):
+            if shard_plan:
+                selection = ' '.join(shard_plan[shard - 1])
+            else:
+                selection = (f"$(find tests -name 'test_*.py' | sort | "
+                             f"awk '(NR - 1) % {test_shards} == {shard - 1}')")
+            branches.append(f"""                stage('Test shard {shard}') {{
+                    steps {{
+                        sh '''
+                            coverage run --parallel-mode -m pytest {selection} --junitxml=test-results-{shard}.xml
+                        '''
+                    }}
+                    post {{
+                        always {{
+                            junit 'test-results-{shard}.xml'
+                        }}
+                    }}
+                }}""")
+        
+        # Each shard publishes its own results, so they are reported even
+        # when a failing shard skips the coverage report below
+        return """        stage('Test') {
+            parallel {
+""" + '\n'.join(branches) + f"""
+            }}
         }}
         
-        stage('Security Scan') {{
+        stage('Coverage Report') {{
             steps {{
                 script {{
-                    sh 'bandit -r . -f json -o bandit-report.json || true'
-                    sh 'safety check --json --output safety-report.json || true'
+                    sh 'coverage combine'
+                    sh 'coverage xml'
+                }}
+            }}
+            post {{
+                always {{
+                    {publish_coverage}
                 }}
             }}
+        }}"""
+    
+    def _render_jenkins_cached_stages(self, dependency_cache: bool):
+        """Render the Jenkins dependency install stage and Build stage"""
+        if not dependency_cache:
+            return '', """        stage('Build') {
+            steps {
+                script {
+                    def image = docker.build("${DOCKER_REGISTRY}/${APP_NAME}:${BUILD_NUMBER}")
+                    docker.withRegistry('https://' + DOCKER_REGISTRY, 'docker-registry-credentials') {
+                        image.push()
+                        image.push('latest')
+                    }
+                }
+            }
+        }"""
+        
+        install_stage = """        stage('Install Dependencies') {
+            steps {
+                cache(maxCacheSize: 1024, defaultBranch: 'main', caches: [
+                    arbitraryFileCache(path: '.cache/pip', cacheValidityDecidingFile: 'requirements.txt')
+                ]) {
+                    sh 'pip install --cache-dir .cache/pip -r requirements.txt'
+                }
+            }
+        }
+        
+"""
+        build_stage = """        stage('Build') {
+            steps {
+                script {
+                    docker.withRegistry('https://' + DOCKER_REGISTRY, 'docker-registry-credentials') {
+                        sh '''
+                            docker buildx create --name ${APP_NAME}-builder --use || docker buildx use ${APP_NAME}-builder
+                            docker buildx build \\
+                                --cache-from type=registry,ref=${DOCKER_REGISTRY}/${APP_NAME}:buildcache \\
+                                --cache-to type=registry,ref=${DOCKER_REGISTRY}/${APP_NAME}:buildcache,mode=max \\
+                                -t ${DOCKER_REGISTRY}/${APP_NAME}:${BUILD_NUMBER} \\
+                                -t ${DOCKER_REGISTRY}/${APP_NAME}:latest \\
+                                --push .
+                        '''
+                    }
+                }
+            }
+        }"""
+        return install_stage, build_stage
+    
+    def _render_jenkinsfile(self, app_name: str, git_repo: str, test_shards: int = 1,
+                            shard_plan=None, dependency_cache: bool = False) -> str:
+        """Render the Jenkinsfile template"""
+        install_stage, build_stage = self._render_jenkins_cached_stages(dependency_cache)
+        test_stage = install_stage + self._render_jenkins_test_stage(test_shards, shard_plan)
+        jenkinsfile = f"""
+pipeline {{
+    agent any
+    
+    environment {{
+        APP_NAME = '{app_name}'
+        DOCKER_REGISTRY = 'your-registry.com'
+        KUBECONFIG = credentials('kubeconfig')
+    }}
+    
+    stages {{
+        stage('Checkout') {{
+            steps {{
+                git branch: 'main', url: '{git_repo}'
+            }}
         }}
         
-        stage('Build') {{
+{test_stage}
+        
+        stage('Security Scan') {{
             steps {{
                 script {{
-                    def image = docker.build("${{DOCKER_REGISTRY}}/${{APP_NAME}}:${{BUILD_NUMBER}}")
-                    docker.withRegistry('https://' + DOCKER_REGISTRY, 'docker-registry-credentials') {{
-                        image.push()
-                        image.push('latest')
-                    }}
+                    sh 'bandit -r . -f json -o bandit-report.json || true'
+                    sh 'safety check --json --output safety-report.json || true'
                 }}
             }}
         }}
         
+{build_stage}
+        
         stage('Deploy to Staging') {{
             steps {{
                 script {{
@@ -272,17 +947,78 @@ pipeline {{
 }}
 """
         
-        self.pipelines[app_name] = {
-            'jenkinsfile': jenkinsfile,
-            'git_repo': git_repo,
-            'status': 'configured',
-            'created_at': datetime.now().isoformat()
-        }
-        
         return jenkinsfile
     
-    def create_gitlab_ci_config(self, app_name: str):
-        """Create GitLab CI/CD configuration"""
+    def create_gitlab_ci_config(self, app_name: str, test_shards: int = 1,
+                                test_files: List[str] = None,
+                                test_durations: Dict[str, float] = None,
+                                dependency_cache: bool = False):
+        """Create GitLab CI/CD configuration
+        
+        With test_shards > 1 the test job runs as parallel jobs, as for
+        create_jenkins_pipeline. With dependency_cache, the Python jobs
+        share a pip cache keyed on the requirements.txt hash and the image
+        is built with BuildKit against a registry layer cache.
+        """
+        shard_plan = self.plan_test_shards(test_shards, test_files, test_durations)
+        gitlab_ci = self.render_cache.get_or_create(
+            ('gitlab', app_name, test_shards, shard_plan, dependency_cache),
+            lambda: self._render_gitlab_ci_config(app_name, test_shards, shard_plan,
+                                                  dependency_cache)
+        )
+        
+        self.pipelines.register(app_name, 'gitlab', gitlab_ci)
+        
+        return gitlab_ci
+    
+    def _render_gitlab_test_job(self, test_shards: int, shard_plan) -> str:
+        """Render the GitLab test job's parallel keyword and pytest selection"""
+        if test_shards == 1:
+            return '', 'tests/'
+        if shard_plan:
+            files = '\n'.join(f"          - {json.dumps(' '.join(shard))}" for shard in shard_plan)
+            return (f"  parallel:\n    matrix:\n      - TEST_FILES:\n{files}\n",
+                    '$TEST_FILES')
+        return (f"  parallel: {test_shards}\n",
+                "$(find tests -name 'test_*.py' | sort | "
+                'awk "(NR - 1) % $CI_NODE_TOTAL == $CI_NODE_INDEX - 1")')
+    
+    def _render_gitlab_cache(self, dependency_cache: bool):
+        """Render the GitLab pip cache variables, per-job cache and build job script"""
+        if not dependency_cache:
+            return '', '', """  script:
+    - docker build -t $DOCKER_IMAGE:$CI_COMMIT_SHA .
+    - docker push $DOCKER_IMAGE:$CI_COMMIT_SHA
+    - docker tag $DOCKER_IMAGE:$CI_COMMIT_SHA $DOCKER_IMAGE:latest
+    - docker push $DOCKER_IMAGE:latest
+"""
+        
+        variables = '  PIP_CACHE_DIR: $CI_PROJECT_DIR/.cache/pip\n'
+        pip_cache = """  cache:
+    key:
+      files:
+        - requirements.txt
+    paths:
+      - .cache/pip
+"""
+        build_script = """  variables:
+    DOCKER_BUILDKIT: "1"
+  script:
+    - docker buildx create --use
+    - >-
+      docker buildx build
+      --cache-from type=registry,ref=$DOCKER_IMAGE:buildcache
+      --cache-to type=registry,ref=$DOCKER_IMAGE:buildcache,mode=max
+      -t $DOCKER_IMAGE:$CI_COMMIT_SHA -t $DOCKER_IMAGE:latest
+      --push .
+"""
+        return variables, pip_cache, build_script
+    
+    def _render_gitlab_ci_config(self, app_name: str, test_shards: int = 1,
+                                 shard_plan=None, dependency_cache: bool = False) -> str:
+        """Render the GitLab CI template"""
+        test_parallel, test_selection = self._render_gitlab_test_job(test_shards, shard_plan)
+        cache_variables, pip_cache, build_script = self._render_gitlab_cache(dependency_cache)
         gitlab_ci = f"""
 stages:
   - test
@@ -297,16 +1033,16 @@ variables:
   DOCKER_REGISTRY: $CI_REGISTRY
   DOCKER_IMAGE: $CI_REGISTRY_IMAGE
   KUBECONFIG: /etc/kubeconfig
-
+{cache_variables}
 before_script:
   - docker login -u $CI_REGISTRY_USER -p $CI_REGISTRY_PASSWORD $CI_REGISTRY
 
 test:
   stage: test
   image: python:3.9
-  script:
+{test_parallel}{pip_cache}  script:
     - pip install -r requirements.txt
-    - python -m pytest tests/ --junitxml=test-results.xml --cov=. --cov-report=xml
+    - python -m pytest {test_selection} --junitxml=test-results.xml --cov=. --cov-report=xml
   artifacts:
     reports:
       junit: test-results.xml
@@ -333,12 +1069,7 @@ build:
   image: docker:latest
   services:
     - docker:dind
-  script:
-    - docker build -t $DOCKER_IMAGE:$CI_COMMIT_SHA .
-    - docker push $DOCKER_IMAGE:$CI_COMMIT_SHA
-    - docker tag $DOCKER_IMAGE:$CI_COMMIT_SHA $DOCKER_IMAGE:latest
-    - docker push $DOCKER_IMAGE:latest
-
+{build_script}
 deploy-staging:
   stage: deploy-staging
   image: bitnami/kubectl:latest
@@ -352,7 +1083,7 @@ deploy-staging:
 integration-test:
   stage: integration-test
   image: python:3.9
-  script:
+{pip_cache}  script:
     - pip install -r requirements.txt
     - python -m pytest integration_tests/
   dependencies:
@@ -373,15 +1104,237 @@ deploy-production:
 """
         
         return gitlab_ci
+    
+    def render_pipelines(self, specs: Iterable[Dict[str, Any]],
+                         max_workers: int = 4) -> Iterator[Dict[str, Any]]:
+        """Render many pipeline configs on a worker pool, yielding each as it finishes
+        
+        Each spec is a dict with 'app_name' and optional 'git_repo' and
+        'type' ('jenkins' or 'gitlab'), as for /api/pipeline. Results come
+        back in completion order, tagged with the spec's index; a failing
+        spec yields an 'error' result instead of aborting the batch. At most
+        2 * max_workers renders are in flight, so memory is bounded by the
+        worker count rather than the number of specs.
+        """
+        specs = enumerate(specs)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {executor.submit(self._render_spec, index, spec)
+                       for index, spec in islice(specs, max_workers * 2)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for index, spec in islice(specs, 1):
+                        pending.add(executor.submit(self._render_spec, index, spec))
+                    yield future.result()
+    
+    @staticmethod
+    def generator_options(spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Sharding and caching options for the generators from an API request or batch spec
+        
+        Accepts 'test_shards', 'test_files', 'test_durations' (seconds per
+        test file), 'junit_xml', the text of a previous JUnit report to
+        take durations from, and 'dependency_cache'.
+        """
+        test_shards = spec.get('test_shards', 1)
+        if isinstance(test_shards, bool) or not isinstance(test_shards, (int, str)):
+            raise ValueError("test_shards must be an integer")
+        test_durations = spec.get('test_durations') or {}
+        if not isinstance(test_durations, dict):
+            raise ValueError("test_durations must map test files to seconds")
+        test_durations = dict(test_durations)
+        junit_xml = spec.get('junit_xml')
+        if junit_xml:
+            if not isinstance(junit_xml, str):
+                raise ValueError("junit_xml must be the text of a JUnit XML report")
+            report = io.BytesIO(junit_xml.encode('utf-8'))
+            test_durations.update(durations_from_junit([report]))
+        return {
+            'test_shards': int(test_shards),
+            'test_files': spec.get('test_files'),
+            'test_durations': test_durations or None,
+            'dependency_cache': bool(spec.get('dependency_cache', False))
+        }
+    
+    def _render_spec(self, index: int, spec: Dict[str, Any]) -> Dict[str, Any]:
+        app_name = None
+        try:
+            if not isinstance(spec, dict):
+                raise ValueError("Pipeline spec must be an object")
+            app_name = spec.get('app_name')
+            pipeline_type = spec.get('type', 'jenkins')
+            if not app_name:
+                raise ValueError("'app_name' is required")
+            options = self.generator_options(spec)
+            if pipeline_type == 'jenkins':
+                config = self.create_jenkins_pipeline(
+                    app_name, spec.get('git_repo', 'https://github.com/user/repo.git'), **options
+                )
+                filename = f"{app_name}/Jenkinsfile"
+            else:
+                config = self.create_gitlab_ci_config(app_name, **options)
+                filename = f"{app_name}/.gitlab-ci.yml"
+        except Exception as e:
+            return {'index': index, 'app_name': app_name, 'error': str(e)}
+        
+        return {
+            'index': index,
+            'app_name': app_name,
+            'pipeline_type': pipeline_type,
+            'filename': filename,
+            'config': config
+        }
+    
+    def run_local_pipeline(self, app_name: str, stages=None, max_workers: int = 4,
+                           sequential: bool = False, use_cache: bool = True) -> Dict[str, Any]:
+        """Run pipeline stages locally as a dependency graph and record the report
+        
+        stages defaults to offline stand-ins for the generated pipeline's
+        stages. With sequential=True they run one after another, as the
+        generated configs do, for comparison. Unchanged cacheable stages
+        are skipped when the engine has a build cache and use_cache is set.
+        """
+        dag = PipelineDAG(stages if stages is not None else default_stages())
+        if sequential:
+            dag = dag.sequential()
+        
+        build_id = f"{app_name}-{next(self._build_numbers)}"
+        cache = self.build_cache if use_cache else None
+        report = PipelineRunner(max_workers=max_workers, cache=cache).run(dag)
+        report.update({
+            'build_id': build_id,
+            'app_name': app_name,
+            'started_at': datetime.now().isoformat()
+        })
+        self.builds.put(build_id, report)
+        logger.info(f"Local pipeline {build_id} {report['status']} in {report['wall_time']:.2f}s "
+                    f"({report['cache']['hits']} stages cached)")
+        return report
+    
+    def get_render_cache_stats(self):
+        """Get pipeline render cache hit/miss statistics"""
+        return self.render_cache.stats()
 
 class InfrastructureAsCode:
     """Infrastructure as Code management"""
     
-    def __init__(self):
-        self.templates = {}
+    TERRAFORM_FILES = ('main.tf', 'variables.tf', 'outputs.tf')
+    PROJECT_NAME_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]{0,62}$')
+    # Node group and database sizing used unless a capacity plan provides one
+    DEFAULT_SIZING = {
+        'desired_size': 2,
+        'min_size': 1,
+        'max_size': 4,
+        'instance_types': ['t3.medium'],
+        'db_instance_class': 'db.t3.micro'
+    }
+    INSTANCE_TYPE_PATTERN = re.compile(r'^[a-z][a-z0-9-]*\.[a-z0-9]+$')
+    
+    def __init__(self, template_store: TemplateStore = None):
+        # Files shared between projects are stored once; see TemplateStore
+        self.templates = template_store or TemplateStore()
+        self._template_fingerprint = None
     
-    def create_terraform_infrastructure(self, project_name: str):
-        """Create comprehensive Terraform infrastructure"""
+    def create_terraform_infrastructure(self, project_name: str, sizing: Dict[str, Any] = None):
+        """Create comprehensive Terraform infrastructure
+        
+        sizing overrides DEFAULT_SIZING keys, e.g. the 'sizing' of a capacity plan.
+        """
+        main_tf, variables_tf, outputs_tf = self._render_terraform(project_name, sizing)
+        
+        self.templates.put(project_name,
+                           dict(zip(self.TERRAFORM_FILES, (main_tf, variables_tf, outputs_tf))),
+                           self._template_parameters(project_name))
+        
+        return main_tf, variables_tf, outputs_tf
+    
+    def validate_project_name(self, project_name: str):
+        """Reject names that are unsafe as archive paths or Terraform identifiers"""
+        if not isinstance(project_name, str) or not self.PROJECT_NAME_PATTERN.match(project_name):
+            raise ValueError(f"Invalid project name {project_name!r}")
+    
+    def iter_terraform_bundle(self, project_names: List[str]) -> Iterator[Tuple[str, str]]:
+        """Yield (path, content) for every file of each project's module, rendering lazily
+        
+        Projects in templates are bundled as stored, so a capacity-planned
+        module keeps its sizing; others are rendered with DEFAULT_SIZING
+        and not registered in templates.
+        """
+        for project_name in project_names:
+            template = self.templates.get(project_name)
+            if template:
+                files = [template[filename] for filename in self.TERRAFORM_FILES]
+            else:
+                files = self._render_terraform(project_name)
+            for filename, content in zip(self.TERRAFORM_FILES, files):
+                yield f"{project_name}/{filename}", content
+    
+    def template_fingerprint(self) -> str:
+        """Hash of the rendered templates, so bundle ETags change with them"""
+        if self._template_fingerprint is None:
+            digest = hashlib.sha256()
+            for content in self._render_terraform('fingerprint'):
+                digest.update(content.encode('utf-8'))
+            self._template_fingerprint = digest.hexdigest()
+        return self._template_fingerprint
+    
+    def bundle_etag(self, project_names: List[str]) -> str:
+        """Strong ETag for the bundle of the given projects, in order"""
+        digest = hashlib.sha256(self.template_fingerprint().encode('utf-8'))
+        for project_name in project_names:
+            digest.update(b'\0' + project_name.encode('utf-8'))
+            stored = self.templates.fingerprint(project_name)
+            if stored:
+                digest.update(b'\0' + stored.encode('utf-8'))
+        return digest.hexdigest()[:32]
+    
+    def analyze_terraform(self, project_name: str,
+                          durations: Dict[str, float] = None) -> Dict[str, Any]:
+        """Dependency graph report for a project's main.tf
+        
+        durations overrides per-resource-type create times in seconds.
+        """
+        self.validate_project_name(project_name)
+        for resource_type, seconds in (durations or {}).items():
+            if not isinstance(seconds, (int, float)) or isinstance(seconds, bool) or seconds < 0:
+                raise ValueError(f"Duration for {resource_type!r} must be a non-negative number")
+        
+        template = self.templates.get(project_name)
+        main_tf = template['main.tf'] if template else self._render_terraform(project_name)[0]
+        report = terraform_analysis.analyze(main_tf, durations)
+        report['project_name'] = project_name
+        return report
+    
+    def _template_parameters(self, project_name: str) -> Dict[str, str]:
+        """Per-project values _render_terraform interpolates, factored out of stored files"""
+        return {'project_name': project_name, 'db_name': project_name.replace('-', '_')}
+    
+    def resolve_sizing(self, sizing: Dict[str, Any] = None) -> Dict[str, Any]:
+        """DEFAULT_SIZING with the given overrides, validated"""
+        unknown = set(sizing or {}) - set(self.DEFAULT_SIZING)
+        if unknown:
+            raise ValueError(f"Unknown sizing keys: {sorted(unknown)}")
+        resolved = {**self.DEFAULT_SIZING, **(sizing or {})}
+        
+        sizes = [resolved[key] for key in ('min_size', 'desired_size', 'max_size')]
+        if not all(isinstance(size, int) and not isinstance(size, bool) for size in sizes):
+            raise ValueError("Node group sizes must be integers")
+        if not 0 <= sizes[0] <= sizes[1] <= sizes[2] or sizes[2] < 1:
+            raise ValueError("Node group sizes need 0 <= min_size <= desired_size <= max_size")
+        instance_types = resolved['instance_types']
+        if not isinstance(instance_types, list) or not instance_types or not all(
+                isinstance(t, str) and self.INSTANCE_TYPE_PATTERN.match(t) for t in instance_types):
+            raise ValueError(f"Invalid instance_types {instance_types!r}")
+        db_class = resolved['db_instance_class']
+        if not isinstance(db_class, str) or not db_class.startswith('db.') or \
+                not self.INSTANCE_TYPE_PATTERN.match(db_class[3:]):
+            raise ValueError(f"Invalid db_instance_class {db_class!r}")
+        return resolved
+    
+    def _render_terraform(self, project_name: str,
+                          sizing: Dict[str, Any] = None) -> Tuple[str, str, str]:
+        """Render main.tf, variables.tf and outputs.tf for a project"""
+        sizing = self.resolve_sizing(sizing)
+        instance_types = ', '.join(f'"{t}"' for t in sizing['instance_types'])
         main_tf = f"""
 terraform {{
   required_version = ">= 1.0"
@@ -471,12 +1424,12 @@ resource "aws_eks_node_group" "main" {{
   subnet_ids      = aws_subnet.private[*].id
   
   scaling_config {{
-    desired_size = 2
-    max_size     = 4
-    min_size     = 1
+    desired_size = {sizing['desired_size']}
+    max_size     = {sizing['max_size']}
+    min_size     = {sizing['min_size']}
   }}
   
-  instance_types = ["t3.medium"]
+  instance_types = [{instance_types}]
   
   depends_on = [
     aws_iam_role_policy_attachment.node_AmazonEKSWorkerNodePolicy,
@@ -491,7 +1444,7 @@ resource "aws_db_instance" "main" {{
   
   engine         = "postgres"
   engine_version = "14.9"
-  instance_class = "db.t3.micro"
+  instance_class = "{sizing['db_instance_class']}"
   
   allocated_storage     = 20
   max_allocated_storage = 100
@@ -564,31 +1517,68 @@ output "vpc_id" {{
 }}
 """
         
-        self.templates[project_name] = {
-            'main.tf': main_tf,
-            'variables.tf': variables_tf,
-            'outputs.tf': outputs_tf,
-            'created_at': datetime.now().isoformat()
-        }
-        
         return main_tf, variables_tf, outputs_tf
 
 class MonitoringAndObservability:
     """Monitoring and observability platform"""
     
+    # Quantiles precomputed by the recording rules
+    RECORDED_QUANTILES = ('0.5', '0.95', '0.99')
+    
+    # Shard replicas as a StatefulSet behind a headless service
+    SHARD_ADDRESS = 'prometheus-{shard}.prometheus:9090'
+    SHARD_ADDRESS_PATTERN = re.compile(r'^[a-z0-9.-]*\{shard\}[a-z0-9.-]*:\d+$')
+    
     def __init__(self):
         self.dashboards = {}
         self.alerts = {}
     
-    def create_prometheus_config(self, app_name: str):
-        """Create Prometheus monitoring configuration"""
+    def validate_rules(self, rules_yaml: str) -> str:
+        """Return a generated rule file unchanged, or raise ValueError listing its problems"""
+        problems = validate_rules(rules_yaml)
+        if problems:
+            raise ValueError("Invalid Prometheus rules: " + "; ".join(problems))
+        return rules_yaml
+    
+    def create_prometheus_config(self, app_name: str, shard: int = None, shards: int = 1):
+        """Create Prometheus monitoring configuration
+        
+        With a shard index the config is for one of shards replicas that
+        split the pod and node targets between them by hashmod of the
+        target address, labelled with the shard and recording the
+        shard-level rules. Its alert rules are then only those on raw
+        series, which the shard holds.
+        """
+        if shard is None:
+            external_labels = ''
+            alert_rule_file = 'alert_rules.yml'
+            recording_rule_file = 'recording_rules.yml'
+            shard_relabel = ''
+        else:
+            self._check_shards(shards)
+            if isinstance(shard, bool) or not isinstance(shard, int) or not 0 <= shard < shards:
+                raise ValueError(f"shard must be an integer from 0 to {shards - 1}")
+            external_labels = f'\n  external_labels:\n    shard: "{shard}"'
+            alert_rule_file = 'shard_alert_rules.yml'
+            recording_rule_file = 'shard_recording_rules.yml'
+            # Last, so the hash sees the final address and the pod filter has run
+            shard_relabel = f"""
+      - source_labels: [__address__]
+        modulus: {shards}
+        target_label: __tmp_hash
+        action: hashmod
+      - source_labels: [__tmp_hash]
+        regex: ^{shard}$
+        action: keep"""
+        
         prometheus_config = f"""
 global:
   scrape_interval: 15s
-  evaluation_interval: 15s
+  evaluation_interval: 15s{external_labels}
 
 rule_files:
-  - "alert_rules.yml"
+  - "{alert_rule_file}"
+  - "{recording_rule_file}"
 
 alerting:
   alertmanagers:
@@ -614,22 +1604,30 @@ scrape_configs:
         regex: (.+)
       - source_labels: [__address__, __meta_kubernetes_pod_annotation_prometheus_io_port]
         action: replace
-        regex: ([^:]+)(?::\d+)?;(\d+)
+        regex: ([^:]+)(?::\\d+)?;(\\d+)
         replacement: $1:$2
-        target_label: __address__
+        target_label: __address__{shard_relabel}
 
   - job_name: 'kubernetes-nodes'
     kubernetes_sd_configs:
       - role: node
     relabel_configs:
       - action: labelmap
-        regex: __meta_kubernetes_node_label_(.+)
+        regex: __meta_kubernetes_node_label_(.+){shard_relabel}
 """
         
-        alert_rules = f"""
-groups:
-  - name: {app_name}_alerts
-    rules:
+        return prometheus_config, self._alert_rules(app_name, job_series=shard is None)
+    
+    def _alert_rules(self, app_name: str, raw_series: bool = True, job_series: bool = True) -> str:
+        """Alert rules on the raw scraped series, on the recorded job: series, or both
+        
+        Shards hold only their own targets' raw series and record no job:
+        series, so sharded setups alert on the former from the shards and
+        on the latter from the federating server.
+        """
+        rules = []
+        if raw_series:
+            rules.append("""\
       - alert: HighCPUUsage
         expr: cpu_usage_percent > 80
         for: 5m
@@ -655,10 +1653,162 @@ groups:
           severity: critical
         annotations:
           summary: "Application is down"
-          description: "Application {{{{ $labels.instance }}}} is down"
+          description: "Application {{ $labels.instance }} is down"
+""")
+        if job_series:
+            rules.append(f"""\
+      - alert: HighErrorRate
+        expr: job:http_requests_errors:ratio_rate5m{{job="{app_name}"}} > 0.05
+        for: 5m
+        labels:
+          severity: warning
+        annotations:
+          summary: "High HTTP error rate"
+          description: "More than 5% of requests failed with a 5xx status over 5 minutes"
+      
+      - alert: HighLatency
+        expr: job:http_request_duration_seconds:histogram_quantile{{job="{app_name}",quantile="0.95"}} > 1
+        for: 10m
+        labels:
+          severity: warning
+        annotations:
+          summary: "High request latency"
+          description: "95th percentile latency is above 1s for more than 10 minutes"
+""")
+        return self.validate_rules(f"""
+groups:
+  - name: {app_name}_alerts
+    rules:
+""" + "      \n".join(rules))
+    
+    def _additive_rules(self, app_name: str) -> List[Tuple[str, str]]:
+        # Sums over targets, which stay correct when summed again across shards
+        selector = f'{{job="{app_name}"}}'
+        return [
+            ('job:http_requests:rate5m',
+             f'sum by (job) (rate(http_requests_total{selector}[5m]))'),
+            ('job:http_requests_errors:rate5m',
+             f'sum by (job) (rate(http_requests_total{{job="{app_name}",status=~"5.."}}[5m]))'),
+            ('job_le:http_request_duration_seconds_bucket:rate5m',
+             f'sum by (job, le) (rate(http_request_duration_seconds_bucket{selector}[5m]))'),
+        ]
+    
+    def _rule_group(self, group_name: str, rules: List[Tuple[str, str, Dict[str, str]]]) -> str:
+        entries = []
+        for record, expr, labels in rules:
+            entry = f"""
+      - record: {record}
+        expr: {expr}"""
+            if labels:
+                entry += "\n        labels:" + "".join(
+                    f'\n          {name}: "{value}"' for name, value in labels.items())
+            entries.append(entry + "\n")
+        return self.validate_rules(f"""
+groups:
+  - name: {group_name}
+    rules:""" + "      ".join(entries))
+    
+    def _recording_rules(self, app_name: str, group_name: str,
+                         additive_rules: List[Tuple[str, str]]) -> str:
+        selector = f'{{job="{app_name}"}}'
+        rules = [(record, expr, {}) for record, expr in additive_rules]
+        rules.append(('job:http_requests_errors:ratio_rate5m',
+                      f'job:http_requests_errors:rate5m{selector} / '
+                      f'job:http_requests:rate5m{selector}', {}))
+        rules.extend(('job:http_request_duration_seconds:histogram_quantile',
+                      f'histogram_quantile({quantile}, '
+                      f'job_le:http_request_duration_seconds_bucket:rate5m{selector})',
+                      {'quantile': quantile}) for quantile in self.RECORDED_QUANTILES)
+        return self._rule_group(group_name, rules)
+    
+    def create_recording_rules(self, app_name: str) -> str:
+        """Create recording rules that precompute the dashboard and alert series
+        
+        Rate and quantile queries run once per evaluation in Prometheus
+        instead of on every dashboard refresh. Rules in a group are
+        evaluated in order, so each series is recorded before the rules
+        built on it.
+        """
+        return self._recording_rules(app_name, f"{app_name}_recording",
+                                     self._additive_rules(app_name))
+    
+    def _check_shards(self, shards: int):
+        if isinstance(shards, bool) or not isinstance(shards, int) or \
+                not 1 <= shards <= MAX_SHARDS:
+            raise ValueError(f"shards must be an integer from 1 to {MAX_SHARDS}")
+    
+    def create_sharded_prometheus_configs(self, app_name: str, shards: int,
+                                          shard_address: str = None) -> Dict[str, Any]:
+        """Create configs for shards Prometheus replicas and a federating server over them
+        
+        Each shard scrapes the targets hashmod assigns it and records only
+        the per-job rates, which add up across shards, as shard_job:
+        series. The federating server pulls those from every shard's
+        /federate endpoint (shard_address with {shard} filled in), sums
+        them into the job: series create_recording_rules would record on
+        a single server, and derives the error ratio and quantiles from
+        the totals, so dashboards and the job-level alerts point at it
+        unchanged. Alerts on raw per-pod series fire from the shards
+        holding them, each loading shard_alert_rules.yml.
+        """
+        self._check_shards(shards)
+        shard_address = shard_address or self.SHARD_ADDRESS
+        if not isinstance(shard_address, str) or not self.SHARD_ADDRESS_PATTERN.match(shard_address):
+            raise ValueError("shard_address must be host:port containing {shard}, "
+                             "e.g. " + self.SHARD_ADDRESS)
+        
+        additive_rules = self._additive_rules(app_name)
+        shard_recording_rules = self._rule_group(
+            f"{app_name}_shard_recording",
+            [(f"shard_{record}", expr, {}) for record, expr in additive_rules])
+        federation_recording_rules = self._recording_rules(
+            app_name, f"{app_name}_recording",
+            [(record, f'sum by ({"job, le" if record.startswith("job_le:") else "job"}) '
+                      f'(shard_{record}{{job="{app_name}"}})')
+             for record, _ in additive_rules])
+        
+        targets = "".join(f"\n          - '{shard_address.format(shard=shard)}'"
+                          for shard in range(shards))
+        federation_config = f"""
+global:
+  scrape_interval: 15s
+  evaluation_interval: 15s
+
+rule_files:
+  - "alert_rules.yml"
+  - "recording_rules.yml"
+
+alerting:
+  alertmanagers:
+    - static_configs:
+        - targets:
+          - alertmanager:9093
+
+scrape_configs:
+  - job_name: 'prometheus'
+    static_configs:
+      - targets: ['localhost:9090']
+
+  - job_name: 'federate-{app_name}'
+    honor_labels: true
+    metrics_path: /federate
+    params:
+      'match[]':
+        - '{{__name__=~"shard_job(_le)?:.+",job="{app_name}"}}'
+    static_configs:
+      - targets:{targets}
 """
         
-        return prometheus_config, alert_rules
+        configs = [self.create_prometheus_config(app_name, shard, shards)
+                   for shard in range(shards)]
+        return {
+            'shard_configs': [config for config, _ in configs],
+            'shard_recording_rules': shard_recording_rules,
+            'federation_config': federation_config,
+            'federation_recording_rules': federation_recording_rules,
+            'shard_alert_rules': configs[0][1],
+            'federation_alert_rules': self._alert_rules(app_name, raw_series=False)
+        }
     
     def create_grafana_dashboard(self, app_name: str):
         """Create Grafana dashboard configuration"""
@@ -696,7 +1846,7 @@ groups:
                         "type": "graph",
                         "targets": [
                             {
-                                "expr": f"rate(http_requests_total{{job=\"{app_name}\"}}[5m])",
+                                "expr": f"job:http_requests:rate5m{{job=\"{app_name}\"}}",
                                 "legendFormat": "Requests/sec"
                             }
                         ]
@@ -706,7 +1856,8 @@ groups:
                         "type": "graph",
                         "targets": [
                             {
-                                "expr": f"histogram_quantile(0.95, rate(http_request_duration_seconds_bucket{{job=\"{app_name}\"}}[5m]))",
+                                "expr": "job:http_request_duration_seconds:histogram_quantile"
+                                        f"{{job=\"{app_name}\",quantile=\"0.95\"}}",
                                 "legendFormat": "95th percentile"
                             }
                         ]
@@ -721,11 +1872,25 @@ groups:
 app = Flask(__name__)
 
 # Initialize platform components
-project_manager = AgileProjectManager()
-cicd_engine = CICDPipelineEngine()
-iac_manager = InfrastructureAsCode()
+project_manager = AgileProjectManager(DATABASE_URL, write_behind=WRITE_BEHIND)
+deployment_tracker = DeploymentTracker(project_manager.pool, project_manager.writer)
+test_reports = ReportStore(project_manager.pool, project_manager.writer)
+cicd_engine = CICDPipelineEngine(render_cache_size=PIPELINE_CACHE_SIZE,
+                                 pool=project_manager.pool, writer=project_manager.writer,
+                                 build_cache=BuildCache(BUILD_CACHE_DIR, BUILD_CACHE_MB * 1024 * 1024))
+iac_manager = InfrastructureAsCode(TemplateStore(TEMPLATE_STORE_DIR,
+                                                  TEMPLATE_CACHE_MB * 1024 * 1024))
 monitoring = MonitoringAndObservability()
 
+# Request and SQLite metrics for the platform itself, served at /metrics
+metrics_registry = MetricsRegistry()
+instrument_app(app, metrics_registry)
+instrument_pool(project_manager.pool, metrics_registry)
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    return Response(metrics_registry.render(), content_type=METRICS_CONTENT_TYPE)
+
 @app.route('/')
 def dashboard():
     return jsonify({
@@ -733,7 +1898,21 @@ def dashboard():
         'version': '1.0.0',
         'status': 'running',
         'capabilities': ['agile', 'cicd', 'infrastructure', 'monitoring'],
-        'endpoints': ['/api/sprint', '/api/pipeline', '/api/infrastructure', '/api/monitoring']
+        'endpoints': ['/api/sprint', '/api/sprint/<id>/stories', '/api/sprint/<id>/burndown',
+                      '/api/sprint/<id>/close', '/api/sprints/metrics', '/api/stories/<id>',
+                      '/api/deployments', '/api/deployments/live', '/api/deployments/<id>',
+                      '/api/export/user_stories', '/api/export/deployments',
+                      '/api/pipeline', '/api/pipelines', '/api/pipelines/<app_name>',
+                      '/api/pipelines/batch', '/api/pipelines/<app_name>/run',
+                      '/api/builds/<build_id>', '/api/pipeline/cache',
+                      '/api/test-reports', '/api/test-reports/slowest',
+                      '/api/test-reports/trend', '/api/test-reports/flaky',
+                      '/api/infrastructure', '/api/infrastructure/bundle',
+                      '/api/infrastructure/analysis', '/api/infrastructure/templates',
+                      '/api/infrastructure/capacity-plan',
+                      '/api/monitoring', '/api/monitoring/sharding',
+                      '/api/monitoring/rules/validate',
+                      '/api/database/stats', '/metrics']
     })
 
 @app.route('/api/sprint', methods=['POST'])
@@ -754,10 +1933,8 @@ def create_sprint():
         ]
         
         for story in stories:
-            project_manager.add_user_story(
-                sprint_id, story["title"], f"Description for {story['title']}", 
-                story["points"], story["priority"]
-            )
+            story["description"] = f"Description for {story['title']}"
+        project_manager.add_user_stories(sprint_id, stories)
         
         metrics = project_manager.get_sprint_metrics(sprint_id)
         
@@ -770,6 +1947,238 @@ def create_sprint():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/sprint/<int:sprint_id>/stories', methods=['POST'])
+def add_sprint_stories(sprint_id):
+    try:
+        data = request.json or {}
+        stories = data.get('stories')
+        if not isinstance(stories, list):
+            return jsonify({'error': "'stories' must be a list"}), 400
+        
+        story_ids = project_manager.add_user_stories(
+            sprint_id, stories, chunk_size=data.get('chunk_size')
+        )
+        
+        return jsonify({
+            'status': 'success',
+            'sprint_id': sprint_id,
+            'story_ids': story_ids,
+            'count': len(story_ids)
+        })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/sprints/metrics', methods=['GET'])
+def portfolio_metrics():
+    try:
+        ids = request.args.get('ids')
+        sprint_ids = [int(sprint_id) for sprint_id in ids.split(',')] if ids else None
+        
+        metrics = project_manager.get_portfolio_metrics(
+            sprint_ids=sprint_ids,
+            start_date=request.args.get('start_date'),
+            end_date=request.args.get('end_date'),
+            velocity_window=request.args.get('window', 3, type=int)
+        )
+        
+        return jsonify({'status': 'success', **metrics})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/sprint/<int:sprint_id>/close', methods=['POST'])
+def close_sprint(sprint_id):
+    try:
+        if not project_manager.close_sprint(sprint_id):
+            return jsonify({'error': f"Sprint {sprint_id} not found"}), 404
+        
+        return jsonify({'status': 'success', 'sprint_id': sprint_id})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/sprint/<int:sprint_id>/burndown', methods=['GET'])
+def sprint_burndown(sprint_id):
+    try:
+        burndown = project_manager.get_burndown(sprint_id)
+        if not burndown:
+            return jsonify({'error': f"Sprint {sprint_id} not found"}), 404
+        
+        return jsonify({
+            'status': 'success',
+            'sprint_id': sprint_id,
+            'burndown': burndown
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/stories/<int:story_id>', methods=['PATCH'])
+def update_story(story_id):
+    try:
+        data = request.json or {}
+        updated = project_manager.update_user_story(
+            story_id, status=data.get('status'), story_points=data.get('story_points')
+        )
+        if not updated:
+            return jsonify({'error': f"User story {story_id} not found"}), 404
+        
+        return jsonify({'status': 'success', 'story_id': story_id})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/stories/<int:story_id>', methods=['DELETE'])
+def delete_story(story_id):
+    try:
+        if not project_manager.delete_user_story(story_id):
+            return jsonify({'error': f"User story {story_id} not found"}), 404
+        
+        return jsonify({'status': 'success', 'story_id': story_id})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/deployments', methods=['POST'])
+def record_deployments():
+    try:
+        data = request.json or {}
+        deployments = data.get('deployments', [data])
+        if not isinstance(deployments, list):
+            return jsonify({'error': "'deployments' must be a list"}), 400
+        
+        deployment_ids = deployment_tracker.record_deployments(deployments)
+        
+        return jsonify({
+            'status': 'success',
+            'deployment_ids': deployment_ids,
+            'count': len(deployment_ids)
+        })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/deployments', methods=['GET'])
+def deployment_history():
+    try:
+        application_name = request.args.get('app')
+        if not application_name:
+            return jsonify({'error': "'app' is required"}), 400
+        
+        history = deployment_tracker.get_deployment_history(
+            application_name,
+            environment=request.args.get('environment'),
+            before_id=request.args.get('before_id', type=int),
+            limit=min(request.args.get('limit', 50, type=int), DeploymentTracker.MAX_HISTORY_PAGE)
+        )
+        
+        return jsonify({'status': 'success', **history})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/deployments/live', methods=['GET'])
+def live_deployment():
+    try:
+        application_name = request.args.get('app')
+        environment = request.args.get('environment')
+        if not application_name or not environment:
+            return jsonify({'error': "'app' and 'environment' are required"}), 400
+        
+        deployment = deployment_tracker.get_live_version(application_name, environment)
+        if not deployment:
+            return jsonify({'error': f"No live deployment of {application_name} in {environment}"}), 404
+        
+        return jsonify({'status': 'success', 'deployment': deployment})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/deployments/<int:deployment_id>', methods=['PATCH'])
+def update_deployment(deployment_id):
+    try:
+        data = request.json or {}
+        if not deployment_tracker.update_deployment_status(deployment_id, data.get('status')):
+            return jsonify({'error': f"Deployment {deployment_id} not found"}), 404
+        
+        return jsonify({'status': 'success', 'deployment_id': deployment_id})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _ndjson_response(records: Iterator[Dict[str, Any]], limit: int = None):
+    """Stream records as newline-delimited JSON"""
+    def generate():
+        for count, record in enumerate(records, 1):
+            yield json.dumps(record) + '\n'
+            if limit and count >= limit:
+                break
+    
+    return Response(generate(), mimetype='application/x-ndjson')
+
+def _iter_tar(files: Iterable[Tuple[str, str]], compress: bool = False,
+              mtime: int = None) -> Iterator[bytes]:
+    """Stream a tar archive of (name, text) files, emitting bytes as each file is added
+    
+    With compress the stream is gzipped with a zeroed header timestamp, so
+    the same files and mtime always produce the same bytes.
+    """
+    buffer = io.BytesIO()
+    mtime = int(time.time()) if mtime is None else mtime
+    # wbits=31 selects the gzip container
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    
+    def drain():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        if compressor is None:
+            return data
+        # A sync flush sends each file out now but keeps the compression window
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    with tarfile.open(fileobj=buffer, mode='w|', bufsize=tarfile.BLOCKSIZE) as archive:
+        for name, text in files:
+            data = text.encode('utf-8')
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = mtime
+            info.mode = 0o644
+            archive.addfile(info, io.BytesIO(data))
+            chunk = drain()
+            if chunk:
+                yield chunk
+    # Closing the archive writes the end-of-archive blocks
+    data = buffer.getvalue()
+    yield compressor.compress(data) + compressor.flush() if compressor else data
+
+@app.route('/api/export/user_stories', methods=['GET'])
+def export_user_stories():
+    try:
+        records = project_manager.iter_user_stories(
+            after_id=request.args.get('after_id', 0, type=int),
+            sprint_id=request.args.get('sprint_id', type=int)
+        )
+        return _ndjson_response(records, limit=request.args.get('limit', type=int))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/export/deployments', methods=['GET'])
+def export_deployments():
+    try:
+        records = deployment_tracker.iter_deployments(
+            after_id=request.args.get('after_id', 0, type=int),
+            application_name=request.args.get('app')
+        )
+        return _ndjson_response(records, limit=request.args.get('limit', type=int))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/pipeline', methods=['POST'])
 def create_pipeline():
     try:
@@ -777,11 +2186,12 @@ def create_pipeline():
         app_name = data.get('app_name', 'sample-app')
         git_repo = data.get('git_repo', 'https://github.com/user/repo.git')
         pipeline_type = data.get('type', 'jenkins')
+        options = cicd_engine.generator_options(data)
         
         if pipeline_type == 'jenkins':
-            pipeline_config = cicd_engine.create_jenkins_pipeline(app_name, git_repo)
+            pipeline_config = cicd_engine.create_jenkins_pipeline(app_name, git_repo, **options)
         else:
-            pipeline_config = cicd_engine.create_gitlab_ci_config(app_name)
+            pipeline_config = cicd_engine.create_gitlab_ci_config(app_name, **options)
         
         return jsonify({
             'status': 'success',
@@ -789,18 +2199,199 @@ def create_pipeline():
             'pipeline_type': pipeline_type,
             'config': pipeline_config
         })
+    except (ValueError, ET.ParseError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/pipelines/batch', methods=['POST'])
+def create_pipelines_batch():
+    try:
+        data = request.json or {}
+        specs = data.get('pipelines')
+        if not isinstance(specs, list):
+            return jsonify({'error': "'pipelines' must be a list"}), 400
+        output_format = data.get('format', 'ndjson')
+        if output_format not in ('ndjson', 'tar'):
+            return jsonify({'error': "'format' must be 'ndjson' or 'tar'"}), 400
+        
+        workers = data.get('workers', 4)
+        if isinstance(workers, bool) or not isinstance(workers, int):
+            return jsonify({'error': "'workers' must be an integer"}), 400
+        
+        results = cicd_engine.render_pipelines(specs, max_workers=max(1, min(workers, 16)))
+        
+        if output_format == 'tar':
+            def files():
+                for result in results:
+                    if 'error' in result:
+                        logger.warning(f"Skipping pipeline {result['index']}: {result['error']}")
+                        continue
+                    yield result['filename'], result['config']
+            
+            return Response(_iter_tar(files()), mimetype='application/x-tar', headers={
+                'Content-Disposition': 'attachment; filename=pipelines.tar'
+            })
+        return _ndjson_response(results)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/pipelines', methods=['GET'])
+def list_pipelines():
+    try:
+        page = cicd_engine.pipelines.list(
+            after_id=int(request.args.get('after_id', 0)),
+            limit=min(int(request.args.get('limit', 100)), 1000),
+            pipeline_type=request.args.get('type')
+        )
+        return jsonify({'status': 'success', **page})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/pipelines/<app_name>', methods=['GET'])
+def get_pipeline(app_name):
+    try:
+        pipeline = cicd_engine.pipelines.get(app_name, request.args.get('type', 'jenkins'))
+        if pipeline is None:
+            return jsonify({'error': f"Pipeline for '{app_name}' not found"}), 404
+        return jsonify({'status': 'success', 'pipeline': pipeline})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/pipelines/<app_name>/run', methods=['POST'])
+def run_pipeline(app_name):
+    try:
+        data = request.json or {}
+        # Only the offline stand-in stages; commands are never taken from the request
+        stages = default_stages(scale=data.get('scale', 1.0), durations=data.get('durations'))
+        report = cicd_engine.run_local_pipeline(
+            app_name, stages,
+            max_workers=max(1, min(int(data.get('workers', 4)), 16)),
+            sequential=bool(data.get('sequential', False)),
+            use_cache=bool(data.get('cache', True))
+        )
+        return jsonify({'status': 'success', 'build': report})
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/builds/<build_id>', methods=['GET'])
+def get_build(build_id):
+    try:
+        report = cicd_engine.builds.get(build_id)
+        if report is None:
+            return jsonify({'error': f"Build '{build_id}' not found"}), 404
+        return jsonify({'status': 'success', 'build': report})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/test-reports', methods=['POST'])
+def ingest_test_report():
+    try:
+        # The report is parsed straight off the request stream, never buffered whole
+        app_name = request.args.get('app_name')
+        if not app_name:
+            return jsonify({'error': "'app_name' is required"}), 400
+        report_type = request.args.get('type', 'junit')
+        if report_type == 'junit':
+            run = test_reports.ingest_junit(
+                request.stream, app_name, request.args.get('build_id'),
+                request.args.get('report_name', 'test-results.xml')
+            )
+        elif report_type == 'coverage':
+            run = test_reports.ingest_coverage(
+                request.stream, app_name, request.args.get('build_id'),
+                request.args.get('report_name', 'coverage.xml')
+            )
+        else:
+            return jsonify({'error': "'type' must be 'junit' or 'coverage'"}), 400
+        return jsonify({'status': 'success', 'run': run}), 201
+    except ET.ParseError as e:
+        return jsonify({'error': f"Invalid report XML: {e}"}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _report_query_args():
+    app_name = request.args.get('app_name')
+    if not app_name:
+        raise ValueError("'app_name' is required")
+    return app_name, min(int(request.args.get('runs', 20)), 500)
+
+@app.route('/api/test-reports/slowest', methods=['GET'])
+def slowest_tests():
+    try:
+        app_name, runs = _report_query_args()
+        tests = test_reports.get_slowest_tests(app_name, runs, request.args.get('limit', 20, type=int))
+        return jsonify({'status': 'success', 'app_name': app_name, 'tests': tests})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/test-reports/trend', methods=['GET'])
+def test_duration_trend():
+    try:
+        app_name, runs = _report_query_args()
+        trend = test_reports.get_duration_trend(app_name, runs, request.args.get('test'))
+        return jsonify({'status': 'success', 'app_name': app_name, 'runs': trend})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/test-reports/flaky', methods=['GET'])
+def flaky_tests():
+    try:
+        app_name, runs = _report_query_args()
+        tests = test_reports.get_flaky_tests(app_name, runs, request.args.get('limit', 20, type=int))
+        return jsonify({'status': 'success', 'app_name': app_name, 'tests': tests})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/pipeline/cache', methods=['GET'])
+def pipeline_cache_stats():
+    try:
+        return jsonify({
+            'status': 'success',
+            'render_cache': cicd_engine.get_render_cache_stats(),
+            'registry': cicd_engine.pipelines.stats(),
+            'build_cache': cicd_engine.build_cache.stats() if cicd_engine.build_cache else None
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _capacity_plan(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the capacity planner on a request's {target_rps, measurements, ...options}"""
+    if not isinstance(spec, dict):
+        raise ValueError("'capacity' must be an object")
+    options = dict(spec)
+    measurements = options.pop('measurements', None)
+    target_rps = options.pop('target_rps', None)
+    if not isinstance(measurements, dict) or not isinstance(target_rps, (int, float)):
+        raise ValueError("Capacity planning needs 'measurements' and a numeric 'target_rps'")
+    unknown = set(options) - set(PLAN_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown capacity options: {sorted(unknown)}")
+    return plan_capacity(measurements, target_rps, **options)
+
 @app.route('/api/infrastructure', methods=['POST'])
 def create_infrastructure():
     try:
         data = request.json
         project_name = data.get('project_name', 'sample-project')
+        # Sized from measured load when a capacity spec is given
+        plan = _capacity_plan(data['capacity']) if data.get('capacity') else None
         
-        main_tf, variables_tf, outputs_tf = iac_manager.create_terraform_infrastructure(project_name)
+        main_tf, variables_tf, outputs_tf = iac_manager.create_terraform_infrastructure(
+            project_name, plan['sizing'] if plan else None
+        )
         
-        return jsonify({
+        response = {
             'status': 'success',
             'project_name': project_name,
             'terraform_files': {
@@ -808,10 +2399,84 @@ def create_infrastructure():
                 'variables.tf': variables_tf,
                 'outputs.tf': outputs_tf
             }
+        }
+        if plan:
+            response['capacity_plan'] = plan
+        response['bundle_url'] = f"/api/infrastructure/bundle?project={project_name}"
+        return jsonify(response)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/infrastructure/capacity-plan', methods=['POST'])
+def capacity_plan():
+    try:
+        return jsonify({'status': 'success', 'capacity_plan': _capacity_plan(request.json)})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/infrastructure/bundle', methods=['GET'])
+def terraform_bundle():
+    try:
+        # ?project=a&project=b or ?projects=a,b; duplicates dropped, order kept
+        project_names = request.args.getlist('project')
+        for names in request.args.getlist('projects'):
+            project_names.extend(name for name in names.split(',') if name)
+        project_names = list(dict.fromkeys(project_names))
+        if not project_names:
+            return jsonify({'error': "At least one 'project' is required"}), 400
+        if len(project_names) > 500:
+            return jsonify({'error': "At most 500 projects per bundle"}), 400
+        for project_name in project_names:
+            iac_manager.validate_project_name(project_name)
+        
+        etag = iac_manager.bundle_etag(project_names)
+        if etag in request.if_none_match:
+            response = Response(status=304)
+        else:
+            response = Response(
+                _iter_tar(iac_manager.iter_terraform_bundle(project_names), compress=True,
+                          mtime=0),
+                mimetype='application/gzip',
+                headers={'Content-Disposition': 'attachment; filename=terraform-bundle.tar.gz'}
+            )
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/infrastructure/templates', methods=['GET'])
+def template_store_stats():
+    try:
+        return jsonify({
+            'status': 'success',
+            'templates': iac_manager.templates.stats()
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/infrastructure/analysis', methods=['POST'])
+def analyze_infrastructure():
+    try:
+        data = request.json or {}
+        project_name = data.get('project_name', 'sample-project')
+        durations = data.get('durations')
+        if durations is not None and not isinstance(durations, dict):
+            return jsonify({'error': "'durations' must map resource types to seconds"}), 400
+        
+        report = iac_manager.analyze_terraform(project_name, durations)
+        return jsonify({'status': 'success', 'analysis': report})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/monitoring', methods=['POST'])
 def create_monitoring():
     try:
@@ -819,6 +2484,7 @@ def create_monitoring():
         app_name = data.get('app_name', 'sample-app')
         
         prometheus_config, alert_rules = monitoring.create_prometheus_config(app_name)
+        recording_rules = monitoring.create_recording_rules(app_name)
         grafana_dashboard = monitoring.create_grafana_dashboard(app_name)
         
         return jsonify({
@@ -826,12 +2492,111 @@ def create_monitoring():
             'app_name': app_name,
             'prometheus_config': prometheus_config[:300] + '...',  # Truncate
             'alert_rules': alert_rules[:300] + '...',
+            'recording_rules': recording_rules[:300] + '...',
             'grafana_dashboard': grafana_dashboard
         })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-def main():
+@app.route('/api/monitoring/sharding', methods=['POST'])
+def create_sharded_monitoring():
+    try:
+        data = request.json or {}
+        app_name = data.get('app_name', 'sample-app')
+        shards = data.get('shards')
+        targets = data.get('targets')
+        
+        estimate = None
+        if targets is not None:
+            options = {key: data[key] for key in ('series_per_target', 'max_series_per_shard')
+                       if key in data}
+            # Without a shard count, plan for the recommended one
+            estimate = estimate_series_per_shard(targets, shards or 1, **options)
+            if shards is None:
+                if estimate['recommended_shards'] is None:
+                    return jsonify({'error': 'No shard count keeps every shard within '
+                                             'max_series_per_shard', 'series_estimate': estimate}), 400
+                shards = estimate['recommended_shards']
+                estimate = estimate_series_per_shard(targets, shards, **options)
+        elif shards is None:
+            return jsonify({'error': "Give 'shards', 'targets' or both"}), 400
+        
+        configs = monitoring.create_sharded_prometheus_configs(
+            app_name, shards, data.get('shard_address'))
+        return jsonify({
+            'status': 'success',
+            'app_name': app_name,
+            **configs,
+            'series_estimate': estimate
+        })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/monitoring/rules/validate', methods=['POST'])
+def validate_monitoring_rules():
+    try:
+        # Raw rule file YAML, as promtool check rules would take it
+        problems = validate_rules(request.get_data(as_text=True))
+        return jsonify({'valid': not problems, 'errors': problems}), 200 if not problems else 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/database/stats', methods=['GET'])
+def database_stats():
+    try:
+        return jsonify({
+            'status': 'success',
+            'database': project_manager.pool.backend.describe(),
+            'pool': project_manager.get_database_stats(),
+            'writer': project_manager.get_write_stats()
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def run_command(command: str, workers: int = 4, sequential: bool = False,
+                use_cache: bool = True) -> int:
+    """Run a maintenance or local pipeline command and return the exit code"""
+    if command == 'check-rollups':
+        drift = project_manager.check_sprint_rollups()
+        for row in drift:
+            print(f"Sprint {row['sprint_id']} [{row['status']}]: "
+                  f"expected {row['expected']}, found {row['actual']}")
+        print(f"{len(drift)} drifted sprint rollups")
+        return 1 if drift else 0
+    
+    if command == 'rebuild-rollups':
+        rows = project_manager.rebuild_sprint_rollups()
+        print(f"Sprint rollups rebuilt: {rows} rows")
+        return 0
+    
+    if command == 'run-pipeline':
+        report = cicd_engine.run_local_pipeline('local', max_workers=workers,
+                                                sequential=sequential, use_cache=use_cache)
+        print(format_report(report))
+        return 0 if report['status'] == 'success' else 1
+    
+    raise ValueError(f"Unknown command: {command}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="IBM DevOps & Software Engineering Platform")
+    parser.add_argument('command', nargs='?', default='serve',
+                        choices=['serve', 'check-rollups', 'rebuild-rollups', 'run-pipeline'])
+    parser.add_argument('--workers', type=int, default=4,
+                        help="parallel stages for run-pipeline")
+    parser.add_argument('--sequential', action='store_true',
+                        help="run-pipeline stages one after another, as the generated configs do")
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                        help="run-pipeline every stage even if its inputs are unchanged")
+    args = parser.parse_args(argv)
+    
+    if args.command != 'serve':
+        sys.exit(run_command(args.command, workers=args.workers, sequential=args.sequential,
+                             use_cache=args.use_cache))
+    
     print("🔧 IBM DevOps and Software Engineering Professional Certificate Capstone")
     print("⚙️ Enterprise DevOps Automation & Software Engineering Platform")
     print("=" * 70)
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Metrics for the DevOps platform
+Prometheus counters, histograms and gauges with per-thread accumulation
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import List, Callable, Iterable, Sequence, Tuple
+
+from flask import g, request
+
+# Default latency buckets in seconds, as used by the official Prometheus clients
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _Shard:
+    """One thread's accumulated samples: written only by that thread"""
+
+    def __init__(self, thread=None):
+        self.thread = thread
+        self.values = {}
+        self.histograms = {}
+
+    def merge(self, other: '_Shard'):
+        for key, value in other.values.items():
+            self.values[key] = self.values.get(key, 0) + value
+        for key, (counts, total) in other.histograms.items():
+            mine = self.histograms.setdefault(key, [[0] * len(counts), 0.0])
+            mine[0] = [a + b for a, b in zip(mine[0], counts)]
+            mine[1] += total
+
+
+class _Metric:
+    def __init__(self, registry: 'MetricsRegistry', name: str, help_text: str,
+                 labelnames: Sequence[str]):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1):
+        values = self.registry._shard().values
+        key = (self.name, labels)
+        values[key] = values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Up/down gauge; each thread keeps its own delta and a scrape sums them"""
+    type = 'gauge'
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1):
+        values = self.registry._shard().values
+        key = (self.name, labels)
+        values[key] = values.get(key, 0) + amount
+
+    def dec(self, labels: Tuple[str, ...] = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    type = 'histogram'
+
+    def __init__(self, registry, name, help_text, labelnames, buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()):
+        histograms = self.registry._shard().histograms
+        key = (self.name, labels)
+        entry = histograms.get(key)
+        if entry is None:
+            # One slot per bucket plus +Inf; counts are not cumulative until rendered
+            entry = histograms[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() \
+        else str(int(value))
+
+
+class MetricsRegistry:
+    """Metrics served in the Prometheus text format
+
+    Updates go to a shard owned by the calling thread, so recording a
+    sample takes no lock; a scrape sums the shards. Shards of threads that
+    have exited are folded into one, keeping counters monotonic while the
+    per-request threads of a threaded server come and go.
+
+    Collectors are callables run at scrape time that return
+    (name, type, help, [(labels dict, value), ...]) families, for values
+    that already live elsewhere such as pool statistics.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._shards = []
+        self._retired = _Shard()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = _Shard(threading.current_thread())
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(self, name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, help_text, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, List]]]):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def _snapshot(self) -> Tuple[_Shard, List[_Metric]]:
+        total = _Shard()
+        with self._lock:
+            live = []
+            for shard in self._shards:
+                if shard.thread.is_alive():
+                    live.append(shard)
+                else:
+                    self._retired.merge(shard)
+            self._shards = live
+            total.merge(self._retired)
+            metrics = list(self._metrics.values())
+        for shard in live:
+            # Copies are taken in one step each, so writers never see a resize mid-merge
+            snapshot = _Shard()
+            snapshot.values = dict(shard.values)
+            snapshot.histograms = {key: [list(counts), value_sum] for key, (counts, value_sum)
+                                   in list(shard.histograms.items())}
+            total.merge(snapshot)
+        return total, metrics
+
+    def sample(self, name: str, labels: Tuple[str, ...] = ()) -> float:
+        """Current value of a counter or gauge, summed over threads"""
+        total, _ = self._snapshot()
+        return total.values.get((name, labels), 0)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        total, metrics = self._snapshot()
+        lines = []
+        for metric in sorted(metrics, key=lambda m: m.name):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            if isinstance(metric, Histogram):
+                series = sorted((labels, entry) for (name, labels), entry
+                                in total.histograms.items() if name == metric.name)
+                for labels, (counts, value_sum) in series:
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets + (float('inf'),), counts):
+                        cumulative += count
+                        le = f'le="{_format_value(bound)}"'
+                        lines.append(f"{metric.name}_bucket"
+                                     f"{_format_labels(metric.labelnames, labels, le)} {cumulative}")
+                    label_text = _format_labels(metric.labelnames, labels)
+                    lines.append(f"{metric.name}_sum{label_text} {_format_value(value_sum)}")
+                    lines.append(f"{metric.name}_count{label_text} {cumulative}")
+            else:
+                series = sorted((labels, value) for (name, labels), value
+                                in total.values.items() if name == metric.name)
+                for labels, value in series:
+                    lines.append(f"{metric.name}{_format_labels(metric.labelnames, labels)} "
+                                 f"{_format_value(value)}")
+
+        for collector in list(self._collectors):
+            for name, metric_type, help_text, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} "
+                                 f"{_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+def instrument_app(app, registry: MetricsRegistry):
+    """Count, time and track in-flight requests of a Flask app per route
+
+    Routes are labelled by their URL rule (/api/builds/<build_id>), not
+    the concrete path, to keep the number of series bounded; requests no
+    rule matched share route="<unmatched>".
+    """
+    requests_total = registry.counter(
+        'http_requests_total', 'Total HTTP requests', ('method', 'route', 'status'))
+    duration = registry.histogram(
+        'http_request_duration_seconds', 'HTTP request latency in seconds', ('method', 'route'))
+    in_flight = registry.gauge(
+        'http_requests_in_flight', 'HTTP requests being handled', ('method', 'route'))
+
+    def route_labels():
+        rule = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+        return request.method, rule
+
+    @app.before_request
+    def start_timer():
+        g._metrics_labels = route_labels()
+        g._metrics_start = time.perf_counter()
+        in_flight.inc(g._metrics_labels)
+
+    @app.after_request
+    def record_status(response):
+        g._metrics_status = str(response.status_code)
+        return response
+
+    @app.teardown_request
+    def record_request(exc):
+        start = g.pop('_metrics_start', None)
+        if start is None:
+            return
+        labels = g.pop('_metrics_labels')
+        # No after_request when a handler raised
+        status = g.pop('_metrics_status', '500')
+        duration.observe(time.perf_counter() - start, labels)
+        requests_total.inc(labels + (status,))
+        in_flight.dec(labels)
+
+
+def instrument_pool(pool, registry: MetricsRegistry, name: str = 'main'):
+    """Time a ConnectionPool's read and write blocks and export its counters"""
+    operation_duration = registry.histogram(
+        'sqlite_operation_duration_seconds',
+        'Time a pooled SQLite connection is held per read or write block', ('pool', 'kind'))
+    operation_errors = registry.counter(
+        'sqlite_operation_errors_total', 'SQLite read or write blocks that raised',
+        ('pool', 'kind'))
+
+    def observe(kind: str, seconds: float, failed: bool):
+        operation_duration.observe(seconds, (name, kind))
+        if failed:
+            operation_errors.inc((name, kind))
+
+    pool.observer = observe
+
+    def collect():
+        stats = pool.stats()
+        labels = {'pool': name}
+        return [
+            ('sqlite_pool_connections', 'gauge', 'Open SQLite connections',
+             [(labels, stats['connections'])]),
+            ('sqlite_pool_idle_connections', 'gauge', 'Idle SQLite connections',
+             [(labels, stats['idle'])]),
+            ('sqlite_pool_waits_total', 'counter', 'Acquisitions that waited for a free connection',
+             [(labels, stats['pool_waits'])]),
+            ('sqlite_lock_wait_seconds_total', 'counter', 'Time spent waiting for the write lock',
+             [(labels, stats['lock_wait_seconds'])]),
+            ('sqlite_lock_timeouts_total', 'counter', 'Writes that timed out on the write lock',
+             [(labels, stats['lock_timeouts'])]),
+        ]
+
+    registry.register_collector(collect)
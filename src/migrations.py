@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Schema migrations for the DevOps platform database
+Ordered, idempotent upgrades tracked in a schema_version table
+"""
+
+import logging
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+# Per-(sprint, status) totals, shared by migration 3 and the rollup
+# consistency check / rebuild in AgileProjectManager
+SPRINT_ROLLUP_SOURCE_SQL = '''
+    SELECT sprint_id, status, COUNT(*) AS story_count,
+           COALESCE(SUM(story_points), 0) AS story_points
+    FROM user_stories
+    WHERE sprint_id IS NOT NULL AND status IS NOT NULL
+'''
+
+# Ordered list of (version, description, steps). A step is either an SQL
+# statement or a callable taking the open connection. Never edit a
+# migration once released; append a new one instead.
+MIGRATIONS = [
+    (1, "Create sprints, user_stories and deployments tables", [
+        '''
+        CREATE TABLE IF NOT EXISTS sprints (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sprint_name TEXT NOT NULL,
+            start_date DATE NOT NULL,
+            end_date DATE NOT NULL,
+            status TEXT DEFAULT 'planning',
+            velocity INTEGER DEFAULT 0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS user_stories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sprint_id INTEGER,
+            title TEXT NOT NULL,
+            description TEXT,
+            story_points INTEGER DEFAULT 1,
+            priority TEXT DEFAULT 'medium',
+            status TEXT DEFAULT 'backlog',
+            assigned_to TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (sprint_id) REFERENCES sprints (id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS deployments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            application_name TEXT NOT NULL,
+            version TEXT NOT NULL,
+            environment TEXT NOT NULL,
+            status TEXT DEFAULT 'pending',
+            deployed_at DATETIME,
+            rollback_version TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        '''
+    ]),
+    (2, "Add covering indexes for sprint metrics and deployment lookups", [
+        '''
+        CREATE INDEX IF NOT EXISTS idx_user_stories_sprint_status
+        ON user_stories (sprint_id, status, story_points)
+        ''',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_deployments_app_env_created
+        ON deployments (application_name, environment, created_at)
+        ''',
+        'ANALYZE'
+    ]),
+    (3, "Add sprint_rollups maintained by user_stories triggers", [
+        '''
+        CREATE TABLE IF NOT EXISTS sprint_rollups (
+            sprint_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            story_count INTEGER NOT NULL DEFAULT 0,
+            story_points INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (sprint_id, status)
+        ) WITHOUT ROWID
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_user_stories_rollup_insert
+        AFTER INSERT ON user_stories
+        BEGIN
+            INSERT INTO sprint_rollups (sprint_id, status, story_count, story_points)
+            SELECT NEW.sprint_id, NEW.status, 1, COALESCE(NEW.story_points, 0)
+            WHERE NEW.sprint_id IS NOT NULL AND NEW.status IS NOT NULL
+            ON CONFLICT (sprint_id, status) DO UPDATE SET
+                story_count = story_count + 1,
+                story_points = story_points + excluded.story_points;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_user_stories_rollup_update
+        AFTER UPDATE OF sprint_id, status, story_points ON user_stories
+        BEGIN
+            UPDATE sprint_rollups SET
+                story_count = story_count - 1,
+                story_points = story_points - COALESCE(OLD.story_points, 0)
+            WHERE sprint_id = OLD.sprint_id AND status = OLD.status;
+            DELETE FROM sprint_rollups
+            WHERE sprint_id = OLD.sprint_id AND status = OLD.status AND story_count <= 0;
+            INSERT INTO sprint_rollups (sprint_id, status, story_count, story_points)
+            SELECT NEW.sprint_id, NEW.status, 1, COALESCE(NEW.story_points, 0)
+            WHERE NEW.sprint_id IS NOT NULL AND NEW.status IS NOT NULL
+            ON CONFLICT (sprint_id, status) DO UPDATE SET
+                story_count = story_count + 1,
+                story_points = story_points + excluded.story_points;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_user_stories_rollup_delete
+        AFTER DELETE ON user_stories
+        BEGIN
+            UPDATE sprint_rollups SET
+                story_count = story_count - 1,
+                story_points = story_points - COALESCE(OLD.story_points, 0)
+            WHERE sprint_id = OLD.sprint_id AND status = OLD.status;
+            DELETE FROM sprint_rollups
+            WHERE sprint_id = OLD.sprint_id AND status = OLD.status AND story_count <= 0;
+        END
+        ''',
+        'DELETE FROM sprint_rollups',
+        'INSERT INTO sprint_rollups ' + SPRINT_ROLLUP_SOURCE_SQL + ' GROUP BY sprint_id, status'
+    ]),
+    (4, "Add append-only story_events log for burndown history", [
+        '''
+        CREATE TABLE IF NOT EXISTS story_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            story_id INTEGER NOT NULL,
+            sprint_id INTEGER NOT NULL,
+            event_type TEXT NOT NULL,
+            old_status TEXT,
+            new_status TEXT,
+            old_points INTEGER,
+            new_points INTEGER,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_story_events_sprint_created
+        ON story_events (sprint_id, created_at)
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_user_stories_event_insert
+        AFTER INSERT ON user_stories
+        WHEN NEW.sprint_id IS NOT NULL
+        BEGIN
+            INSERT INTO story_events (story_id, sprint_id, event_type, new_status, new_points)
+            VALUES (NEW.id, NEW.sprint_id, 'created', NEW.status, NEW.story_points);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_user_stories_event_update
+        AFTER UPDATE OF sprint_id, status, story_points ON user_stories
+        WHEN OLD.sprint_id IS NOT NEW.sprint_id
+          OR OLD.status IS NOT NEW.status
+          OR OLD.story_points IS NOT NEW.story_points
+        BEGIN
+            INSERT INTO story_events
+                (story_id, sprint_id, event_type, old_status, new_status, old_points, new_points)
+            SELECT NEW.id, NEW.sprint_id, 'updated',
+                   OLD.status, NEW.status, OLD.story_points, NEW.story_points
+            WHERE NEW.sprint_id IS NOT NULL AND OLD.sprint_id IS NEW.sprint_id;
+            INSERT INTO story_events (story_id, sprint_id, event_type, old_status, old_points)
+            SELECT OLD.id, OLD.sprint_id, 'moved_out', OLD.status, OLD.story_points
+            WHERE OLD.sprint_id IS NOT NULL AND OLD.sprint_id IS NOT NEW.sprint_id;
+            INSERT INTO story_events (story_id, sprint_id, event_type, new_status, new_points)
+            SELECT NEW.id, NEW.sprint_id, 'moved_in', NEW.status, NEW.story_points
+            WHERE NEW.sprint_id IS NOT NULL AND OLD.sprint_id IS NOT NEW.sprint_id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_user_stories_event_delete
+        AFTER DELETE ON user_stories
+        WHEN OLD.sprint_id IS NOT NULL
+        BEGIN
+            INSERT INTO story_events (story_id, sprint_id, event_type, old_status, old_points)
+            VALUES (OLD.id, OLD.sprint_id, 'deleted', OLD.status, OLD.story_points);
+        END
+        ''',
+        # Existing stories only have their current state to go on
+        '''
+        INSERT INTO story_events (story_id, sprint_id, event_type, new_status, new_points, created_at)
+        SELECT id, sprint_id, 'created', status, story_points, created_at
+        FROM user_stories WHERE sprint_id IS NOT NULL
+        '''
+    ]),
+    (5, "Index sprints by start date for portfolio queries", [
+        'CREATE INDEX IF NOT EXISTS idx_sprints_start_date ON sprints (start_date)'
+    ]),
+    (6, "Index deployments for live-version lookups and keyset history", [
+        # Both indexes end in the implicit rowid, so "latest by id" is a
+        # reverse index seek rather than a sort
+        '''
+        CREATE INDEX IF NOT EXISTS idx_deployments_live
+        ON deployments (application_name, environment, status)
+        ''',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_deployments_app
+        ON deployments (application_name)
+        '''
+    ]),
+    (7, "Add pipelines registry with compressed config blobs", [
+        '''
+        CREATE TABLE IF NOT EXISTS pipelines (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            app_name TEXT NOT NULL,
+            pipeline_type TEXT NOT NULL,
+            git_repo TEXT,
+            status TEXT DEFAULT 'configured',
+            config BLOB NOT NULL,
+            config_size INTEGER NOT NULL,
+            config_sha256 TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (app_name, pipeline_type)
+        )
+        '''
+    ]),
+    (8, "Add test_runs, test_results and coverage_results for ingested reports", [
+        '''
+        CREATE TABLE IF NOT EXISTS test_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            app_name TEXT NOT NULL,
+            build_id TEXT,
+            report_type TEXT NOT NULL,
+            report_name TEXT,
+            status TEXT NOT NULL DEFAULT 'ingesting',
+            tests INTEGER NOT NULL DEFAULT 0,
+            failures INTEGER NOT NULL DEFAULT 0,
+            errors INTEGER NOT NULL DEFAULT 0,
+            skipped INTEGER NOT NULL DEFAULT 0,
+            duration REAL NOT NULL DEFAULT 0,
+            lines_valid INTEGER,
+            lines_covered INTEGER,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE INDEX IF NOT EXISTS idx_test_runs_app_type
+        ON test_runs (app_name, report_type, status)
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS test_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id INTEGER NOT NULL REFERENCES test_runs (id),
+            test_key TEXT NOT NULL,
+            test_file TEXT,
+            duration REAL NOT NULL DEFAULT 0,
+            outcome TEXT NOT NULL
+        )
+        ''',
+        # Only run_id: it grows with the rowid, so the index is appended to
+        # rather than updated at random, which keeps bulk ingestion fast.
+        # Every query is bounded to a handful of recent runs through it.
+        'CREATE INDEX IF NOT EXISTS idx_test_results_run ON test_results (run_id)',
+        '''
+        CREATE TABLE IF NOT EXISTS coverage_results (
+            run_id INTEGER NOT NULL REFERENCES test_runs (id),
+            filename TEXT NOT NULL,
+            lines_valid INTEGER NOT NULL,
+            lines_covered INTEGER NOT NULL,
+            PRIMARY KEY (run_id, filename)
+        ) WITHOUT ROWID
+        '''
+    ]),
+    (9, "Record when sprints are closed", [
+        'ALTER TABLE sprints ADD COLUMN closed_at DATETIME',
+        # Sprints closed earlier: their last story change is the best estimate
+        '''
+        UPDATE sprints SET closed_at = COALESCE(
+            (SELECT MAX(created_at) FROM story_events WHERE sprint_id = sprints.id),
+            end_date
+        )
+        WHERE status = 'closed'
+        '''
+    ]),
+    (10, "Mark sprint velocities that were never recorded as NULL", [
+        # velocity defaults to 0, indistinguishable from a recorded 0; only
+        # close_sprint records it, together with closed_at
+        '''
+        UPDATE sprints SET velocity = NULL
+        WHERE status IS NOT 'closed' OR closed_at IS NULL
+        '''
+    ]),
+]
+
+
+def latest_version() -> int:
+    """Get the version the newest migration upgrades to"""
+    return MIGRATIONS[-1][0]
+
+
+def current_version(conn) -> int:
+    """Get the schema version of an open database"""
+    table = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    ).fetchone()
+    if not table:
+        return 0
+    row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    return row[0] or 0
+
+
+def migrate(pool, target_version: int = None) -> List[int]:
+    """Apply pending migrations up to target_version (default: latest)
+
+    Runs in a single write transaction, so concurrent workers starting at
+    the same time serialize here and only the first applies anything.
+    Returns the versions that were applied.
+    """
+    target_version = latest_version() if target_version is None else target_version
+    applied = []
+
+    with pool.transaction() as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        done = {row[0] for row in conn.execute('SELECT version FROM schema_version')}
+
+        for version, description, steps in MIGRATIONS:
+            if version in done or version > target_version:
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(
+                'INSERT INTO schema_version (version, description) VALUES (?, ?)',
+                (version, description)
+            )
+            applied.append(version)
+            logger.info(f"Applied migration {version}: {description}")
+
+    return applied
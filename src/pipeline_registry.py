@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Pipeline registry for the DevOps platform
+Generated CI/CD configs persisted as compressed blobs in SQLite
+"""
+
+import hashlib
+import logging
+import zlib
+from typing import Dict, Any, Optional
+
+from cache import LRUCache
+from database import ConnectionPool, DirectWriter
+from migrations import migrate
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineRegistry:
+    """Registered pipeline configs, one per (app_name, pipeline_type)
+
+    Configs are zlib-compressed into the pipelines table and loaded lazily;
+    only a small hot set of decompressed records stays in memory, so the
+    footprint is flat however many pipelines are registered. Without a
+    pool the registry keeps its own in-memory database.
+    """
+
+    COLUMNS = ('id', 'app_name', 'pipeline_type', 'git_repo', 'status',
+               'config_size', 'created_at', 'updated_at')
+
+    def __init__(self, pool: ConnectionPool = None, writer=None, hot_size: int = 128):
+        self._owns_pool = pool is None
+        if pool is None:
+            pool = ConnectionPool('memory://')
+            migrate(pool)
+        self.pool = pool
+        self.writer = writer or DirectWriter(pool)
+        self.hot = LRUCache(hot_size)
+
+    def register(self, app_name: str, pipeline_type: str, config: str,
+                 git_repo: str = None) -> Dict[str, Any]:
+        """Store a pipeline config, replacing any previous one for the app and type
+
+        Re-registering an unchanged config is answered from the hot set
+        without touching the database.
+        """
+        key = (app_name, pipeline_type)
+        digest = hashlib.sha256(config.encode('utf-8')).hexdigest()
+        cached = self.hot.get(key)
+        if cached and cached['config_sha256'] == digest and cached['git_repo'] == git_repo:
+            return cached
+
+        blob = zlib.compress(config.encode('utf-8'))
+
+        def operation(conn):
+            conn.execute('''
+                INSERT INTO pipelines
+                (app_name, pipeline_type, git_repo, config, config_size, config_sha256)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (app_name, pipeline_type) DO UPDATE SET
+                    git_repo = excluded.git_repo,
+                    status = 'configured',
+                    config = excluded.config,
+                    config_size = excluded.config_size,
+                    config_sha256 = excluded.config_sha256,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE config_sha256 IS NOT excluded.config_sha256
+                   OR git_repo IS NOT excluded.git_repo
+            ''', (app_name, pipeline_type, git_repo, blob, len(config), digest))
+            return self._select(conn, app_name, pipeline_type)
+
+        record = self.writer.submit(operation).result()
+        self.hot.put(key, record)
+        return record
+
+    def _select(self, conn, app_name: str, pipeline_type: str) -> Optional[Dict[str, Any]]:
+        row = conn.execute(f'''
+            SELECT {', '.join(self.COLUMNS)}, config, config_sha256
+            FROM pipelines WHERE app_name = ? AND pipeline_type = ?
+        ''', (app_name, pipeline_type)).fetchone()
+        if not row:
+            return None
+        record = dict(zip(self.COLUMNS, row))
+        record['config'] = zlib.decompress(row[-2]).decode('utf-8')
+        record['config_sha256'] = row[-1]
+        return record
+
+    def get(self, app_name: str, pipeline_type: str = 'jenkins') -> Optional[Dict[str, Any]]:
+        """Get a registered pipeline with its config, or None"""
+        key = (app_name, pipeline_type)
+        record = self.hot.get(key)
+        if record is None:
+            with self.pool.connection() as conn:
+                record = self._select(conn, app_name, pipeline_type)
+            if record is not None:
+                self.hot.put(key, record)
+        return record
+
+    def list(self, after_id: int = 0, limit: int = 100,
+             pipeline_type: str = None) -> Dict[str, Any]:
+        """List registered pipelines in ID order, without their configs
+
+        Returns {'pipelines': [...], 'next_after_id': id or None}; pass
+        next_after_id back as after_id for the following page.
+        """
+        sql = f'SELECT {", ".join(self.COLUMNS)}, length(config) FROM pipelines WHERE id > ?'
+        params = [after_id]
+        if pipeline_type:
+            sql += ' AND pipeline_type = ?'
+            params.append(pipeline_type)
+        sql += ' ORDER BY id LIMIT ?'
+        params.append(limit)
+
+        with self.pool.connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        pipelines = []
+        for row in rows:
+            record = dict(zip(self.COLUMNS, row))
+            record['compressed_size'] = row[-1]
+            pipelines.append(record)
+        return {
+            'pipelines': pipelines,
+            'next_after_id': rows[-1][0] if len(rows) == limit else None
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Get registry size, storage and hot-set statistics"""
+        with self.pool.connection() as conn:
+            count, config_bytes, stored_bytes = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(config_size), 0), '
+                'COALESCE(SUM(length(config)), 0) FROM pipelines'
+            ).fetchone()
+        return {
+            'pipelines': count,
+            'config_bytes': config_bytes,
+            'stored_bytes': stored_bytes,
+            'compression_ratio': (config_bytes / stored_bytes) if stored_bytes else 0,
+            'hot_set': self.hot.stats()
+        }
+
+    def close(self):
+        if self._owns_pool:
+            self.pool.close()
+
+    def __contains__(self, app_name: str) -> bool:
+        with self.pool.connection() as conn:
+            return conn.execute(
+                'SELECT 1 FROM pipelines WHERE app_name = ? LIMIT 1', (app_name,)
+            ).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self.pool.connection() as conn:
+            return conn.execute('SELECT COUNT(*) FROM pipelines').fetchone()[0]
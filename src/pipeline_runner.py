@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Local pipeline runner for the DevOps platform
+Executes CI/CD stages as a dependency graph, running independent stages in parallel
+"""
+
+import logging
+import math
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Any, Iterable, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Stages without a timeout of their own are killed after this many seconds
+DEFAULT_STAGE_TIMEOUT = 600.0
+
+
+class Stage:
+    """A pipeline stage: a shell command and the stages it waits for
+
+    inputs and outputs are glob patterns relative to the workspace. A
+    stage that declares inputs is cacheable: with a build cache, it is
+    skipped when its command, env, input files and upstream stages are
+    unchanged, and its outputs are restored from the cache instead.
+    """
+
+    def __init__(self, name: str, command: str, depends_on: Sequence[str] = (),
+                 env: Dict[str, str] = None, timeout: float = None,
+                 inputs: Sequence[str] = None, outputs: Sequence[str] = ()):
+        self.name = name
+        self.command = command
+        self.depends_on = tuple(depends_on)
+        self.env = env or {}
+        self.timeout = timeout
+        self.inputs = tuple(inputs) if inputs is not None else None
+        self.outputs = tuple(outputs)
+
+    @property
+    def cacheable(self) -> bool:
+        return self.inputs is not None
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, depends_on={list(self.depends_on)})"
+
+
+class PipelineDAG:
+    """Stages validated as a directed acyclic graph"""
+
+    def __init__(self, stages: Iterable[Stage]):
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage '{stage.name}'")
+            self.stages[stage.name] = stage
+
+        for stage in self.stages.values():
+            unknown = [dep for dep in stage.depends_on if dep not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages {unknown}")
+
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """Kahn's algorithm, keeping declaration order among ready stages"""
+        remaining = {name: len(stage.depends_on) for name, stage in self.stages.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for dependent in self.dependents(name):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(self.stages):
+            cyclic = sorted(set(self.stages) - set(order))
+            raise ValueError(f"Stage dependencies contain a cycle through {cyclic}")
+        return order
+
+    def dependents(self, name: str) -> List[str]:
+        return [stage.name for stage in self.stages.values() if name in stage.depends_on]
+
+    def critical_path(self, durations: Dict[str, float]) -> List[str]:
+        """Longest chain of dependent stages by duration, in execution order"""
+        finish = {}
+        previous = {}
+        for name in self.order:
+            deps = self.stages[name].depends_on
+            slowest = max(deps, key=lambda dep: finish[dep], default=None)
+            previous[name] = slowest
+            finish[name] = durations.get(name, 0.0) + (finish[slowest] if slowest else 0.0)
+
+        if not finish:
+            return []
+        # On ties prefer the later stage, so zero-length tails stay on the path
+        name = max(reversed(self.order), key=finish.get)
+        path = []
+        while name:
+            path.append(name)
+            name = previous[name]
+        return path[::-1]
+
+    def sequential(self) -> 'PipelineDAG':
+        """The same stages chained one after another in topological order"""
+        stages = []
+        for index, name in enumerate(self.order):
+            stage = self.stages[name]
+            stages.append(Stage(name, stage.command, self.order[index - 1:index],
+                                stage.env, stage.timeout, stage.inputs, stage.outputs))
+        return PipelineDAG(stages)
+
+
+class PipelineRunner:
+    """Runs a PipelineDAG, starting each stage as soon as its dependencies succeed
+
+    Stages are subprocesses, so a thread pool gives real parallelism. A
+    failed stage skips everything downstream of it; independent branches
+    still run to completion. With a BuildCache, cacheable stages whose key
+    is already stored are restored instead of run. Stages without their
+    own timeout fail after stage_timeout seconds.
+    """
+
+    def __init__(self, max_workers: int = 4, cwd: str = None, cache=None,
+                 stage_timeout: float = DEFAULT_STAGE_TIMEOUT):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.cwd = cwd
+        self.cache = cache
+        self.stage_timeout = stage_timeout
+
+    def _run_stage(self, stage: Stage, started_at: float,
+                   dependency_keys: Sequence[str]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        key = None
+        if self.cache is not None and stage.cacheable and None not in dependency_keys:
+            key = self.cache.stage_key(stage, self.cwd, dependency_keys)
+            entry = self.cache.lookup(key)
+            if entry is not None:
+                try:
+                    self.cache.restore(entry, self.cwd)
+                except FileNotFoundError:
+                    # Evicted between lookup and restore; run it instead
+                    pass
+                else:
+                    end = time.perf_counter()
+                    return {
+                        'status': 'success',
+                        'cached': True,
+                        'cache_key': key,
+                        'returncode': 0,
+                        'start': round(start - started_at, 4),
+                        'end': round(end - started_at, 4),
+                        'duration': round(end - start, 4),
+                        'time_saved': round(max(entry['duration'] - (end - start), 0.0), 4),
+                        'output': entry['output']
+                    }
+        timeout = stage.timeout if stage.timeout is not None else self.stage_timeout
+        try:
+            completed = subprocess.run(
+                stage.command, shell=True, cwd=self.cwd, capture_output=True, text=True,
+                env={**os.environ, **stage.env}, timeout=timeout
+            )
+            returncode = completed.returncode
+            output = (completed.stdout + completed.stderr)[-2000:]
+        except subprocess.TimeoutExpired:
+            returncode = None
+            output = f"Timed out after {timeout}s"
+        end = time.perf_counter()
+
+        result = {
+            'status': 'success' if returncode == 0 else 'failed',
+            'cached': False,
+            'cache_key': key,
+            'returncode': returncode,
+            'start': round(start - started_at, 4),
+            'end': round(end - started_at, 4),
+            'duration': round(end - start, 4),
+            'output': output
+        }
+        if key is not None and returncode == 0:
+            self.cache.store(key, stage, result, self.cwd)
+        return result
+
+    def run(self, dag: PipelineDAG) -> Dict[str, Any]:
+        """Execute every stage and return a timing report
+
+        The report has per-stage status and timings (seconds from pipeline
+        start), total wall time, the serial time the same stages would
+        take one after another, and the critical path through the graph.
+        """
+        started_at = time.perf_counter()
+        results = {}
+        waiting = {name: set(stage.depends_on) for name, stage in dag.stages.items()}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+
+            def start_ready():
+                for name in [name for name, deps in waiting.items() if not deps]:
+                    del waiting[name]
+                    # Keys chain off upstream keys; None marks an uncacheable upstream
+                    dependency_keys = [results[dep].get('cache_key')
+                                       for dep in dag.stages[name].depends_on]
+                    running[executor.submit(self._run_stage, dag.stages[name], started_at,
+                                            dependency_keys)] = name
+
+            start_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    logger.info(f"Stage {name} {results[name]['status']} "
+                                f"in {results[name]['duration']:.2f}s")
+                    if results[name]['status'] == 'success':
+                        for deps in waiting.values():
+                            deps.discard(name)
+                    else:
+                        self._skip_downstream(dag, name, waiting, results)
+                start_ready()
+
+        wall_time = time.perf_counter() - started_at
+        durations = {name: result.get('duration', 0.0) for name, result in results.items()}
+        critical_path = dag.critical_path(durations)
+        serial_time = sum(durations.values())
+
+        return {
+            'status': 'success' if all(r['status'] == 'success' for r in results.values())
+                      else 'failed',
+            'max_workers': self.max_workers,
+            'stages': {name: results[name] for name in dag.order},
+            'wall_time': round(wall_time, 4),
+            'serial_time': round(serial_time, 4),
+            'speedup': round(serial_time / wall_time, 2) if wall_time > 0 else 0,
+            'critical_path': critical_path,
+            'critical_path_time': round(sum(durations[name] for name in critical_path), 4),
+            'cache': self._cache_summary(results)
+        }
+
+    def _cache_summary(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        looked_up = [r for r in results.values() if r.get('cache_key')]
+        hits = [r for r in looked_up if r['cached']]
+        return {
+            'enabled': self.cache is not None,
+            'hits': len(hits),
+            'misses': len(looked_up) - len(hits),
+            'time_saved': round(sum(r['time_saved'] for r in hits), 4)
+        }
+
+    def _skip_downstream(self, dag: PipelineDAG, failed: str, waiting: Dict[str, set],
+                         results: Dict[str, Any]):
+        pending = dag.dependents(failed)
+        while pending:
+            name = pending.pop()
+            if name in waiting:
+                del waiting[name]
+                results[name] = {'status': 'skipped', 'skipped_because': failed}
+                pending.extend(dag.dependents(name))
+
+
+def _sleep_command(seconds: float) -> str:
+    return f'"{sys.executable}" -c "import time; time.sleep({seconds})"'
+
+
+# Stand-in durations (seconds) for the stages the generated Jenkinsfile runs
+DEFAULT_STAGE_DURATIONS = {
+    'checkout': 0.2,
+    'unit_tests': 1.0,
+    'coverage': 0.8,
+    'bandit': 0.6,
+    'safety': 0.4,
+    'build': 1.2,
+    'deploy_staging': 0.5,
+    'integration_tests': 0.9,
+}
+
+# Longest a stand-in stage sleeps once scaled; longer requests are clamped
+MAX_STAND_IN_SECONDS = 10.0
+
+
+def _non_negative(value, what: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or \
+            not math.isfinite(value) or value < 0:
+        raise ValueError(f"{what} must be a finite, non-negative number")
+    return float(value)
+
+
+def default_stages(scale: float = 1.0, durations: Dict[str, float] = None) -> List[Stage]:
+    """Offline stand-ins for the generated pipeline's stages, as sleep commands
+
+    The tests and both security scanners only need the checkout, and the
+    image build needs the tests and scans to pass. Everything up to the
+    build declares its inputs so it can be cached; the deploy and the
+    tests against it have side effects and always run. scale and
+    durations are validated, and each scaled duration is capped at
+    MAX_STAND_IN_SECONDS, since they may come from an API request.
+    """
+    scale = _non_negative(scale, "scale")
+    if durations is not None and not isinstance(durations, dict):
+        raise ValueError("durations must map stage names to seconds")
+    unknown = sorted(set(durations or {}) - set(DEFAULT_STAGE_DURATIONS))
+    if unknown:
+        raise ValueError(f"Unknown stages in durations: {unknown}")
+    durations = {**DEFAULT_STAGE_DURATIONS,
+                 **{name: _non_negative(seconds, f"Duration of {name}")
+                    for name, seconds in (durations or {}).items()}}
+    sources = ('src/**/*.py', 'tests/**/*.py', 'requirements.txt')
+    stages = {
+        'checkout': ((), sources),
+        'unit_tests': (('checkout',), sources),
+        'coverage': (('checkout',), sources),
+        'bandit': (('checkout',), ('src/**/*.py',)),
+        'safety': (('checkout',), ('requirements.txt',)),
+        'build': (('unit_tests', 'coverage', 'bandit', 'safety'),
+                  ('Dockerfile', 'requirements.txt', 'src/**/*.py')),
+        'deploy_staging': (('build',), None),
+        'integration_tests': (('deploy_staging',), None),
+    }
+    return [Stage(name, _sleep_command(min(durations[name] * scale, MAX_STAND_IN_SECONDS)),
+                  depends_on, inputs=inputs)
+            for name, (depends_on, inputs) in stages.items()]
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render a run report as a plain-text table"""
+    lines = [f"{'stage':<20} {'status':<8} {'start':>7} {'duration':>9}"]
+    for name, result in report['stages'].items():
+        if result['status'] == 'skipped':
+            lines.append(f"{name:<20} {'skipped':<8}")
+        else:
+            lines.append(f"{name:<20} {result['status']:<8} "
+                         f"{result['start']:>7.2f} {result['duration']:>9.2f}"
+                         f"{'  (cached)' if result['cached'] else ''}")
+    lines.append(f"Wall time {report['wall_time']:.2f}s vs {report['serial_time']:.2f}s serial "
+                 f"({report['speedup']}x with {report['max_workers']} workers)")
+    lines.append(f"Critical path ({report['critical_path_time']:.2f}s): "
+                 f"{' -> '.join(report['critical_path'])}")
+    cache = report['cache']
+    if cache['enabled']:
+        lines.append(f"Build cache: {cache['hits']} hits, {cache['misses']} misses, "
+                     f"{cache['time_saved']:.2f}s saved")
+    return '\n'.join(lines)
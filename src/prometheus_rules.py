@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Prometheus rule validation for the DevOps platform
+Structural and PromQL syntax checks for generated alerting and recording rules
+"""
+
+import re
+from typing import List, Tuple
+
+import yaml
+
+METRIC_NAME = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*$')
+LABEL_NAME = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+DURATION = re.compile(r'^(\d+(ms|s|m|h|d|w|y))+$')
+
+FUNCTIONS = {
+    'abs', 'absent', 'absent_over_time', 'avg_over_time', 'ceil', 'changes', 'clamp',
+    'clamp_max', 'clamp_min', 'count_over_time', 'day_of_month', 'day_of_week', 'delta',
+    'deriv', 'exp', 'floor', 'histogram_quantile', 'holt_winters', 'hour', 'idelta',
+    'increase', 'irate', 'label_join', 'label_replace', 'last_over_time', 'ln', 'log2',
+    'log10', 'max_over_time', 'min_over_time', 'minute', 'month', 'predict_linear',
+    'quantile_over_time', 'rate', 'resets', 'round', 'scalar', 'sgn', 'sort', 'sort_desc',
+    'sqrt', 'stddev_over_time', 'stdvar_over_time', 'sum_over_time', 'time', 'timestamp',
+    'vector', 'year',
+}
+AGGREGATIONS = {
+    'avg', 'bottomk', 'count', 'count_values', 'group', 'max', 'min', 'quantile', 'stddev',
+    'stdvar', 'sum', 'topk',
+}
+# Keywords that may be followed by a parenthesis without being a call
+KEYWORDS = {'by', 'without', 'on', 'ignoring', 'group_left', 'group_right', 'and', 'or',
+            'unless', 'bool'}
+
+_TOKEN = re.compile(r'''
+    (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<duration>\[[^\]]*\])
+  | (?P<number>\d+(?:\.\d+)?(?:e[+-]?\d+)?)
+  | (?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)
+  | (?P<matcher_op>=~|!~|!=)
+  | (?P<op>==|<=|>=|[-+*/%^<>=,])
+  | (?P<open>[({])
+  | (?P<close>[)}])
+  | (?P<space>\s+)
+''', re.VERBOSE)
+
+_PAIRS = {')': '(', '}': '{'}
+
+
+def _tokens(expr: str) -> Tuple[List[Tuple[str, str]], List[str]]:
+    tokens, errors = [], []
+    position = 0
+    while position < len(expr):
+        match = _TOKEN.match(expr, position)
+        if not match:
+            errors.append(f"unexpected character {expr[position]!r} at offset {position}")
+            break
+        if match.lastgroup != 'space':
+            tokens.append((match.lastgroup, match.group()))
+        position = match.end()
+    return tokens, errors
+
+
+def check_expr(expr: str) -> List[str]:
+    """Syntax problems in a PromQL expression: brackets, durations, matchers and functions"""
+    if not isinstance(expr, str) or not expr.strip():
+        return ["expr must be a non-empty string"]
+    tokens, errors = _tokens(expr)
+
+    stack = []
+    for index, (kind, text) in enumerate(tokens):
+        following = tokens[index + 1] if index + 1 < len(tokens) else (None, None)
+        if kind == 'open':
+            stack.append(text)
+        elif kind == 'close':
+            if not stack or stack.pop() != _PAIRS[text]:
+                errors.append(f"unbalanced {text!r}")
+        elif kind == 'duration':
+            # [range] or a [range:resolution] subquery with optional resolution
+            parts = text[1:-1].split(':')
+            if len(parts) > 2 or not all(DURATION.match(part) for part in parts if part) \
+                    or not parts[0]:
+                errors.append(f"invalid range {text}")
+        elif kind == 'name' and stack and stack[-1] == '{':
+            # Inside a selector: label name, matcher, quoted value
+            if not LABEL_NAME.match(text):
+                errors.append(f"invalid label name {text!r}")
+            op = following[1]
+            value = tokens[index + 2] if index + 2 < len(tokens) else (None, None)
+            if op not in ('=', '!=', '=~', '!~') or value[0] != 'string':
+                errors.append(f"label matcher for {text!r} needs an operator and a quoted value")
+        elif kind == 'name' and following == ('open', '(') and \
+                text not in FUNCTIONS | AGGREGATIONS | KEYWORDS:
+            errors.append(f"unknown function {text!r}")
+    if stack:
+        errors.append(f"unclosed {stack[-1]!r}")
+    return errors
+
+
+def _recorded_names(expr: str) -> List[str]:
+    tokens, _ = _tokens(expr)
+    return [text for kind, text in tokens if kind == 'name' and ':' in text]
+
+
+def _check_rule(rule, group_name: str, index: int, not_yet_recorded: set) -> List[str]:
+    where = f"group {group_name!r} rule {index}"
+    if not isinstance(rule, dict):
+        return [f"{where}: must be a mapping"]
+    errors = []
+    if ('record' in rule) == ('alert' in rule):
+        return [f"{where}: needs exactly one of 'record' or 'alert'"]
+
+    if 'record' in rule:
+        name = rule['record']
+        allowed = {'record', 'expr', 'labels'}
+        if not isinstance(name, str) or not METRIC_NAME.match(name):
+            errors.append(f"{where}: invalid record name {name!r}")
+    else:
+        name = rule['alert']
+        allowed = {'alert', 'expr', 'for', 'labels', 'annotations'}
+        if not isinstance(name, str) or not LABEL_NAME.match(name):
+            errors.append(f"{where}: invalid alert name {name!r}")
+        if 'for' in rule and not DURATION.match(str(rule['for'])):
+            errors.append(f"{where}: invalid 'for' duration {rule['for']!r}")
+    where = f"{where} ({name})"
+
+    for key in sorted(set(rule) - allowed):
+        errors.append(f"{where}: unexpected field {key!r}")
+    for field in ('labels', 'annotations'):
+        for label, value in (rule.get(field) or {}).items():
+            if not LABEL_NAME.match(str(label)):
+                errors.append(f"{where}: invalid {field[:-1]} name {label!r}")
+            if not isinstance(value, str):
+                errors.append(f"{where}: {field[:-1]} {label!r} must be a string")
+
+    errors.extend(f"{where}: {problem}" for problem in check_expr(rule.get('expr')))
+    if isinstance(rule.get('expr'), str):
+        # Rules in a group run in order; a later one would be read one evaluation stale
+        for series in _recorded_names(rule['expr']):
+            if series in not_yet_recorded:
+                errors.append(f"{where}: uses {series} before the rule recording it")
+    return errors
+
+
+def validate_rules(rules_yaml: str) -> List[str]:
+    """Problems in a Prometheus rule file, as promtool check rules would flag; empty if valid"""
+    try:
+        document = yaml.safe_load(rules_yaml)
+    except yaml.YAMLError as e:
+        return [f"invalid YAML: {e}"]
+    if not isinstance(document, dict) or not isinstance(document.get('groups'), list):
+        return ["rule file needs a 'groups' list"]
+
+    errors = []
+    group_names = set()
+    for group in document['groups']:
+        if not isinstance(group, dict) or not group.get('name'):
+            errors.append("every group needs a name")
+            continue
+        name = group['name']
+        if name in group_names:
+            errors.append(f"duplicate group name {name!r}")
+        group_names.add(name)
+        if 'interval' in group and not DURATION.match(str(group['interval'])):
+            errors.append(f"group {name!r}: invalid interval {group['interval']!r}")
+        rules = group.get('rules')
+        if not isinstance(rules, list) or not rules:
+            errors.append(f"group {name!r} has no rules")
+            continue
+
+        records = [rule.get('record') if isinstance(rule, dict) else None for rule in rules]
+        for index, rule in enumerate(rules):
+            errors.extend(_check_rule(rule, name, index, set(records[index:])))
+    return errors
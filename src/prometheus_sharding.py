@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Prometheus scrape sharding for the DevOps platform
+Hashmod shard assignment and per-shard series estimates for large fleets
+"""
+
+import hashlib
+import math
+from typing import Dict, List, Any, Sequence, Tuple, Union
+
+# Series a pod of this platform exposes once every route has been hit: a
+# 17-series latency histogram, an in-flight gauge and a couple of status
+# counters per route, plus the SQLite pool metrics
+DEFAULT_SERIES_PER_TARGET = 800
+
+# up, scrape_duration_seconds, scrape_samples_scraped,
+# scrape_samples_post_metric_relabeling and scrape_series_added
+SCRAPE_SERIES_PER_TARGET = 5
+
+# Planning figure for head block memory per active series, index included
+HEAD_BYTES_PER_SERIES = 4096
+
+DEFAULT_MAX_SERIES_PER_SHARD = 1_000_000
+MAX_SHARDS = 1024
+
+Targets = Union[int, Sequence[str]]
+
+
+def _hash64(value: str) -> int:
+    # Prometheus uses the last 8 bytes of the MD5 as a big-endian integer
+    return int.from_bytes(hashlib.md5(value.encode('utf-8')).digest()[8:], 'big')
+
+
+def hashmod(value: str, modulus: int) -> int:
+    """Shard Prometheus' hashmod relabel action assigns value to
+
+    value is the source label values joined by ';', so with
+    source_labels [__address__] it is the target address.
+    """
+    return _hash64(value) % modulus
+
+
+def _job_loads(targets: Dict[str, Targets],
+               series_per_target: Union[int, Dict[str, int]]) -> List[Tuple[str, int, Any]]:
+    if not isinstance(targets, dict) or not targets:
+        raise ValueError("targets must map job names to a target count or address list")
+    loads = []
+    for job, job_targets in targets.items():
+        if isinstance(series_per_target, dict):
+            per_target = series_per_target.get(job, DEFAULT_SERIES_PER_TARGET)
+        else:
+            per_target = series_per_target
+        if isinstance(per_target, bool) or not isinstance(per_target, int) or per_target < 1:
+            raise ValueError(f"series_per_target for {job} must be a positive integer")
+
+        if isinstance(job_targets, bool):
+            raise ValueError(f"targets for {job} must be a count or a list of addresses")
+        if isinstance(job_targets, int):
+            if job_targets < 0:
+                raise ValueError(f"target count for {job} must not be negative")
+        elif isinstance(job_targets, (list, tuple)) and \
+                all(isinstance(address, str) for address in job_targets):
+            # Hashed once; each shard count then only needs the modulus
+            job_targets = [_hash64(address) for address in job_targets]
+        else:
+            raise ValueError(f"targets for {job} must be a count or a list of addresses")
+        loads.append((job, per_target + SCRAPE_SERIES_PER_TARGET, job_targets))
+    return loads
+
+
+def _distribute(loads: List[Tuple[str, int, Any]],
+                shards: int) -> Tuple[List[float], List[float], float]:
+    """Targets and series per shard, and the spread hashing adds around them
+
+    Jobs given as address lists are placed exactly. For jobs given as a
+    count the expected share is used: each target lands on a shard with
+    probability 1/shards, so a shard's count is binomial and contributes
+    its variance to the uncertainty of every shard's series.
+    """
+    targets = [0.0] * shards
+    series = [0.0] * shards
+    variance = 0.0
+    for _, per_target, job_targets in loads:
+        if isinstance(job_targets, int):
+            share = job_targets / shards
+            for shard in range(shards):
+                targets[shard] += share
+                series[shard] += share * per_target
+            variance += job_targets * (1 / shards) * (1 - 1 / shards) * per_target ** 2
+        else:
+            for hashed in job_targets:
+                shard = hashed % shards
+                targets[shard] += 1
+                series[shard] += per_target
+    return targets, series, math.sqrt(variance)
+
+
+def _likely_max(series: List[float], deviation: float) -> float:
+    # The largest of n roughly normal shares sits about sqrt(2 ln n) deviations up
+    return max(series) + math.sqrt(2 * math.log(len(series))) * deviation
+
+
+def estimate_series_per_shard(targets: Dict[str, Targets], shards: int,
+                              series_per_target: Union[int, Dict[str, int]] =
+                              DEFAULT_SERIES_PER_TARGET,
+                              max_series_per_shard: int =
+                              DEFAULT_MAX_SERIES_PER_SHARD) -> Dict[str, Any]:
+    """Active series each of shards hashmod-sharded Prometheus replicas holds
+
+    targets maps each scrape job to a target count or to the target
+    addresses; addresses are placed exactly as hashmod would place them,
+    counts by their expected share. series_per_target is one figure or a
+    per-job mapping, e.g. count({job="app"}) / count(up{job="app"}) from a
+    running server. max_shard_series is the load of the fullest shard to
+    plan memory for, and recommended_shards the fewest replicas that keep
+    it within max_series_per_shard.
+    """
+    if isinstance(shards, bool) or not isinstance(shards, int) or not 1 <= shards <= MAX_SHARDS:
+        raise ValueError(f"shards must be an integer from 1 to {MAX_SHARDS}")
+    if isinstance(max_series_per_shard, bool) or not isinstance(max_series_per_shard, int) \
+            or max_series_per_shard < 1:
+        raise ValueError("max_series_per_shard must be a positive integer")
+
+    loads = _job_loads(targets, series_per_target)
+    shard_targets, shard_series, deviation = _distribute(loads, shards)
+    total_series = sum(shard_series)
+    max_series = _likely_max(shard_series, deviation)
+
+    recommended = None
+    if max(per_target for _, per_target, _ in loads) <= max_series_per_shard:
+        for candidate in range(1, MAX_SHARDS + 1):
+            _, candidate_series, candidate_deviation = _distribute(loads, candidate)
+            if _likely_max(candidate_series, candidate_deviation) <= max_series_per_shard:
+                recommended = candidate
+                break
+
+    return {
+        'shards': shards,
+        'targets': round(sum(shard_targets)),
+        'series': round(total_series),
+        'per_shard': [{'shard': shard, 'targets': round(shard_targets[shard], 1),
+                       'series': round(shard_series[shard])} for shard in range(shards)],
+        'max_shard_series': round(max_series),
+        'imbalance': round(max_series / (total_series / shards), 3) if total_series else 1.0,
+        'memory_bytes_per_shard': round(max_series) * HEAD_BYTES_PER_SERIES,
+        'max_series_per_shard': max_series_per_shard,
+        'recommended_shards': recommended
+    }
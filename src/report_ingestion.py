@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Test report ingestion for the DevOps platform
+Streams JUnit and Cobertura coverage reports into SQLite for test-performance queries
+"""
+
+import logging
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Any, IO, Iterator, Optional, Sequence, Union
+
+from database import ConnectionPool, DirectWriter
+
+logger = logging.getLogger(__name__)
+
+FAILED_OUTCOMES = ('failed', 'error')
+
+
+def iter_xml_elements(source: Union[str, IO], tags: Sequence[str]) -> Iterator[ET.Element]:
+    """Yield each complete element with one of the given tags, then discard it
+
+    Elements are cleared and detached from their parent after the caller
+    is done with them, so memory stays flat however large the document.
+    """
+    tags = set(tags)
+    parents = []
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            parents.append(elem)
+            continue
+        parents.pop()
+        if elem.tag in tags:
+            yield elem
+            elem.clear()
+            if parents:
+                parents[-1].remove(elem)
+
+
+def testcase_file(attrib: Dict[str, str]) -> Optional[str]:
+    """Test file a JUnit testcase belongs to
+
+    Uses the file attribute when the reporter writes one, otherwise maps
+    pytest's dotted classname (tests.unit.test_app.TestApp) to a path by
+    dropping the trailing class names.
+    """
+    if attrib.get('file'):
+        return attrib['file'].replace('\\', '/')
+    classname = attrib.get('classname')
+    if not classname:
+        return None
+    parts = classname.split('.')
+    while len(parts) > 1 and parts[-1][:1].isupper():
+        parts.pop()
+    return '/'.join(parts) + '.py'
+
+
+def _outcome(testcase: ET.Element) -> str:
+    for child in testcase:
+        if child.tag == 'failure':
+            return 'failed'
+        if child.tag == 'error':
+            return 'error'
+        if child.tag == 'skipped':
+            return 'skipped'
+    return 'passed'
+
+
+class ReportStore:
+    """Ingested JUnit and coverage reports with slowest, trend and flaky queries"""
+
+    def __init__(self, pool: ConnectionPool, writer=None, batch_size: int = 5000):
+        self.pool = pool
+        self.writer = writer or DirectWriter(pool)
+        self.batch_size = batch_size
+
+    def _write(self, operation):
+        return self.writer.submit(operation).result()
+
+    def _start_run(self, app_name: str, report_type: str, build_id: str,
+                   report_name: str) -> int:
+        def operation(conn):
+            cursor = conn.execute('''
+                INSERT INTO test_runs (app_name, build_id, report_type, report_name)
+                VALUES (?, ?, ?, ?)
+            ''', (app_name, build_id, report_type, report_name))
+            return cursor.lastrowid
+        return self._write(operation)
+
+    def _fail_run(self, run_id: int):
+        self._write(lambda conn: conn.execute(
+            "UPDATE test_runs SET status = 'failed' WHERE id = ?", (run_id,)
+        ))
+
+    def ingest_junit(self, source: Union[str, IO], app_name: str, build_id: str = None,
+                     report_name: str = 'test-results.xml') -> Dict[str, Any]:
+        """Stream a JUnit XML report (path or file object) into test_results
+
+        Testcases are inserted in batches of batch_size, each in its own
+        write, so neither the parser nor the writer holds the whole report.
+        The run only shows up in queries once it is complete; a report that
+        fails to parse leaves it marked 'failed'.
+        """
+        run_id = self._start_run(app_name, 'junit', build_id, report_name)
+        totals = {'tests': 0, 'failed': 0, 'error': 0, 'skipped': 0, 'duration': 0.0}
+        batch = []
+
+        def insert(rows):
+            self._write(lambda conn: conn.executemany('''
+                INSERT INTO test_results (run_id, test_key, test_file, duration, outcome)
+                VALUES (?, ?, ?, ?, ?)
+            ''', rows))
+
+        try:
+            for testcase in iter_xml_elements(source, ('testcase',)):
+                outcome = _outcome(testcase)
+                duration = float(testcase.get('time') or 0)
+                test_key = f"{testcase.get('classname', '')}::{testcase.get('name', '')}"
+                batch.append((run_id, test_key, testcase_file(testcase.attrib), duration, outcome))
+
+                totals['tests'] += 1
+                totals['duration'] += duration
+                if outcome != 'passed':
+                    totals[outcome] += 1
+
+                if len(batch) >= self.batch_size:
+                    insert(batch)
+                    batch = []
+            if batch:
+                insert(batch)
+        except Exception:
+            self._fail_run(run_id)
+            raise
+
+        self._write(lambda conn: conn.execute('''
+            UPDATE test_runs SET status = 'complete', tests = ?, failures = ?, errors = ?,
+                skipped = ?, duration = ?
+            WHERE id = ?
+        ''', (totals['tests'], totals['failed'], totals['error'], totals['skipped'],
+              totals['duration'], run_id)))
+        logger.info(f"Ingested {report_name} for {app_name}: {totals['tests']} tests "
+                    f"in {totals['duration']:.1f}s (run {run_id})")
+        return self.get_run(run_id)
+
+    def ingest_coverage(self, source: Union[str, IO], app_name: str, build_id: str = None,
+                        report_name: str = 'coverage.xml') -> Dict[str, Any]:
+        """Stream a Cobertura coverage.xml report into per-file line coverage"""
+        run_id = self._start_run(app_name, 'coverage', build_id, report_name)
+        lines_valid = lines_covered = 0
+        batch = []
+
+        def insert(rows):
+            # Cobertura can list several classes for one file
+            self._write(lambda conn: conn.executemany('''
+                INSERT INTO coverage_results (run_id, filename, lines_valid, lines_covered)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (run_id, filename) DO UPDATE SET
+                    lines_valid = lines_valid + excluded.lines_valid,
+                    lines_covered = lines_covered + excluded.lines_covered
+            ''', rows))
+
+        try:
+            for cls in iter_xml_elements(source, ('class',)):
+                lines = cls.find('lines')
+                valid = covered = 0
+                for line in (lines if lines is not None else ()):
+                    valid += 1
+                    covered += int(line.get('hits') or 0) > 0
+                batch.append((run_id, cls.get('filename'), valid, covered))
+                lines_valid += valid
+                lines_covered += covered
+
+                if len(batch) >= self.batch_size:
+                    insert(batch)
+                    batch = []
+            if batch:
+                insert(batch)
+        except Exception:
+            self._fail_run(run_id)
+            raise
+
+        self._write(lambda conn: conn.execute('''
+            UPDATE test_runs SET status = 'complete', lines_valid = ?, lines_covered = ?
+            WHERE id = ?
+        ''', (lines_valid, lines_covered, run_id)))
+        return self.get_run(run_id)
+
+    def get_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        columns = ('id', 'app_name', 'build_id', 'report_type', 'report_name', 'status',
+                   'tests', 'failures', 'errors', 'skipped', 'duration',
+                   'lines_valid', 'lines_covered', 'created_at')
+        with self.pool.connection() as conn:
+            row = conn.execute(f'SELECT {", ".join(columns)} FROM test_runs WHERE id = ?',
+                               (run_id,)).fetchone()
+        return dict(zip(columns, row)) if row else None
+
+    # Last N complete runs of one type for an app
+    _RECENT_RUNS_SQL = '''
+        SELECT id FROM test_runs
+        WHERE app_name = ? AND report_type = ? AND status = 'complete'
+        ORDER BY id DESC LIMIT ?
+    '''
+    _FAILED_OUTCOMES_SQL = ', '.join('?' * len(FAILED_OUTCOMES))
+
+    def get_slowest_tests(self, app_name: str, runs: int = 10,
+                          limit: int = 20) -> List[Dict[str, Any]]:
+        """Tests with the highest average duration over the app's last runs"""
+        with self.pool.connection() as conn:
+            rows = conn.execute(f'''
+                SELECT test_key, test_file, AVG(duration), MAX(duration), COUNT(*)
+                FROM test_results
+                WHERE run_id IN ({self._RECENT_RUNS_SQL})
+                GROUP BY test_key
+                ORDER BY AVG(duration) DESC
+                LIMIT ?
+            ''', (app_name, 'junit', runs, limit)).fetchall()
+        return [{
+            'test': test_key,
+            'test_file': test_file,
+            'average_duration': round(average, 4),
+            'max_duration': max_duration,
+            'runs': count
+        } for test_key, test_file, average, max_duration, count in rows]
+
+    def get_duration_trend(self, app_name: str, runs: int = 20,
+                           test: str = None) -> List[Dict[str, Any]]:
+        """Duration per run, oldest first: the whole suite, or one test by its key"""
+        with self.pool.connection() as conn:
+            if test is None:
+                rows = conn.execute(f'''
+                    SELECT id, build_id, created_at, duration, tests, failures + errors
+                    FROM test_runs WHERE id IN ({self._RECENT_RUNS_SQL})
+                    ORDER BY id
+                ''', (app_name, 'junit', runs)).fetchall()
+            else:
+                rows = conn.execute(f'''
+                    SELECT r.id, r.build_id, r.created_at, SUM(t.duration), COUNT(*),
+                           SUM(t.outcome IN ({self._FAILED_OUTCOMES_SQL}))
+                    FROM test_results t JOIN test_runs r ON r.id = t.run_id
+                    WHERE t.test_key = ? AND t.run_id IN ({self._RECENT_RUNS_SQL})
+                    GROUP BY r.id
+                    ORDER BY r.id
+                ''', (*FAILED_OUTCOMES, test, app_name, 'junit', runs)).fetchall()
+        return [{
+            'run_id': run_id,
+            'build_id': build_id,
+            'created_at': created_at,
+            'duration': round(duration, 4),
+            'tests': tests,
+            'failures': failures
+        } for run_id, build_id, created_at, duration, tests, failures in rows]
+
+    def get_flaky_tests(self, app_name: str, runs: int = 20,
+                        limit: int = 20) -> List[Dict[str, Any]]:
+        """Tests that both passed and failed over the app's last runs, most failures first"""
+        with self.pool.connection() as conn:
+            rows = conn.execute(f'''
+                SELECT test_key, test_file,
+                       SUM(outcome = 'passed') AS passes,
+                       SUM(outcome IN ({self._FAILED_OUTCOMES_SQL})) AS failures
+                FROM test_results
+                WHERE run_id IN ({self._RECENT_RUNS_SQL})
+                GROUP BY test_key
+                HAVING passes > 0 AND failures > 0
+                ORDER BY failures DESC, test_key
+                LIMIT ?
+            ''', (*FAILED_OUTCOMES, app_name, 'junit', runs, limit)).fetchall()
+        return [{
+            'test': test_key,
+            'test_file': test_file,
+            'passes': passes,
+            'failures': failures,
+            'failure_rate': round(failures / (passes + failures), 4)
+        } for test_key, test_file, passes, failures in rows]
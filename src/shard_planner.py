@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test sharding for generated CI/CD pipelines
+Splits test files across parallel jobs by historical duration from JUnit reports
+"""
+
+import heapq
+from collections import defaultdict
+from typing import Dict, List, Any, Iterable, Sequence, Union, IO
+
+from report_ingestion import iter_xml_elements, testcase_file
+
+# Assumed duration for test files that have no history yet
+DEFAULT_FILE_SECONDS = 1.0
+
+
+def durations_from_junit(reports: Iterable[Union[str, IO]]) -> Dict[str, float]:
+    """Total test time per file across JUnit XML reports (paths or file objects)"""
+    durations = defaultdict(float)
+    for report in reports:
+        for testcase in iter_xml_elements(report, ('testcase',)):
+            test_file = testcase_file(testcase.attrib)
+            if test_file:
+                durations[test_file] += float(testcase.get('time') or 0)
+    return dict(durations)
+
+
+def plan_shards(test_files: Sequence[str], shard_count: int,
+                durations: Dict[str, float] = None) -> List[Dict[str, Any]]:
+    """Split test files into shard_count shards of roughly equal duration
+
+    Longest-processing-time bin packing: files are placed longest first
+    onto the currently lightest shard. Files without history are assumed
+    to take the average known duration; with no history at all every file
+    weighs the same, which splits them evenly by count. Returns one
+    {'files', 'estimated_seconds'} dict per shard, files sorted.
+    """
+    if shard_count < 1:
+        raise ValueError("shard_count must be at least 1")
+
+    durations = durations or {}
+    known = [durations[f] for f in test_files if f in durations]
+    fallback = sum(known) / len(known) if known else DEFAULT_FILE_SECONDS
+    weights = {f: durations.get(f, fallback) for f in set(test_files)}
+
+    shards = [{'files': [], 'estimated_seconds': 0.0} for _ in range(shard_count)]
+    heap = [(0.0, index) for index in range(shard_count)]
+    # Ties broken by name so the plan, and the rendered config, is stable
+    for test_file in sorted(weights, key=lambda f: (-weights[f], f)):
+        load, index = heapq.heappop(heap)
+        shards[index]['files'].append(test_file)
+        load += weights[test_file]
+        shards[index]['estimated_seconds'] = round(load, 3)
+        heapq.heappush(heap, (load, index))
+
+    for shard in shards:
+        shard['files'].sort()
+    return [shard for shard in shards if shard['files']]
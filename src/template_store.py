@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Template store for the DevOps platform
+Content-addressed, deduplicated storage of generated infrastructure files
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _placeholder(parameter: str) -> str:
+    # Stands in for a parameter's value inside shared blobs; NUL never occurs in HCL
+    return f"\0{parameter}\0"
+
+
+def _parameterize(content: str, parameters: Dict[str, str]):
+    """(blob text, parameterized) with the parameter values factored out when that round-trips"""
+    if '\0' in content:
+        return content, False
+    template = content
+    # Longest values first, so one value inside another is not split
+    for name, value in sorted(parameters.items(), key=lambda item: -len(item[1])):
+        if value:
+            template = template.replace(value, _placeholder(name))
+    if template == content or _substitute(template, parameters) != content:
+        return content, False
+    return template, True
+
+
+def _substitute(template: str, parameters: Dict[str, str]) -> str:
+    for name, value in parameters.items():
+        template = template.replace(_placeholder(name), value)
+    return template
+
+
+class TemplateStore:
+    """Project files stored once per distinct content, keyed by sha256
+
+    A project entry maps each file name to a blob digest. Blobs are
+    reference counted across entries and dropped with the last entry that
+    uses them. The values of the entry's parameters (by default just the
+    project name) are factored out of a file before hashing, so modules
+    that differ only in interpolated values share one blob.
+
+    Blobs are kept zlib-compressed: in memory, or under root as
+    objects/<sha256> with entries/<name hash>.json manifests when root is
+    given, so the store survives restarts. Decompressed blobs are cached in
+    an LRU capped at max_resident_bytes.
+    """
+
+    def __init__(self, root: str = None, max_resident_bytes: int = 16 * 1024 * 1024):
+        self.root = Path(root) if root else None
+        self.max_resident_bytes = max_resident_bytes
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._references = Counter()
+        self._compressed = {}
+        self._resident = OrderedDict()
+        self._resident_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        if self.root:
+            self._load()
+
+    @property
+    def _objects(self) -> Path:
+        return self.root / 'objects'
+
+    @property
+    def _manifests(self) -> Path:
+        return self.root / 'entries'
+
+    def _manifest_path(self, project_name: str) -> Path:
+        # Hashed so any project name is a safe file name
+        return self._manifests / f"{hashlib.sha256(project_name.encode('utf-8')).hexdigest()}.json"
+
+    def _write_atomic(self, target: Path, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, target)
+
+    def _load(self):
+        """Rebuild entries and reference counts from the manifests under root"""
+        self._objects.mkdir(parents=True, exist_ok=True)
+        self._manifests.mkdir(parents=True, exist_ok=True)
+        for manifest in self._manifests.glob('*.json'):
+            try:
+                with open(manifest) as f:
+                    entry = json.load(f)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping unreadable template manifest {manifest}")
+                continue
+            self._entries[entry['project_name']] = entry
+            self._references.update(digest for digest, _ in entry['files'].values())
+
+        # Leftovers from interrupted writes and removals
+        for path in self._objects.iterdir():
+            if path.name not in self._references:
+                path.unlink()
+        logger.info(f"Loaded {len(self._entries)} template entries from {self.root}")
+
+    def put(self, project_name: str, files: Dict[str, str],
+            parameters: Dict[str, str] = None):
+        """Store a project's files, replacing any previous version
+
+        parameters maps names to the per-project values interpolated into
+        the files; it defaults to {'project_name': project_name}.
+        """
+        if parameters is None:
+            parameters = {'project_name': project_name}
+        entry = {
+            'project_name': project_name,
+            'parameters': parameters,
+            'files': {},
+            'size': 0,
+            'created_at': datetime.now().isoformat()
+        }
+        with self._lock:
+            for filename, content in files.items():
+                blob, parameterized = _parameterize(content, parameters)
+                digest = hashlib.sha256(blob.encode('utf-8')).hexdigest()
+                if self._references[digest] == 0:
+                    self._store_blob(digest, blob)
+                self._references[digest] += 1
+                entry['files'][filename] = (digest, parameterized)
+                entry['size'] += len(content.encode('utf-8'))
+
+            if self.root:
+                self._write_atomic(self._manifest_path(project_name),
+                                   json.dumps(entry).encode('utf-8'))
+            previous = self._entries.get(project_name)
+            self._entries[project_name] = entry
+            if previous:
+                self._release(previous)
+
+    def _store_blob(self, digest: str, blob: str):
+        data = zlib.compress(blob.encode('utf-8'))
+        if self.root:
+            target = self._objects / digest
+            if not target.exists():
+                self._write_atomic(target, data)
+        else:
+            self._compressed[digest] = data
+        self._make_resident(digest, blob)
+
+    def _release(self, entry: Dict[str, Any]):
+        for digest, _ in entry['files'].values():
+            self._references[digest] -= 1
+            if self._references[digest] > 0:
+                continue
+            del self._references[digest]
+            self._compressed.pop(digest, None)
+            blob = self._resident.pop(digest, None)
+            if blob is not None:
+                self._resident_bytes -= len(blob)
+            if self.root:
+                (self._objects / digest).unlink(missing_ok=True)
+
+    def _make_resident(self, digest: str, blob: str):
+        self._resident[digest] = blob
+        self._resident_bytes += len(blob)
+        while self._resident_bytes > self.max_resident_bytes and len(self._resident) > 1:
+            _, evicted = self._resident.popitem(last=False)
+            self._resident_bytes -= len(evicted)
+            self._evictions += 1
+
+    def _blob(self, digest: str) -> str:
+        blob = self._resident.get(digest)
+        if blob is not None:
+            self._resident.move_to_end(digest)
+            self._hits += 1
+            return blob
+        self._misses += 1
+        if self.root:
+            data = (self._objects / digest).read_bytes()
+        else:
+            data = self._compressed[digest]
+        blob = zlib.decompress(data).decode('utf-8')
+        self._make_resident(digest, blob)
+        return blob
+
+    def get(self, project_name: str, default=None) -> Optional[Dict[str, Any]]:
+        """A project's files by name plus created_at, or default"""
+        with self._lock:
+            entry = self._entries.get(project_name)
+            if entry is None:
+                return default
+            result = {}
+            for filename, (digest, parameterized) in entry['files'].items():
+                blob = self._blob(digest)
+                result[filename] = _substitute(blob, entry['parameters']) if parameterized else blob
+            result['created_at'] = entry['created_at']
+            return result
+
+    def fingerprint(self, project_name: str) -> Optional[str]:
+        """Hash of a project's stored content, without reading its blobs, or None"""
+        with self._lock:
+            entry = self._entries.get(project_name)
+            if entry is None:
+                return None
+            return hashlib.sha256(json.dumps([entry['files'], entry['parameters']],
+                                             sort_keys=True).encode('utf-8')).hexdigest()
+
+    def remove(self, project_name: str) -> bool:
+        """Drop a project's entry and any blobs no other project uses"""
+        with self._lock:
+            entry = self._entries.pop(project_name, None)
+            if entry is None:
+                return False
+            if self.root:
+                self._manifest_path(project_name).unlink(missing_ok=True)
+            self._release(entry)
+            return True
+
+    def __contains__(self, project_name: str) -> bool:
+        with self._lock:
+            return project_name in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get dedup and residency figures: logical bytes are what a copy per project would take"""
+        with self._lock:
+            logical = sum(entry['size'] for entry in self._entries.values())
+            if self.root:
+                stored = sum((self._objects / digest).stat().st_size for digest in self._references)
+            else:
+                stored = sum(len(data) for data in self._compressed.values())
+            lookups = self._hits + self._misses
+            return {
+                'root': str(self.root) if self.root else None,
+                'projects': len(self._entries),
+                'blobs': len(self._references),
+                'logical_bytes': logical,
+                'stored_bytes': stored,
+                'dedup_ratio': round(logical / stored, 2) if stored else 0,
+                'resident_blobs': len(self._resident),
+                'resident_bytes': self._resident_bytes,
+                'max_resident_bytes': self.max_resident_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'hit_rate': (self._hits / lookups * 100) if lookups > 0 else 0
+            }
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Terraform dependency analysis for the DevOps platform
+Resource graph, critical path and -parallelism recommendation for generated modules
+"""
+
+import heapq
+import re
+from typing import Dict, List, Any, Iterator, Tuple
+
+# Typical create times in seconds per resource type, for apply-time estimates
+DEFAULT_RESOURCE_DURATIONS = {
+    'aws_vpc': 5,
+    'aws_internet_gateway': 3,
+    'aws_subnet': 5,
+    'aws_security_group': 4,
+    'aws_iam_role': 3,
+    'aws_iam_role_policy_attachment': 2,
+    'aws_eks_cluster': 600,
+    'aws_eks_node_group': 240,
+    'aws_db_subnet_group': 3,
+    'aws_db_instance': 420,
+    'data': 1,
+}
+DEFAULT_DURATION = 10
+
+# Terraform's own default for -parallelism
+TERRAFORM_DEFAULT_PARALLELISM = 10
+
+_BLOCK_HEADER = re.compile(r'^(resource|data)\s+"([\w-]+)"\s+"([\w-]+)"\s*\{', re.MULTILINE)
+# type.name, optionally data.type.name, not preceded by an identifier or attribute
+_REFERENCE = re.compile(r'(?<![\w.])(data\.)?([a-z][a-z0-9]*_[a-z0-9_]+)\.([A-Za-z_][\w-]*)')
+_COUNT = re.compile(r'^\s*count\s*=\s*(\d+)\s*$', re.MULTILINE)
+
+
+def _block_end(text: str, start: int) -> int:
+    """Index just past the brace closing the block whose body starts at start
+
+    Skips braces inside strings (including ${...} interpolations) and comments.
+    """
+    depth = 1
+    i = start
+    in_string = False
+    while i < len(text):
+        char = text[i]
+        if in_string:
+            if char == '\\':
+                i += 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '#' or text.startswith('//', i):
+            i = text.find('\n', i)
+            if i < 0:
+                break
+        elif text.startswith('/*', i):
+            i = text.find('*/', i) + 1
+            if i <= 0:
+                break
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    raise ValueError("Unbalanced braces in Terraform configuration")
+
+
+def _strip_comments(body: str) -> str:
+    body = re.sub(r'/\*.*?\*/', '', body, flags=re.DOTALL)
+    return re.sub(r'(#|//)[^\n"]*$', '', body, flags=re.MULTILINE)
+
+
+def _strip_strings(body: str) -> str:
+    """body with the literal text of quoted strings removed
+
+    The contents of ${...} and %{...} templates are kept, since those are
+    expressions that can reference resources; a literal such as
+    "web_app.prod-vpc" is not a reference.
+    """
+    out = []
+    # Open strings ('"'), templates ('${') and plain braces ('{') around i
+    stack = []
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if stack and stack[-1] == '"':
+            if char == '\\':
+                i += 2
+                continue
+            if body.startswith(('$${', '%%{'), i):
+                i += 3
+                continue
+            if body.startswith(('${', '%{'), i):
+                stack.append('${')
+                out.append(' ')
+                i += 2
+                continue
+            if char == '"':
+                stack.pop()
+                out.append(char)
+        elif char == '"':
+            stack.append(char)
+            out.append(char)
+        elif char == '{':
+            stack.append(char)
+            out.append(char)
+        elif char == '}' and stack:
+            out.append(' ' if stack.pop() == '${' else char)
+        else:
+            out.append(char)
+        i += 1
+    return ''.join(out)
+
+
+def iter_blocks(hcl: str) -> Iterator[Tuple[str, str, str, str]]:
+    """Yield (kind, type, name, body) for each top-level resource and data block"""
+    position = 0
+    while True:
+        match = _BLOCK_HEADER.search(hcl, position)
+        if not match:
+            return
+        end = _block_end(hcl, match.end())
+        yield match.group(1), match.group(2), match.group(3), hcl[match.end():end - 1]
+        position = end
+
+
+def parse_resources(hcl: str) -> Dict[str, Dict[str, Any]]:
+    """Resources and data sources by address, with instance count and dependencies
+
+    Dependencies are every resource the block references, including
+    through depends_on; Terraform orders on both the same way. Only
+    expressions count: string literals are skipped, interpolations not.
+    """
+    resources = {}
+    for kind, resource_type, name, body in iter_blocks(hcl):
+        address = f"{resource_type}.{name}" if kind == 'resource' else f"data.{resource_type}.{name}"
+        body = _strip_strings(_strip_comments(body))
+        count = _COUNT.search(body)
+        dependencies = set()
+        for data_prefix, ref_type, ref_name in _REFERENCE.findall(body):
+            dependencies.add(f"{data_prefix}{ref_type}.{ref_name}")
+        dependencies.discard(address)
+        resources[address] = {
+            'address': address,
+            'type': resource_type,
+            'data': kind == 'data',
+            'instances': int(count.group(1)) if count else 1,
+            'depends_on': sorted(dependencies),
+            'declared': True
+        }
+    return resources
+
+
+class TerraformGraph:
+    """Resource dependency graph of a Terraform configuration
+
+    Resources referenced but not declared in the configuration are kept
+    as undeclared leaf nodes: the apply needs them too, but their own
+    dependencies are unknown.
+    """
+
+    def __init__(self, resources: Dict[str, Dict[str, Any]]):
+        self.resources = dict(resources)
+        self.undeclared = sorted({dep for resource in resources.values()
+                                  for dep in resource['depends_on'] if dep not in resources})
+        for address in self.undeclared:
+            is_data = address.startswith('data.')
+            self.resources[address] = {
+                'address': address,
+                'type': address.split('.')[-2],
+                'data': is_data,
+                'instances': 1,
+                'depends_on': [],
+                'declared': False
+            }
+        self.order = self._topological_order()
+
+    @classmethod
+    def from_hcl(cls, hcl: str) -> 'TerraformGraph':
+        return cls(parse_resources(hcl))
+
+    def _topological_order(self) -> List[str]:
+        remaining = {address: len(r['depends_on']) for address, r in self.resources.items()}
+        dependents = {address: [] for address in self.resources}
+        for address, resource in self.resources.items():
+            for dep in resource['depends_on']:
+                dependents[dep].append(address)
+
+        ready = sorted(address for address, count in remaining.items() if count == 0)
+        order = []
+        while ready:
+            address = ready.pop(0)
+            order.append(address)
+            for dependent in sorted(dependents[address]):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(self.resources):
+            cyclic = sorted(set(self.resources) - set(order))
+            raise ValueError(f"Resource dependencies contain a cycle through {cyclic}")
+        return order
+
+    def duration(self, address: str, durations: Dict[str, float]) -> float:
+        resource = self.resources[address]
+        key = 'data' if resource['data'] else resource['type']
+        return float(durations.get(key, durations.get('default', DEFAULT_DURATION)))
+
+    def levels(self) -> Dict[str, int]:
+        """Level of each resource: 1 + the deepest of its dependencies"""
+        level = {}
+        for address in self.order:
+            deps = self.resources[address]['depends_on']
+            level[address] = 1 + max((level[dep] for dep in deps), default=0)
+        return level
+
+    def critical_path(self, durations: Dict[str, float]) -> Tuple[List[str], float]:
+        """Longest chain of dependent resources by duration, and its length
+
+        Instances of a counted resource are created in parallel, so each
+        resource contributes one duration.
+        """
+        finish = {}
+        previous = {}
+        for address in self.order:
+            deps = self.resources[address]['depends_on']
+            slowest = max(deps, key=lambda dep: finish[dep], default=None)
+            previous[address] = slowest
+            finish[address] = self.duration(address, durations) + (finish[slowest] if slowest else 0.0)
+
+        if not finish:
+            return [], 0.0
+        address = max(reversed(self.order), key=finish.get)
+        total = finish[address]
+        path = []
+        while address:
+            path.append(address)
+            address = previous[address]
+        return path[::-1], total
+
+    def simulate_apply(self, parallelism: int, durations: Dict[str, float]) -> float:
+        """Apply time with at most parallelism concurrent operations
+
+        Like Terraform's graph walk: each resource instance is an operation,
+        started as soon as a slot is free and every instance of every
+        dependency has finished.
+        """
+        remaining = {address: len(r['depends_on']) for address, r in self.resources.items()}
+        dependents = {address: [] for address in self.resources}
+        for address, resource in self.resources.items():
+            for dep in resource['depends_on']:
+                dependents[dep].append(address)
+        pending_instances = {address: r['instances'] for address, r in self.resources.items()}
+
+        ready = []
+        for address in self.order:
+            if remaining[address] == 0:
+                ready.extend([address] * self.resources[address]['instances'])
+        running = []
+        now = 0.0
+        sequence = 0
+        while ready or running:
+            while ready and len(running) < parallelism:
+                address = ready.pop(0)
+                heapq.heappush(running, (now + self.duration(address, durations), sequence, address))
+                sequence += 1
+            now, _, address = heapq.heappop(running)
+            pending_instances[address] -= 1
+            if pending_instances[address] == 0:
+                for dependent in dependents[address]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        ready.extend([dependent] * self.resources[dependent]['instances'])
+        return now
+
+
+def analyze(hcl: str, durations: Dict[str, float] = None, max_parallelism: int = 64) -> Dict[str, Any]:
+    """Dependency report for a Terraform configuration
+
+    Reports graph depth and width (resource instances per level), the
+    critical path under the duration table, the apply time Terraform's
+    default -parallelism would give, and the smallest -parallelism that
+    reaches the fastest possible apply.
+    """
+    durations = {**DEFAULT_RESOURCE_DURATIONS, **(durations or {})}
+    graph = TerraformGraph.from_hcl(hcl)
+    levels = graph.levels()
+
+    width_by_level = {}
+    for address, level in levels.items():
+        width_by_level[level] = width_by_level.get(level, 0) + graph.resources[address]['instances']
+    instances = sum(resource['instances'] for resource in graph.resources.values())
+
+    path, critical_time = graph.critical_path(durations)
+    serial_time = sum(graph.duration(address, durations) * resource['instances']
+                      for address, resource in graph.resources.items())
+
+    # Fastest possible apply, then the fewest slots that still reach it
+    unbounded = graph.simulate_apply(max(instances, 1), durations)
+    recommended = 1
+    while recommended < instances and graph.simulate_apply(recommended, durations) > unbounded:
+        recommended += 1
+    recommended = min(recommended, max_parallelism)
+
+    return {
+        'resources': [
+            {**resource, 'level': levels[address],
+             'estimated_seconds': graph.duration(address, durations)}
+            for address, resource in ((a, graph.resources[a]) for a in graph.order)
+        ],
+        'resource_count': len(graph.resources),
+        'instance_count': instances,
+        'undeclared_references': graph.undeclared,
+        'depth': max(levels.values(), default=0),
+        'width': max(width_by_level.values(), default=0),
+        'width_by_level': [width_by_level[level] for level in sorted(width_by_level)],
+        'critical_path': path,
+        'critical_path_seconds': critical_time,
+        'serial_seconds': serial_time,
+        'estimated_apply_seconds': {
+            'default_parallelism': graph.simulate_apply(TERRAFORM_DEFAULT_PARALLELISM, durations),
+            'recommended_parallelism': graph.simulate_apply(recommended, durations),
+            'serial': graph.simulate_apply(1, durations)
+        },
+        'recommended_parallelism': recommended
+    }
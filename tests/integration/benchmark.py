@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the DevOps platform data layer
+Ibm Devops Capstone
+
+Usage:
+    python tests/integration/benchmark.py metrics [--sizes 10000 100000]
+    python tests/integration/benchmark.py backends [--stories 100000]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from devops_platform import AgileProjectManager
+
+# Keep per-operation platform logging out of the timings
+logging.getLogger().setLevel(logging.WARNING)
+
+SPRINT_COUNT = 100
+STATUSES = ['backlog', 'in_progress', 'review', 'done']
+
+
+def _remove_database(db_path):
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+
+def _time_calls(func, args_list, repeat=3):
+    """Median wall time of calling func over args_list, in milliseconds per call"""
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for args in args_list:
+            func(*args)
+        timings.append((time.perf_counter() - start_time) / len(args_list) * 1000)
+    return statistics.median(timings)
+
+
+# The per-call aggregation get_sprint_metrics ran before sprint_rollups
+AGGREGATE_SQL = '''
+    SELECT status, COUNT(*), SUM(story_points)
+    FROM user_stories WHERE sprint_id = ?
+    GROUP BY status
+'''
+
+
+def benchmark_metrics(sizes):
+    """Sprint metrics latency against user_stories size
+
+    Compares the GROUP BY aggregation without and with the covering index
+    against the sprint_rollups lookup get_sprint_metrics now performs.
+    """
+    print(f"\n{'stories':>10} {'scan (ms)':>12} {'index (ms)':>12} {'rollup (ms)':>12}")
+
+    for size in sizes:
+        db_path = tempfile.mktemp(suffix='.db')
+        try:
+            manager = AgileProjectManager(db_path)
+            sprint_ids = [manager.create_sprint(f"Sprint {i}") for i in range(SPRINT_COUNT)]
+
+            with manager.pool.transaction() as conn:
+                conn.executemany('''
+                    INSERT INTO user_stories (sprint_id, title, story_points, status)
+                    VALUES (?, ?, ?, ?)
+                ''', ((sprint_ids[i % SPRINT_COUNT], f"Story {i}", i % 8 + 1, STATUSES[i % 4])
+                      for i in range(size)))
+
+            calls = [(sprint_id,) for sprint_id in sprint_ids]
+
+            def aggregate(sprint_id):
+                with manager.pool.connection() as conn:
+                    conn.execute(AGGREGATE_SQL, (sprint_id,)).fetchall()
+
+            rollup = _time_calls(manager.get_sprint_metrics, calls)
+            indexed = _time_calls(aggregate, calls)
+
+            # Same aggregation with the migration 2 index removed
+            with manager.pool.transaction() as conn:
+                conn.execute('DROP INDEX idx_user_stories_sprint_status')
+                conn.execute('ANALYZE')
+            scan = _time_calls(aggregate, calls)
+
+            print(f"{size:>10,} {scan:>12.3f} {indexed:>12.3f} {rollup:>12.3f}")
+            manager.pool.close()
+        finally:
+            _remove_database(db_path)
+
+
+def _throughput(func, count):
+    start_time = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start_time)
+
+
+def benchmark_backends(stories, single_writes=2000, reads=2000):
+    """Compare the file-backed and in-memory storage backends, in operations/sec"""
+    print(f"\n{'backend':>8} {'bulk insert':>13} {'single insert':>14} "
+          f"{'metrics read':>13} {'export':>11}")
+
+    for label in ('sqlite', 'memory'):
+        db_path = tempfile.mktemp(suffix='.db')
+        manager = AgileProjectManager(db_path if label == 'sqlite' else 'memory://')
+        try:
+            sprint_ids = [manager.create_sprint(f"Sprint {i}") for i in range(SPRINT_COUNT)]
+            batch = [{'title': f"Story {i}", 'points': i % 8 + 1} for i in range(stories)]
+
+            bulk = _throughput(lambda: manager.add_user_stories(sprint_ids[0], batch), stories)
+            single = _throughput(lambda: [
+                manager.add_user_story(sprint_ids[i % SPRINT_COUNT], f"Story {i}", "", 3)
+                for i in range(single_writes)
+            ], single_writes)
+            metrics = _throughput(lambda: [
+                manager.get_sprint_metrics(sprint_ids[i % SPRINT_COUNT]) for i in range(reads)
+            ], reads)
+            export = _throughput(lambda: sum(1 for _ in manager.iter_user_stories()),
+                                 stories + single_writes)
+
+            print(f"{label:>8} {bulk:>13,.0f} {single:>14,.0f} {metrics:>13,.0f} {export:>11,.0f}")
+        finally:
+            manager.close()
+            _remove_database(db_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DevOps platform data layer benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    metrics_parser = subparsers.add_parser('metrics', help="sprint metrics latency vs table size")
+    metrics_parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 500000])
+
+    backends_parser = subparsers.add_parser('backends', help="file vs in-memory storage backend")
+    backends_parser.add_argument('--stories', type=int, default=100000)
+
+    args = parser.parse_args()
+    if args.benchmark == 'metrics':
+        benchmark_metrics(args.sizes)
+    elif args.benchmark == 'backends':
+        benchmark_backends(args.stories)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the content-addressed build cache
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from build_cache import BuildCache
+from devops_platform import CICDPipelineEngine
+from pipeline_runner import PipelineDAG, PipelineRunner, Stage
+
+
+class TestBuildCache(unittest.TestCase):
+    """Test cases for skipping unchanged pipeline stages"""
+
+    def setUp(self):
+        self.workspace = tempfile.mkdtemp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = BuildCache(self.cache_dir)
+        self._write('src/app.py', 'print("v1")\n')
+        self._write('requirements.txt', 'flask\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.workspace)
+        shutil.rmtree(self.cache_dir)
+
+    def _write(self, relpath, text):
+        path = os.path.join(self.workspace, relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def _dag(self):
+        return PipelineDAG([
+            Stage('test', 'echo tested > test.log', inputs=['src/**/*.py'], outputs=['test.log']),
+            Stage('audit', 'echo audited', inputs=['requirements.txt']),
+            Stage('build', 'mkdir -p dist && cat src/app.py > dist/app.txt', ['test', 'audit'],
+                  inputs=['src/**/*.py'], outputs=['dist/*']),
+            Stage('deploy', 'echo deployed', ['build']),
+        ])
+
+    def _run(self):
+        return PipelineRunner(cwd=self.workspace, cache=self.cache).run(self._dag())
+
+    def test_unchanged_stages_are_skipped(self):
+        """Test a second run restores cacheable stages and their outputs"""
+        first = self._run()
+        shutil.rmtree(os.path.join(self.workspace, 'dist'))
+        second = self._run()
+
+        self.assertEqual(first['cache'], {'enabled': True, 'hits': 0, 'misses': 3,
+                                          'time_saved': 0.0})
+        self.assertEqual(second['cache']['hits'], 3)
+        self.assertTrue(second['stages']['build']['cached'])
+        self.assertFalse(second['stages']['deploy']['cached'])
+        with open(os.path.join(self.workspace, 'dist', 'app.txt')) as f:
+            self.assertEqual(f.read(), 'print("v1")\n')
+
+    def test_changed_input_invalidates_stage_and_dependents(self):
+        """Test editing a source file reruns its stages but not unrelated ones"""
+        self._run()
+        self._write('src/app.py', 'print("v2")\n')
+        report = self._run()
+
+        self.assertFalse(report['stages']['test']['cached'])
+        self.assertTrue(report['stages']['audit']['cached'])
+        self.assertFalse(report['stages']['build']['cached'])
+        with open(os.path.join(self.workspace, 'dist', 'app.txt')) as f:
+            self.assertEqual(f.read(), 'print("v2")\n')
+
+    def test_failed_stages_are_not_cached(self):
+        """Test only successful results are stored"""
+        dag = PipelineDAG([Stage('test', 'exit 1', inputs=['src/**/*.py'])])
+        runner = PipelineRunner(cwd=self.workspace, cache=self.cache)
+        runner.run(dag)
+
+        self.assertEqual(runner.run(dag)['cache']['hits'], 0)
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    def test_store_is_evicted_by_size(self):
+        """Test least recently used entries go once the store exceeds max_bytes"""
+        cache = BuildCache(self.cache_dir, max_bytes=4096)
+        for i in range(10):
+            self._write(f"out/{i}.bin", 'x' * 1000 + str(i))
+            stage = Stage(f"stage-{i}", 'true', inputs=[f"out/{i}.bin"], outputs=[f"out/{i}.bin"])
+            cache.store(cache.stage_key(stage, self.workspace), stage,
+                        {'duration': 1.0}, self.workspace)
+
+        stats = cache.stats()
+        self.assertLessEqual(stats['bytes'], 4096)
+        self.assertGreater(stats['evictions'], 0)
+        self.assertEqual(stats['entries'], stats['objects'])
+
+    def test_engine_reports_cache_per_build(self):
+        """Test local runs record cache hits and time saved in the build history"""
+        engine = CICDPipelineEngine(build_cache=self.cache)
+        stages = [Stage('test', 'sleep 0.2', inputs=['src/**/*.py'])]
+        engine.run_local_pipeline('app', stages)
+        report = engine.run_local_pipeline('app', stages)
+
+        self.assertEqual(engine.builds.get('app-2')['cache']['hits'], 1)
+        self.assertGreater(report['cache']['time_saved'], 0.1)
+        self.assertEqual(engine.run_local_pipeline('app', stages, use_cache=False)['cache'],
+                         {'enabled': False, 'hits': 0, 'misses': 0, 'time_saved': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Unit tests for in-process caching
+"""
+
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from cache import LRUCache
+from devops_platform import CICDPipelineEngine
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test cases for the LRU cache"""
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test eviction order follows access order"""
+        cache = LRUCache(max_size=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_get_or_create_counts_hits(self):
+        """Test the factory only runs on misses"""
+        cache = LRUCache()
+        calls = []
+
+        for _ in range(4):
+            cache.get_or_create('key', lambda: calls.append(1) or 'value')
+
+        self.assertEqual(len(calls), 1)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (3, 1))
+        self.assertEqual(stats['hit_rate'], 75)
+
+    def test_invalid_size(self):
+        """Test caches must hold at least one entry"""
+        with self.assertRaises(ValueError):
+            LRUCache(max_size=0)
+
+
+class TestPipelineRenderCache(unittest.TestCase):
+    """Test cases for memoized pipeline rendering"""
+
+    def test_repeated_configs_are_served_from_cache(self):
+        """Test identical inputs render once and still register the pipeline"""
+        engine = CICDPipelineEngine(render_cache_size=8)
+        first = engine.create_jenkins_pipeline('app', 'https://example.com/app.git')
+        second = engine.create_jenkins_pipeline('app', 'https://example.com/app.git')
+        gitlab = engine.create_gitlab_ci_config('app')
+
+        self.assertIs(first, second)
+        self.assertIn("APP_NAME = 'app'", first)
+        self.assertIn('APP_NAME: app', gitlab)
+        self.assertIn('app', engine.pipelines)
+        self.assertEqual(engine.get_render_cache_stats()['hits'], 1)
+
+    def test_cache_is_keyed_by_inputs(self):
+        """Test different inputs produce different configs"""
+        engine = CICDPipelineEngine(render_cache_size=1)
+        first = engine.create_jenkins_pipeline('app', 'https://example.com/one.git')
+        second = engine.create_jenkins_pipeline('app', 'https://example.com/two.git')
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(engine.get_render_cache_stats()['evictions'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Unit tests for capacity planning
+"""
+
+import io
+import tarfile
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import devops_platform
+from devops_platform import InfrastructureAsCode
+from capacity_planner import eks_allocatable, measured_load, plan_capacity
+
+# Shaped like PerformanceTest.results
+MEASUREMENTS = {
+    'database': {'query_time': 0.002, 'insert_time': 0.004},
+    'memory': {'rss_mb': 180.0},
+    'cpu': {'average_percent': 35.0},
+    'concurrent': {'throughput': 90.0, 'average_execution_time': 0.11},
+    'load_simulation': {'duration': 30.0, 'operations_completed': 2400,
+                        'operations_per_second': 80.0}
+}
+
+
+class TestCapacityPlanner(unittest.TestCase):
+    """Test cases for sizing from measured load"""
+
+    def test_measured_load(self):
+        """Test PerformanceTest results are reduced to per-request figures"""
+        load = measured_load(MEASUREMENTS, measured_cores=4)
+
+        self.assertEqual(load['throughput_rps'], 80.0)
+        self.assertAlmostEqual(load['cpu_cores'], 1.4)
+        self.assertEqual(load['latency_seconds'], 0.11)
+        with self.assertRaises(ValueError):
+            measured_load({'memory': {'rss_mb': 100}})
+
+    def test_eks_allocatable(self):
+        """Test kubelet reservations follow the EKS AMI formula"""
+        cpu, memory = eks_allocatable('m5.xlarge')
+        self.assertAlmostEqual(cpu, 4 - 0.08)
+        self.assertAlmostEqual(memory, 16 - (255 + 11 * 58 + 100) / 1024)
+
+    def test_sizing_scales_with_target(self):
+        """Test a higher target rate gets more nodes and a larger database"""
+        small = plan_capacity(MEASUREMENTS, 50, measured_cores=4)
+        large = plan_capacity(MEASUREMENTS, 500, measured_cores=4)
+
+        self.assertEqual(small['pods']['limited_by'], 'cpu')
+        self.assertEqual(small['pods']['replicas'], 2)
+        self.assertEqual(large['pods']['replicas'], 15)
+        self.assertGreater(large['nodes']['hourly_cost'], small['nodes']['hourly_cost'])
+        self.assertEqual(large['sizing']['db_instance_class'], 'db.m5.xlarge')
+        sizing = large['sizing']
+        self.assertLessEqual(sizing['min_size'], sizing['desired_size'])
+        self.assertLess(sizing['desired_size'], sizing['max_size'])
+        self.assertTrue(any('db.m5.large too small' in line for line in large['rationale']))
+
+    def test_concurrency_bound_pods(self):
+        """Test slow, CPU-light requests are sized by Little's law"""
+        slow = dict(MEASUREMENTS, cpu={'average_percent': 1.0},
+                    concurrent={'throughput': 80.0, 'average_execution_time': 2.0})
+        plan = plan_capacity(slow, 100, pod_concurrency=10)
+
+        self.assertEqual(plan['pods']['limited_by'], 'concurrency')
+        self.assertEqual(plan['pods']['capacity_rps'], 3.0)
+        self.assertEqual(plan['pods']['replicas'], 34)
+
+    def test_infeasible_and_invalid_targets(self):
+        """Test impossible or invalid targets raise ValueError"""
+        with self.assertRaises(ValueError):
+            plan_capacity(MEASUREMENTS, 3000, measured_cores=4)
+        with self.assertRaises(ValueError):
+            plan_capacity(MEASUREMENTS, 0)
+
+    def test_degenerate_inputs_are_rejected(self):
+        """Test zero, negative or missing figures raise ValueError instead of dividing by zero"""
+        for options in ({'pod_cpu': 0}, {'pod_concurrency': 0}, {'memory_headroom': 0},
+                        {'measured_cores': -1}, {'min_nodes': 1.5}, {'target_utilization': '0.6'}):
+            with self.subTest(options=options), self.assertRaises(ValueError):
+                plan_capacity(MEASUREMENTS, 100, **options)
+
+        instant = dict(MEASUREMENTS, concurrent={'throughput': 90.0, 'average_execution_time': 0})
+        no_duration = {'load_simulation': {'operations_completed': 2400,
+                                           'operations_per_second': 80.0}}
+        for measurements in (instant, no_duration, dict(MEASUREMENTS, memory={'rss_mb': 0})):
+            with self.subTest(measurements=measurements), self.assertRaises(ValueError):
+                plan_capacity(measurements, 100)
+
+        client = devops_platform.app.test_client()
+        response = client.post('/api/infrastructure/capacity-plan', json={
+            'target_rps': 100, 'measurements': MEASUREMENTS, 'pod_cpu': 0
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_sizing_is_rendered(self):
+        """Test a plan's sizing reaches the generated main.tf, defaults unchanged"""
+        iac = InfrastructureAsCode()
+        sizing = plan_capacity(MEASUREMENTS, 500, measured_cores=4)['sizing']
+        main_tf = iac.create_terraform_infrastructure('web-app', sizing)[0]
+
+        self.assertIn('desired_size = 5', main_tf)
+        self.assertIn('instance_types = ["c5.xlarge"]', main_tf)
+        self.assertIn('instance_class = "db.m5.xlarge"', main_tf)
+        default_tf = iac.create_terraform_infrastructure('other-app')[0]
+        self.assertIn('instance_types = ["t3.medium"]', default_tf)
+        with self.assertRaises(ValueError):
+            iac.resolve_sizing({'min_size': 3, 'desired_size': 2})
+        with self.assertRaises(ValueError):
+            iac.resolve_sizing({'instance_types': ['t3.medium"] evil = ["x']})
+
+    def test_endpoints(self):
+        """Test planning over the API and generating sized infrastructure"""
+        client = devops_platform.app.test_client()
+        capacity = {'target_rps': 500, 'measurements': MEASUREMENTS, 'measured_cores': 4}
+        with mock.patch.object(devops_platform, 'iac_manager', InfrastructureAsCode()):
+            plan = client.post('/api/infrastructure/capacity-plan', json=capacity)
+            default_etag = client.get('/api/infrastructure/bundle?project=web-app').headers['ETag']
+            created = client.post('/api/infrastructure',
+                                  json={'project_name': 'web-app', 'capacity': capacity})
+            unknown = client.post('/api/infrastructure/capacity-plan',
+                                  json=dict(capacity, replicas=3))
+            stored = devops_platform.iac_manager.templates.get('web-app')['main.tf']
+            bundle = client.get(created.get_json()['bundle_url'])
+
+        self.assertEqual(plan.status_code, 200)
+        self.assertEqual(plan.get_json()['capacity_plan']['sizing']['desired_size'], 5)
+        self.assertEqual(created.status_code, 200)
+        self.assertIn('instance_class = "db.m5.xlarge"', stored)
+        self.assertEqual(unknown.status_code, 400)
+        # The bundle serves the sized module, under a new ETag
+        with tarfile.open(fileobj=io.BytesIO(bundle.data), mode='r:gz') as archive:
+            bundled = archive.extractfile('web-app/main.tf').read().decode('utf-8')
+        self.assertEqual(bundled, stored)
+        self.assertNotEqual(bundle.headers['ETag'], default_etag)
+
+
+if __name__ == '__main__':
+    unittest.main()
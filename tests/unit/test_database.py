@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Unit tests for database connection management
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from database import (ConnectionPool, SQLiteFileBackend, SQLiteMemoryBackend,
+                      WriteBehindQueue, create_backend, iter_keyset)
+from devops_platform import AgileProjectManager
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Test cases for the SQLite connection pool"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_db = tempfile.mktemp(suffix='.db')
+        self.pool = ConnectionPool(self.test_db, max_connections=2)
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.pool.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.test_db + suffix):
+                os.remove(self.test_db + suffix)
+
+    def test_wal_mode(self):
+        """Test connections use WAL journaling"""
+        with self.pool.connection() as conn:
+            mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
+        self.assertEqual(mode.lower(), 'wal')
+
+    def test_connections_are_reused(self):
+        """Test hits and misses are counted"""
+        for _ in range(3):
+            with self.pool.connection():
+                pass
+        stats = self.pool.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['connections'], 1)
+
+    def test_transaction_rollback(self):
+        """Test failed transactions are rolled back"""
+        with self.pool.transaction() as conn:
+            conn.execute('CREATE TABLE test_data (id INTEGER PRIMARY KEY, name TEXT)')
+
+        with self.assertRaises(ValueError):
+            with self.pool.transaction() as conn:
+                conn.execute("INSERT INTO test_data (name) VALUES ('Test')")
+                raise ValueError("abort")
+
+        with self.pool.connection() as conn:
+            count = conn.execute('SELECT COUNT(*) FROM test_data').fetchone()[0]
+        self.assertEqual(count, 0)
+
+    def test_pool_size_is_bounded(self):
+        """Test threads wait when every connection is checked out"""
+        barrier = threading.Barrier(4)
+
+        def worker():
+            barrier.wait()
+            with self.pool.connection() as conn:
+                conn.execute('SELECT 1').fetchone()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(self.pool.stats()['connections'], 2)
+
+    def test_keyset_iteration(self):
+        """Test rows stream across pages and resume after an id"""
+        with self.pool.transaction() as conn:
+            conn.execute('CREATE TABLE test_data (id INTEGER PRIMARY KEY, value INTEGER)')
+            conn.executemany('INSERT INTO test_data (value) VALUES (?)', ((i,) for i in range(25)))
+
+        rows = list(iter_keyset(self.pool, 'test_data', ('id', 'value'), after_id=3,
+                                where='value % 2 = 0', batch_size=2, page_size=5))
+
+        self.assertEqual([row[1] for row in rows], list(range(4, 25, 2)))
+        self.assertEqual(self.pool.stats()['idle'], self.pool.stats()['connections'])
+
+    def test_abandoned_iteration_releases_connection(self):
+        """Test closing a stream early returns its connection"""
+        with self.pool.transaction() as conn:
+            conn.execute('CREATE TABLE test_data (id INTEGER PRIMARY KEY)')
+            conn.executemany('INSERT INTO test_data (id) VALUES (?)', ((i,) for i in range(1, 10)))
+
+        rows = iter_keyset(self.pool, 'test_data', ('id',))
+        next(rows)
+        rows.close()
+
+        self.assertEqual(self.pool.stats()['idle'], 1)
+
+
+class TestStorageBackends(unittest.TestCase):
+    """Test cases for file and in-memory storage backends"""
+
+    def test_backend_selection(self):
+        """Test database URLs map to backends"""
+        self.assertIsInstance(create_backend('platform.db'), SQLiteFileBackend)
+        self.assertEqual(create_backend('sqlite:///tmp/platform.db').path, 'tmp/platform.db')
+        self.assertIsInstance(create_backend(':memory:'), SQLiteMemoryBackend)
+        self.assertEqual(create_backend('memory://preview').database_name, 'preview')
+
+    def test_memory_databases_are_isolated(self):
+        """Test unnamed memory databases do not share data"""
+        first = AgileProjectManager('memory://')
+        second = AgileProjectManager('memory://')
+        first.create_sprint("Only in first")
+
+        self.assertEqual(first.get_portfolio_metrics()['summary']['sprint_count'], 1)
+        self.assertEqual(second.get_portfolio_metrics()['summary']['sprint_count'], 0)
+        first.close()
+        second.close()
+
+    def test_memory_backend_concurrency(self):
+        """Test concurrent writers and a streaming reader on the memory backend"""
+        manager = AgileProjectManager('memory://', pool_size=4)
+        sprint_id = manager.create_sprint("Memory Sprint")
+        manager.add_user_stories(sprint_id, [{'title': "Seed"}] * 50)
+        errors = []
+
+        def writer(thread_id):
+            try:
+                for i in range(25):
+                    manager.add_user_story(sprint_id, f"Story {thread_id}-{i}", "", 1)
+            except Exception as e:
+                errors.append(e)
+
+        stream = manager.iter_user_stories(batch_size=5)
+        next(stream)
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        streamed = 1 + sum(1 for _ in stream)
+
+        self.assertEqual(errors, [])
+        self.assertGreaterEqual(streamed, 50)
+        self.assertEqual(manager.get_sprint_metrics(sprint_id)['total_points'], 150)
+        self.assertEqual(manager.get_database_stats()['backend'], 'memory')
+        manager.close()
+
+    def test_memory_backend_hides_uncommitted_writes(self):
+        """Test readers wait for an open write and never see it if it rolls back"""
+        pool = ConnectionPool('memory://', max_connections=3)
+        with pool.transaction() as conn:
+            conn.execute('CREATE TABLE test_data (id INTEGER PRIMARY KEY)')
+        written, counts = threading.Event(), []
+
+        def failing_write():
+            try:
+                with pool.transaction() as conn:
+                    conn.execute('INSERT INTO test_data DEFAULT VALUES')
+                    written.set()
+                    time.sleep(0.1)
+                    raise RuntimeError("rolled back")
+            except RuntimeError:
+                pass
+
+        writer = threading.Thread(target=failing_write)
+        writer.start()
+        written.wait(5)
+        with pool.connection(reporting=True) as conn:
+            counts.append(conn.execute('SELECT COUNT(*) FROM test_data').fetchone()[0])
+        with pool.connection() as conn:
+            counts.append(conn.execute('SELECT COUNT(*) FROM test_data').fetchone()[0])
+        writer.join()
+        pool.close()
+
+        self.assertEqual(counts, [1, 0])
+
+
+class TestWriteBehindQueue(unittest.TestCase):
+    """Test cases for the batching write-behind queue"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_db = tempfile.mktemp(suffix='.db')
+        self.pool = ConnectionPool(self.test_db)
+        with self.pool.transaction() as conn:
+            conn.execute('CREATE TABLE test_data (id INTEGER PRIMARY KEY, value INTEGER UNIQUE)')
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.pool.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.test_db + suffix):
+                os.remove(self.test_db + suffix)
+
+    def _insert(self, value):
+        def operation(conn):
+            return conn.execute('INSERT INTO test_data (value) VALUES (?)', (value,)).lastrowid
+        return operation
+
+    def test_writes_are_group_committed(self):
+        """Test queued writes resolve to their IDs and share batches"""
+        writer = WriteBehindQueue(self.pool, max_batch_size=50)
+        futures = [writer.submit(self._insert(i)) for i in range(200)]
+        writer.close()
+
+        self.assertEqual(sorted(future.result() for future in futures), list(range(1, 201)))
+        stats = writer.stats()
+        self.assertEqual(stats['committed'], 200)
+        self.assertLessEqual(stats['max_batch_size_seen'], 50)
+        self.assertEqual(stats['queue_depth'], 0)
+
+    def test_batch_fails_when_write_lock_is_held(self):
+        """Test every future of a batch that cannot begin its transaction is failed"""
+        self.pool.close()
+        self.pool = ConnectionPool(self.test_db, busy_timeout_ms=200)
+        blocker = sqlite3.connect(self.test_db)
+        blocker.execute('BEGIN IMMEDIATE')
+        try:
+            writer = WriteBehindQueue(self.pool)
+            futures = [writer.submit(self._insert(i)) for i in range(3)]
+            for future in futures:
+                with self.assertRaisesRegex(sqlite3.OperationalError, 'locked'):
+                    future.result(timeout=5)
+        finally:
+            blocker.rollback()
+            blocker.close()
+
+        after = writer.submit(self._insert(10))
+        self.assertEqual(after.result(timeout=5), 1)
+        writer.close()
+        stats = writer.stats()
+        self.assertEqual((stats['failed'], stats['committed']), (3, 1))
+
+    def test_failed_operation_only_fails_its_future(self):
+        """Test a failing write is rolled back to its savepoint"""
+        writer = WriteBehindQueue(self.pool)
+        first = writer.submit(self._insert(1))
+        duplicate = writer.submit(self._insert(1))
+        last = writer.submit(self._insert(2))
+        writer.flush()
+
+        self.assertEqual(first.result(), 1)
+        self.assertIsNotNone(duplicate.exception())
+        self.assertEqual(last.result(), 2)
+        self.assertEqual(writer.stats()['failed'], 1)
+        writer.close()
+
+    def test_backpressure_when_full(self):
+        """Test submit times out while the queue stays full"""
+        writer = WriteBehindQueue(self.pool, max_queue_size=1, put_timeout=0.05)
+        with self.pool.transaction():
+            # Holding the write lock stalls the writer thread mid-batch
+            writer.submit(self._insert(1))
+            rejected = 0
+            for i in range(5):
+                try:
+                    writer.submit(self._insert(i + 10))
+                except TimeoutError:
+                    rejected += 1
+        writer.close()
+
+        self.assertGreater(rejected, 0)
+        self.assertEqual(writer.stats()['rejected'], rejected)
+
+    def test_close_flushes_pending_writes(self):
+        """Test closing the queue commits everything already submitted"""
+        writer = WriteBehindQueue(self.pool)
+        for i in range(100):
+            writer.submit(self._insert(i))
+        writer.close()
+
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM test_data').fetchone()[0], 100)
+        with self.assertRaises(RuntimeError):
+            writer.submit(self._insert(1000))
+
+    def test_submit_racing_close_is_resolved(self):
+        """Test a submit caught mid-put by close() is still committed"""
+        writer = WriteBehindQueue(self.pool)
+        entered, release = threading.Event(), threading.Event()
+        put_nowait = writer._queue.put_nowait
+
+        def stalled_put_nowait(item):
+            entered.set()
+            release.wait(5)
+            put_nowait(item)
+
+        writer._queue.put_nowait = stalled_put_nowait
+        futures = []
+        submitter = threading.Thread(target=lambda: futures.append(writer.submit(self._insert(1))))
+        submitter.start()
+        entered.wait(5)
+        closer = threading.Thread(target=writer.close)
+        closer.start()
+        closer.join(0.1)
+        release.set()
+        submitter.join()
+        closer.join()
+
+        self.assertEqual(futures[0].result(timeout=5), 1)
+
+
+class TestAgileProjectManagerDatabase(unittest.TestCase):
+    """Test cases for the project manager's database access"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_db = tempfile.mktemp(suffix='.db')
+        self.manager = AgileProjectManager(self.test_db)
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.manager.pool.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.test_db + suffix):
+                os.remove(self.test_db + suffix)
+
+    def test_sprint_metrics(self):
+        """Test stories are aggregated into sprint metrics"""
+        sprint_id = self.manager.create_sprint("Test Sprint")
+        self.manager.add_user_story(sprint_id, "Story A", "Description", 5)
+        self.manager.add_user_story(sprint_id, "Story B", "Description", 3)
+
+        metrics = self.manager.get_sprint_metrics(sprint_id)
+
+        self.assertEqual(metrics['total_points'], 8)
+        self.assertEqual(metrics['story_metrics']['backlog']['count'], 2)
+        self.assertEqual(metrics['sprint_info'][1], "Test Sprint")
+
+    def test_concurrent_writes(self):
+        """Test concurrent writers share the pool without lock errors"""
+        sprint_id = self.manager.create_sprint("Concurrent Sprint")
+        errors = []
+
+        def worker(thread_id):
+            try:
+                for i in range(20):
+                    self.manager.add_user_story(sprint_id, f"Story {thread_id}-{i}", "", 1)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.manager.get_sprint_metrics(sprint_id)['total_points'], 100)
+        self.assertGreater(self.manager.get_database_stats()['hits'], 0)
+
+    def test_write_behind_mode(self):
+        """Test manager writes through the write-behind queue"""
+        manager = AgileProjectManager(self.test_db, write_behind=True)
+        sprint_id = manager.create_sprint("Queued Sprint")
+        futures = [manager.add_user_story(sprint_id, f"Story {i}", "", 2, wait=False)
+                   for i in range(20)]
+        story_ids = manager.add_user_stories(sprint_id, [{'title': "Bulk"}] * 5, chunk_size=2)
+        manager.close()
+
+        self.assertEqual(len({future.result() for future in futures}), 20)
+        self.assertEqual(len(story_ids), 5)
+        self.assertEqual(manager.get_write_stats()['committed'], 24)
+        self.assertEqual(self.manager.get_sprint_metrics(sprint_id)['total_points'], 45)
+
+    def test_bulk_story_ingestion(self):
+        """Test bulk inserts return contiguous IDs in input order"""
+        sprint_id = self.manager.create_sprint("Bulk Sprint")
+        self.manager.add_user_story(sprint_id, "Existing", "Description", 1)
+        stories = [{'title': f"Story {i}", 'points': 2} for i in range(250)]
+
+        story_ids = self.manager.add_user_stories(sprint_id, stories, chunk_size=100)
+
+        self.assertEqual(len(story_ids), 250)
+        self.assertEqual(story_ids, list(range(story_ids[0], story_ids[0] + 250)))
+        with self.manager.pool.connection() as conn:
+            title = conn.execute('SELECT title FROM user_stories WHERE id = ?',
+                                 (story_ids[-1],)).fetchone()[0]
+        self.assertEqual(title, "Story 249")
+        self.assertEqual(self.manager.get_sprint_metrics(sprint_id)['total_points'], 501)
+
+    def test_bulk_story_ingestion_requires_titles(self):
+        """Test invalid batches are rejected before anything is written"""
+        sprint_id = self.manager.create_sprint("Bulk Sprint")
+        with self.assertRaises(ValueError):
+            self.manager.add_user_stories(sprint_id, [{'title': "Valid"}, {'points': 3}])
+        self.assertEqual(self.manager.get_sprint_metrics(sprint_id)['total_points'], 0)
+
+    def test_bulk_story_ingestion_validates_types(self):
+        """Test bad chunk sizes and story points are rejected, not silently dropped"""
+        sprint_id = self.manager.create_sprint("Bulk Sprint")
+        for stories, chunk_size in (([{'title': "A"}], -1), ([{'title': "A"}], "2"),
+                                    ([{'title': "A"}], 0), ([{'title': "A", 'points': "lots"}], None),
+                                    ([{'title': "A", 'points': True}], None)):
+            with self.assertRaises(ValueError):
+                self.manager.add_user_stories(sprint_id, stories, chunk_size=chunk_size)
+        self.assertEqual(self.manager.get_sprint_metrics(sprint_id)['story_metrics'], {})
+
+if __name__ == '__main__':
+    unittest.main()
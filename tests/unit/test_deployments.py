@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the deployment ledger
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import devops_platform
+from devops_platform import AgileProjectManager, DeploymentTracker
+
+
+class TestDeploymentTracker(unittest.TestCase):
+    """Test cases for recording and querying deployments"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_db = tempfile.mktemp(suffix='.db')
+        self.manager = AgileProjectManager(self.test_db)
+        self.tracker = DeploymentTracker(self.manager.pool)
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.manager.pool.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.test_db + suffix):
+                os.remove(self.test_db + suffix)
+
+    def test_live_version_follows_successful_deployments(self):
+        """Test the live version ignores pending and failed deployments"""
+        self.tracker.record_deployment('api', '1.0.0', 'production')
+        self.tracker.record_deployment('api', '2.0.0', 'staging')
+        pending_id = self.tracker.record_deployment('api', '1.1.0', 'production', status='pending')
+
+        self.assertEqual(self.tracker.get_live_version('api', 'production')['version'], '1.0.0')
+
+        self.tracker.update_deployment_status(pending_id, 'deployed')
+        live = self.tracker.get_live_version('api', 'production')
+
+        self.assertEqual(live['version'], '1.1.0')
+        self.assertEqual(live['rollback_version'], '1.0.0')
+        self.assertIsNotNone(live['deployed_at'])
+        self.assertIsNone(self.tracker.get_live_version('api', 'development'))
+
+    def test_bulk_recording(self):
+        """Test bulk recording returns IDs in input order"""
+        deployment_ids = self.tracker.record_deployments([
+            {'application_name': 'web', 'version': f"1.0.{i}", 'environment': 'staging'}
+            for i in range(10)
+        ])
+
+        self.assertEqual(deployment_ids, list(range(deployment_ids[0], deployment_ids[0] + 10)))
+        self.assertEqual(self.tracker.get_live_version('web', 'staging')['version'], '1.0.9')
+
+    def test_invalid_deployments_are_rejected(self):
+        """Test missing fields and unknown statuses raise ValueError"""
+        with self.assertRaises(ValueError):
+            self.tracker.record_deployments([{'application_name': 'web', 'version': '1.0'}])
+        with self.assertRaises(ValueError):
+            self.tracker.record_deployment('web', '1.0', 'staging', status='unknown')
+
+    def test_keyset_paginated_history(self):
+        """Test history pages are newest first and resumable"""
+        for i in range(5):
+            self.tracker.record_deployment('api', f"1.{i}", 'production' if i % 2 else 'staging')
+
+        first = self.tracker.get_deployment_history('api', limit=2)
+        second = self.tracker.get_deployment_history('api', before_id=first['next_before_id'], limit=2)
+        third = self.tracker.get_deployment_history('api', before_id=second['next_before_id'], limit=2)
+        production = self.tracker.get_deployment_history('api', environment='production')
+
+        versions = [d['version'] for page in (first, second, third) for d in page['deployments']]
+        self.assertEqual(versions, ['1.4', '1.3', '1.2', '1.1', '1.0'])
+        self.assertIsNone(third['next_before_id'])
+        self.assertEqual([d['version'] for d in production['deployments']], ['1.3', '1.1'])
+
+    def test_history_page_size_is_bounded(self):
+        """Test empty or unbounded history pages are rejected, over the API with a 400"""
+        self.tracker.record_deployment('api', '1.0', 'staging')
+        for limit in (0, -1, DeploymentTracker.MAX_HISTORY_PAGE + 1):
+            with self.assertRaises(ValueError):
+                self.tracker.get_deployment_history('api', limit=limit)
+
+        client = devops_platform.app.test_client()
+        with mock.patch.object(devops_platform, 'deployment_tracker', self.tracker):
+            statuses = [client.get(f'/api/deployments?app=api&limit={limit}').status_code
+                        for limit in (0, -1, 100000)]
+        self.assertEqual(statuses, [400, 400, 200])
+
+    def test_stream_deployments(self):
+        """Test deployments stream in id order filtered by application"""
+        for i in range(6):
+            self.tracker.record_deployment('api' if i % 2 else 'web', f"1.{i}", 'staging')
+
+        streamed = list(self.tracker.iter_deployments(application_name='api', batch_size=1))
+        resumed = list(self.tracker.iter_deployments(after_id=streamed[0]['id']))
+
+        self.assertEqual([d['version'] for d in streamed], ['1.1', '1.3', '1.5'])
+        self.assertEqual(len(resumed), 4)
+
+if __name__ == '__main__':
+    unittest.main()
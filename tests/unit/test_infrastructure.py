@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Unit tests for Infrastructure as Code generation
+"""
+
+import io
+import tarfile
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import devops_platform
+from devops_platform import InfrastructureAsCode
+
+
+class TestTerraformBundle(unittest.TestCase):
+    """Test cases for streamed Terraform bundle downloads"""
+
+    def setUp(self):
+        self.iac = InfrastructureAsCode()
+        self.client = devops_platform.app.test_client()
+        self.patcher = mock.patch.object(devops_platform, 'iac_manager', self.iac)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_bundle_contains_complete_modules(self):
+        """Test every project's files are streamed untruncated"""
+        response = self.client.get('/api/infrastructure/bundle?project=web&projects=api,web')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        with tarfile.open(fileobj=io.BytesIO(response.data), mode='r:gz') as archive:
+            self.assertEqual(archive.getnames(), [
+                'web/main.tf', 'web/variables.tf', 'web/outputs.tf',
+                'api/main.tf', 'api/variables.tf', 'api/outputs.tf'
+            ])
+            main_tf = archive.extractfile('api/main.tf').read().decode()
+        self.assertEqual(main_tf, self.iac.create_terraform_infrastructure('api')[0])
+
+    def test_bundles_are_byte_identical(self):
+        """Test the same projects always produce the same archive and ETag"""
+        first = self.client.get('/api/infrastructure/bundle?project=web')
+        second = self.client.get('/api/infrastructure/bundle?project=web')
+        other = self.client.get('/api/infrastructure/bundle?project=api')
+
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first.headers['ETag'], second.headers['ETag'])
+        self.assertNotEqual(first.headers['ETag'], other.headers['ETag'])
+
+    def test_conditional_get(self):
+        """Test an unchanged bundle is answered with 304 and no body"""
+        etag = self.client.get('/api/infrastructure/bundle?project=web').headers['ETag']
+
+        unchanged = self.client.get('/api/infrastructure/bundle?project=web',
+                                    headers={'If-None-Match': etag})
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(unchanged.data, b'')
+
+        self.iac._template_fingerprint = 'changed templates'
+        changed = self.client.get('/api/infrastructure/bundle?project=web',
+                                  headers={'If-None-Match': etag})
+        self.assertEqual(changed.status_code, 200)
+
+    def test_invalid_requests(self):
+        """Test missing and unsafe project names are rejected"""
+        self.assertEqual(self.client.get('/api/infrastructure/bundle').status_code, 400)
+        self.assertEqual(self.client.get('/api/infrastructure/bundle?project=../etc').status_code,
+                         400)
+        self.assertEqual(len(self.iac.templates), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
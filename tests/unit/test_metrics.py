@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Unit tests for Prometheus metrics
+"""
+
+import threading
+import unittest
+import sys
+import os
+
+from flask import Flask, jsonify
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import devops_platform
+from database import ConnectionPool
+from metrics import MetricsRegistry, instrument_app, instrument_pool
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for metric accumulation and exposition"""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counts_from_many_threads(self):
+        """Test per-thread counts add up, including threads that have exited"""
+        counter = self.registry.counter('jobs_total', 'Jobs', ('queue',))
+
+        def work():
+            for _ in range(1000):
+                counter.inc(('default',))
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc(('default',), 5)
+
+        self.assertEqual(self.registry.sample('jobs_total', ('default',)), 8005)
+        self.assertEqual(len(self.registry._shards), 1)
+        self.assertIn('jobs_total{queue="default"} 8005', self.registry.render())
+
+    def test_histogram_exposition(self):
+        """Test histogram buckets are cumulative with matching sum and count"""
+        histogram = self.registry.histogram('latency_seconds', 'Latency', ('route',),
+                                            buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, ('/a"b',))
+
+        lines = self.registry.render().splitlines()
+        self.assertEqual(lines[:2], ['# HELP latency_seconds Latency',
+                                     '# TYPE latency_seconds histogram'])
+        self.assertEqual(lines[2:], [
+            'latency_seconds_bucket{route="/a\\"b",le="0.1"} 2',
+            'latency_seconds_bucket{route="/a\\"b",le="1"} 3',
+            'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 4',
+            'latency_seconds_sum{route="/a\\"b"} 3.65',
+            'latency_seconds_count{route="/a\\"b"} 4',
+        ])
+        with self.assertRaises(ValueError):
+            self.registry.counter('latency_seconds', 'Duplicate')
+
+    def test_flask_instrumentation(self):
+        """Test requests are counted per route rule, status and in-flight"""
+        app = Flask(__name__)
+        in_flight = []
+
+        @app.route('/items/<int:item_id>')
+        def item(item_id):
+            in_flight.append(self.registry.sample('http_requests_in_flight',
+                                                  ('GET', '/items/<int:item_id>')))
+            return jsonify({'id': item_id})
+
+        @app.route('/boom')
+        def boom():
+            raise RuntimeError('boom')
+
+        instrument_app(app, self.registry)
+        client = app.test_client()
+        client.get('/items/1')
+        client.get('/items/2')
+        client.get('/missing')
+        client.get('/boom')
+
+        sample = self.registry.sample
+        self.assertEqual(in_flight, [1, 1])
+        self.assertEqual(sample('http_requests_total', ('GET', '/items/<int:item_id>', '200')), 2)
+        self.assertEqual(sample('http_requests_total', ('GET', '<unmatched>', '404')), 1)
+        self.assertEqual(sample('http_requests_total', ('GET', '/boom', '500')), 1)
+        self.assertEqual(sample('http_requests_in_flight', ('GET', '/items/<int:item_id>')), 0)
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="/items/<int:item_id>"} 2',
+                      self.registry.render())
+
+    def test_pool_instrumentation(self):
+        """Test SQLite read and write blocks are timed and pool counters exported"""
+        pool = ConnectionPool('memory://')
+        instrument_pool(pool, self.registry)
+        with pool.transaction() as conn:
+            conn.execute('CREATE TABLE t (x)')
+        with pool.connection() as conn:
+            conn.execute('SELECT * FROM t').fetchall()
+        with self.assertRaises(Exception):
+            with pool.connection() as conn:
+                conn.execute('SELECT * FROM missing')
+        pool.close()
+
+        text = self.registry.render()
+        self.assertIn('sqlite_operation_duration_seconds_count{pool="main",kind="write"} 1', text)
+        self.assertIn('sqlite_operation_duration_seconds_count{pool="main",kind="read"} 2', text)
+        self.assertIn('sqlite_operation_errors_total{pool="main",kind="read"} 1', text)
+        self.assertIn('sqlite_pool_connections{pool="main"}', text)
+
+    def test_metrics_endpoint(self):
+        """Test the platform serves its own metrics in the text format"""
+        client = devops_platform.app.test_client()
+        client.get('/api/pipeline/cache')
+        response = client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        text = response.get_data(as_text=True)
+        self.assertIn('http_requests_total{method="GET",route="/api/pipeline/cache",status="200"}',
+                      text)
+        self.assertIn('# TYPE http_request_duration_seconds histogram', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Unit tests for schema migrations
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from database import ConnectionPool
+from migrations import migrate, current_version, latest_version
+
+
+class TestMigrations(unittest.TestCase):
+    """Test cases for the migration runner"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_db = tempfile.mktemp(suffix='.db')
+        self.pool = ConnectionPool(self.test_db)
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.pool.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.test_db + suffix):
+                os.remove(self.test_db + suffix)
+
+    def test_migrations_are_idempotent(self):
+        """Test a second run applies nothing"""
+        applied = migrate(self.pool)
+        self.assertEqual(applied, list(range(1, latest_version() + 1)))
+        self.assertEqual(migrate(self.pool), [])
+
+        with self.pool.connection() as conn:
+            self.assertEqual(current_version(conn), latest_version())
+
+    def test_incremental_upgrade(self):
+        """Test a database at an older version is upgraded in order"""
+        self.assertEqual(migrate(self.pool, target_version=1), [1])
+        self.assertEqual(migrate(self.pool)[0], 2)
+
+    def test_upgrades_unversioned_database(self):
+        """Test databases created before migrations existed are adopted"""
+        with self.pool.transaction() as conn:
+            conn.execute('''
+                CREATE TABLE user_stories (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sprint_id INTEGER,
+                    title TEXT NOT NULL,
+                    description TEXT,
+                    story_points INTEGER DEFAULT 1,
+                    priority TEXT DEFAULT 'medium',
+                    status TEXT DEFAULT 'backlog',
+                    assigned_to TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.execute("INSERT INTO user_stories (sprint_id, title) VALUES (1, 'Legacy')")
+
+        migrate(self.pool)
+
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM user_stories').fetchone()[0], 1)
+            self.assertEqual(current_version(conn), latest_version())
+
+    def test_sprint_metrics_query_uses_covering_index(self):
+        """Test the metrics query no longer scans user_stories"""
+        migrate(self.pool)
+        with self.pool.connection() as conn:
+            plan = ' '.join(row[3] for row in conn.execute('''
+                EXPLAIN QUERY PLAN
+                SELECT status, COUNT(*), SUM(story_points)
+                FROM user_stories WHERE sprint_id = ?
+                GROUP BY status
+            ''', (1,)))
+        self.assertIn('COVERING INDEX idx_user_stories_sprint_status', plan)
+
+    def test_unrecorded_velocities_become_null(self):
+        """Test default velocities are cleared and ones recorded at close are kept"""
+        migrate(self.pool, target_version=9)
+        with self.pool.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO sprints (sprint_name, start_date, end_date, status, velocity, "
+                "closed_at) VALUES (?, '2026-01-01', '2026-01-14', ?, ?, ?)",
+                [('Open', 'active', 0, None), ('Closed directly', 'closed', 0, None),
+                 ('Closed', 'closed', 0, '2026-01-14 17:00:00'),
+                 ('Closed with velocity', 'closed', 13, '2026-01-14 17:00:00')])
+
+        self.assertEqual(migrate(self.pool), [10])
+
+        with self.pool.connection() as conn:
+            velocities = [row[0] for row in conn.execute('SELECT velocity FROM sprints ORDER BY id')]
+        self.assertEqual(velocities, [None, None, 0, 13])
+
+if __name__ == '__main__':
+    unittest.main()
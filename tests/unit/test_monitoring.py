@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Unit tests for monitoring configuration generation
+"""
+
+import unittest
+import sys
+import os
+
+import yaml
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import devops_platform
+from devops_platform import MonitoringAndObservability
+from prometheus_rules import check_expr, validate_rules
+
+
+class TestRecordingRules(unittest.TestCase):
+    """Test cases for recording rules and their use by dashboards and alerts"""
+
+    def setUp(self):
+        self.monitoring = MonitoringAndObservability()
+
+    def test_generated_rules_are_valid(self):
+        """Test both generated rule files pass validation"""
+        _, alert_rules = self.monitoring.create_prometheus_config('web-app')
+        recording_rules = self.monitoring.create_recording_rules('web-app')
+
+        self.assertEqual(validate_rules(alert_rules), [])
+        self.assertEqual(validate_rules(recording_rules), [])
+
+    def test_consumers_use_recorded_series(self):
+        """Test dashboard and alert expressions only read series the rules record"""
+        config, alert_rules = self.monitoring.create_prometheus_config('web-app')
+        rules = yaml.safe_load(self.monitoring.create_recording_rules('web-app'))['groups'][0]['rules']
+        recorded = {rule['record'] for rule in rules}
+        quantiles = {rule['labels']['quantile'] for rule in rules if 'labels' in rule}
+
+        self.assertIn('recording_rules.yml', yaml.safe_load(config)['rule_files'])
+        self.assertEqual(quantiles, {'0.5', '0.95', '0.99'})
+        panels = self.monitoring.create_grafana_dashboard('web-app')['dashboard']['panels']
+        expressions = [target['expr'] for panel in panels for target in panel['targets']]
+        alerts = yaml.safe_load(alert_rules)['groups'][0]['rules']
+        expressions.extend(alert['expr'] for alert in alerts)
+
+        for expr in expressions:
+            self.assertNotIn('rate(', expr)
+            self.assertNotIn('histogram_quantile(', expr)
+            series = expr.split('{')[0]
+            if ':' in series:
+                self.assertIn(series, recorded)
+
+    def test_expression_errors(self):
+        """Test PromQL syntax problems are reported"""
+        self.assertEqual(check_expr('sum by (job) (rate(x_total{job="a",code=~"5.."}[5m]))'), [])
+        self.assertTrue(check_expr('sum(rate(x[5m])'))
+        self.assertTrue(check_expr('rate(x[5 m])'))
+        self.assertTrue(check_expr('rate(x{job=a}[5m])'))
+        self.assertTrue(check_expr('rates(x[5m])'))
+
+    def test_rule_file_errors(self):
+        """Test structural and ordering problems are reported"""
+        rules = '''
+groups:
+  - name: app
+    rules:
+      - record: job:x:ratio
+        expr: job:x:rate5m / 2
+      - record: job:x:rate5m
+        expr: rate(x[5m])
+      - alert: Bad Name
+        expr: up == 0
+        for: soon
+  - name: app
+    rules: []
+'''
+        problems = validate_rules(rules)
+        self.assertEqual(len(problems), 5)
+        self.assertIn('before the rule recording it', problems[0])
+        self.assertTrue(validate_rules('groups: [')[0].startswith('invalid YAML'))
+        self.assertTrue(validate_rules('rules: []'))
+
+    def test_unsafe_app_name_is_rejected(self):
+        """Test an app name that breaks the generated PromQL raises ValueError"""
+        with self.assertRaises(ValueError):
+            self.monitoring.create_recording_rules('web"app')
+
+    def test_endpoints(self):
+        """Test the monitoring endpoint returns recording rules and rules can be validated"""
+        client = devops_platform.app.test_client()
+        created = client.post('/api/monitoring', json={'app_name': 'web-app'})
+        rejected = client.post('/api/monitoring', json={'app_name': 'web"app'})
+        valid = client.post('/api/monitoring/rules/validate',
+                            data=self.monitoring.create_recording_rules('web-app'))
+        invalid = client.post('/api/monitoring/rules/validate', data='groups: [{name: x}]')
+
+        self.assertEqual(created.status_code, 200)
+        self.assertIn('job:http_requests:rate5m', created.get_json()['recording_rules'])
+        self.assertEqual(rejected.status_code, 400)
+        self.assertEqual(valid.get_json(), {'valid': True, 'errors': []})
+        self.assertEqual(invalid.status_code, 400)
+        self.assertFalse(invalid.get_json()['valid'])
+
+
+class TestShardedMonitoring(unittest.TestCase):
+    """Test cases for hashmod-sharded scraping and federation"""
+
+    def setUp(self):
+        self.monitoring = MonitoringAndObservability()
+
+    def test_shards_keep_disjoint_slices(self):
+        """Test each shard config keeps its own hashmod bucket of pod and node targets"""
+        configs = self.monitoring.create_sharded_prometheus_configs('web-app', 3)
+
+        self.assertEqual(len(configs['shard_configs']), 3)
+        for shard, text in enumerate(configs['shard_configs']):
+            config = yaml.safe_load(text)
+            self.assertEqual(config['global']['external_labels'], {'shard': str(shard)})
+            self.assertIn('shard_recording_rules.yml', config['rule_files'])
+            for job in config['scrape_configs'][1:]:
+                hashing, keep = job['relabel_configs'][-2:]
+                self.assertEqual((hashing['action'], hashing['modulus']), ('hashmod', 3))
+                self.assertEqual(hashing['source_labels'], ['__address__'])
+                self.assertEqual((keep['action'], keep['regex']), ('keep', f'^{shard}$'))
+        self.assertNotIn('external_labels', yaml.safe_load(
+            self.monitoring.create_prometheus_config('web-app')[0])['global'])
+
+    def test_federation_rebuilds_recorded_series(self):
+        """Test the federating server records the same series as a single server"""
+        configs = self.monitoring.create_sharded_prometheus_configs(
+            'web-app', 2, 'prom-{shard}.monitoring.svc:9090')
+        federate = yaml.safe_load(configs['federation_config'])['scrape_configs'][1]
+        shard_rules = yaml.safe_load(configs['shard_recording_rules'])['groups'][0]['rules']
+        global_rules = yaml.safe_load(configs['federation_recording_rules'])['groups'][0]['rules']
+        single_rules = yaml.safe_load(
+            self.monitoring.create_recording_rules('web-app'))['groups'][0]['rules']
+
+        self.assertTrue(federate['honor_labels'])
+        self.assertEqual(federate['metrics_path'], '/federate')
+        self.assertEqual(federate['static_configs'][0]['targets'],
+                         ['prom-0.monitoring.svc:9090', 'prom-1.monitoring.svc:9090'])
+        self.assertTrue(all(rule['record'].startswith('shard_job') for rule in shard_rules))
+        self.assertNotIn('histogram_quantile', configs['shard_recording_rules'])
+        self.assertEqual([rule['record'] for rule in global_rules],
+                         [rule['record'] for rule in single_rules])
+        for rule in shard_rules:
+            self.assertIn(rule['record'], configs['federation_recording_rules'])
+        self.assertEqual(validate_rules(configs['federation_recording_rules']), [])
+
+    def test_alerts_follow_their_series(self):
+        """Test shards alert on raw series and the federating server on job: series"""
+        configs = self.monitoring.create_sharded_prometheus_configs('web-app', 2)
+        shard_alerts = yaml.safe_load(configs['shard_alert_rules'])['groups'][0]['rules']
+        federation_alerts = yaml.safe_load(configs['federation_alert_rules'])['groups'][0]['rules']
+        single_alerts = yaml.safe_load(
+            self.monitoring.create_prometheus_config('web-app')[1])['groups'][0]['rules']
+
+        self.assertEqual([rule['alert'] for rule in shard_alerts],
+                         ['HighCPUUsage', 'HighMemoryUsage', 'ApplicationDown'])
+        self.assertEqual([rule['alert'] for rule in federation_alerts],
+                         ['HighErrorRate', 'HighLatency'])
+        self.assertEqual(shard_alerts + federation_alerts, single_alerts)
+        self.assertFalse(any('job:' in rule['expr'] for rule in shard_alerts))
+        self.assertEqual(yaml.safe_load(configs['shard_configs'][0])['rule_files'],
+                         ['shard_alert_rules.yml', 'shard_recording_rules.yml'])
+        self.assertEqual(yaml.safe_load(configs['federation_config'])['rule_files'],
+                         ['alert_rules.yml', 'recording_rules.yml'])
+        self.assertEqual(validate_rules(configs['shard_alert_rules']), [])
+        self.assertEqual(validate_rules(configs['federation_alert_rules']), [])
+
+    def test_invalid_sharding(self):
+        """Test bad shard counts, indexes and addresses raise ValueError"""
+        for shards, address in ((0, None), (2.5, None), (2, 'prometheus:9090'),
+                                (2, "p-{shard}:9090'] evil")):
+            with self.assertRaises(ValueError):
+                self.monitoring.create_sharded_prometheus_configs('web-app', shards, address)
+        with self.assertRaises(ValueError):
+            self.monitoring.create_prometheus_config('web-app', shard=3, shards=3)
+
+    def test_endpoint(self):
+        """Test sharded configs are generated for a given or recommended shard count"""
+        client = devops_platform.app.test_client()
+        given = client.post('/api/monitoring/sharding', json={'app_name': 'web-app', 'shards': 2})
+        planned = client.post('/api/monitoring/sharding',
+                              json={'app_name': 'web-app', 'targets': {'web-app': 5000},
+                                    'max_series_per_shard': 1000000})
+        missing = client.post('/api/monitoring/sharding', json={'app_name': 'web-app'})
+        invalid = client.post('/api/monitoring/sharding',
+                              json={'app_name': 'web-app', 'targets': {'web-app': 'many'}})
+
+        self.assertEqual(given.status_code, 200)
+        self.assertEqual(len(given.get_json()['shard_configs']), 2)
+        self.assertIsNone(given.get_json()['series_estimate'])
+        self.assertEqual(planned.status_code, 200)
+        estimate = planned.get_json()['series_estimate']
+        self.assertEqual(len(planned.get_json()['shard_configs']), estimate['shards'])
+        self.assertEqual(estimate['shards'], estimate['recommended_shards'])
+        self.assertLessEqual(estimate['max_shard_series'], 1000000)
+        self.assertEqual(missing.status_code, 400)
+        self.assertEqual(invalid.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Unit tests for CI/CD pipeline generation
+"""
+
+import io
+import json
+import tarfile
+import unittest
+import sys
+import os
+from unittest import mock
+
+import yaml
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import devops_platform
+from devops_platform import CICDPipelineEngine
+
+
+class TestBatchPipelineRendering(unittest.TestCase):
+    """Test cases for bulk pipeline generation"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.engine = CICDPipelineEngine()
+        self.specs = [{'app_name': f"app-{i}", 'type': 'gitlab' if i % 2 else 'jenkins'}
+                      for i in range(25)]
+
+    def test_every_spec_is_rendered_once(self):
+        """Test each spec yields one result with its file name and config"""
+        results = list(self.engine.render_pipelines(self.specs, max_workers=3))
+
+        self.assertEqual(sorted(r['index'] for r in results), list(range(25)))
+        by_index = {r['index']: r for r in results}
+        self.assertEqual(by_index[0]['filename'], 'app-0/Jenkinsfile')
+        self.assertEqual(by_index[1]['filename'], 'app-1/.gitlab-ci.yml')
+        self.assertEqual(by_index[1]['config'], self.engine.create_gitlab_ci_config('app-1'))
+
+    def test_invalid_spec_does_not_abort_batch(self):
+        """Test a failing spec yields an error result and the rest still render"""
+        results = list(self.engine.render_pipelines([{'type': 'jenkins'}] + self.specs[:2]))
+
+        errors = [r for r in results if 'error' in r]
+        self.assertEqual(len(results), 3)
+        self.assertEqual([r['index'] for r in errors], [0])
+
+    def test_non_object_spec_does_not_abort_stream(self):
+        """Test a spec that is not an object yields an error record mid-stream"""
+        client = devops_platform.app.test_client()
+        with mock.patch.object(devops_platform, 'cicd_engine', self.engine):
+            response = client.post('/api/pipelines/batch',
+                                   json={'pipelines': [self.specs[0], 'oops', self.specs[1]]})
+            records = [json.loads(line) for line in response.data.decode().splitlines()]
+            bad_workers = client.post('/api/pipelines/batch',
+                                      json={'pipelines': self.specs[:1], 'workers': 'many'})
+
+        self.assertEqual(len(records), 3)
+        errors = [r for r in records if 'error' in r]
+        self.assertEqual([(r['index'], r['app_name']) for r in errors], [(1, None)])
+        self.assertEqual(bad_workers.status_code, 400)
+
+    def test_endpoint_streams_ndjson_and_tar(self):
+        """Test /api/pipelines/batch streams NDJSON records or a tar of configs"""
+        client = devops_platform.app.test_client()
+        with mock.patch.object(devops_platform, 'cicd_engine', self.engine):
+            response = client.post('/api/pipelines/batch', json={'pipelines': self.specs})
+            records = [json.loads(line) for line in response.data.decode().splitlines()]
+            self.assertEqual(len(records), 25)
+
+            response = client.post('/api/pipelines/batch',
+                                   json={'pipelines': self.specs, 'format': 'tar'})
+            self.assertEqual(response.mimetype, 'application/x-tar')
+            with tarfile.open(fileobj=io.BytesIO(response.data)) as archive:
+                self.assertEqual(len(archive.getnames()), 25)
+                jenkinsfile = archive.extractfile('app-0/Jenkinsfile').read().decode()
+            self.assertIn("APP_NAME = 'app-0'", jenkinsfile)
+
+            response = client.post('/api/pipelines/batch', json={'pipelines': 'app-0'})
+            self.assertEqual(response.status_code, 400)
+
+
+class TestDependencyCaching(unittest.TestCase):
+    """Test cases for pip and Docker layer caching in generated configs"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.engine = CICDPipelineEngine()
+
+    def test_gitlab_pip_and_buildkit_cache(self):
+        """Test Python jobs cache pip by requirements hash and the build uses a registry cache"""
+        config = yaml.safe_load(self.engine.create_gitlab_ci_config('app', dependency_cache=True))
+
+        pip_cache = {'key': {'files': ['requirements.txt']}, 'paths': ['.cache/pip']}
+        self.assertEqual(config['test']['cache'], pip_cache)
+        self.assertEqual(config['integration-test']['cache'], pip_cache)
+        self.assertEqual(config['variables']['PIP_CACHE_DIR'], '$CI_PROJECT_DIR/.cache/pip')
+        build = config['build']['script'][-1]
+        self.assertIn('--cache-from type=registry,ref=$DOCKER_IMAGE:buildcache', build)
+        self.assertIn('--cache-to type=registry,ref=$DOCKER_IMAGE:buildcache,mode=max', build)
+
+    def test_jenkins_pip_and_buildkit_cache(self):
+        """Test Jenkins installs through a requirements-keyed cache and builds with buildx"""
+        jenkinsfile = self.engine.create_jenkins_pipeline('app', 'repo', dependency_cache=True)
+
+        self.assertIn("cacheValidityDecidingFile: 'requirements.txt'", jenkinsfile)
+        self.assertIn('--cache-from type=registry,ref=${DOCKER_REGISTRY}/${APP_NAME}:buildcache',
+                      jenkinsfile)
+        self.assertNotIn('docker.build(', jenkinsfile)
+
+    def test_output_is_deterministic(self):
+        """Test identical options render identical configs across engines"""
+        other = CICDPipelineEngine()
+        for options in ({}, {'dependency_cache': True},
+                        {'dependency_cache': True, 'test_shards': 3}):
+            self.assertEqual(self.engine.create_gitlab_ci_config('app', **options),
+                             other.create_gitlab_ci_config('app', **options))
+            self.assertEqual(self.engine.create_jenkins_pipeline('app', 'repo', **options),
+                             other.create_jenkins_pipeline('app', 'repo', **options))
+        self.assertNotIn('cache', self.engine.create_gitlab_ci_config('app'))
+
+
+if __name__ == '__main__':
+    unittest.main()
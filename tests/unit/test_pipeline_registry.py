@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the persistent pipeline registry
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import devops_platform
+from database import ConnectionPool
+from migrations import migrate
+from devops_platform import CICDPipelineEngine
+from pipeline_registry import PipelineRegistry
+
+
+class TestPipelineRegistry(unittest.TestCase):
+    """Test cases for the SQLite-backed pipeline registry"""
+
+    def setUp(self):
+        self.db_path = tempfile.mktemp(suffix='.db')
+        self.pool = ConnectionPool(self.db_path)
+        migrate(self.pool)
+
+    def tearDown(self):
+        self.pool.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
+
+    def test_configs_survive_a_new_registry(self):
+        """Test registered configs are persisted compressed and reloaded lazily"""
+        engine = CICDPipelineEngine(pool=self.pool)
+        jenkinsfile = engine.create_jenkins_pipeline('app', 'https://example.com/app.git')
+        engine.create_gitlab_ci_config('app')
+
+        registry = PipelineRegistry(self.pool, hot_size=4)
+        self.assertEqual(len(registry.hot), 0)
+        record = registry.get('app')
+        self.assertEqual(record['config'], jenkinsfile)
+        self.assertEqual(record['git_repo'], 'https://example.com/app.git')
+        self.assertEqual(len(registry), 2)
+        self.assertIn('app', registry)
+        self.assertNotIn('other', registry)
+        self.assertIsNone(registry.get('app', 'azure'))
+
+        stats = registry.stats()
+        self.assertLess(stats['stored_bytes'], stats['config_bytes'])
+
+    def test_hot_set_is_bounded(self):
+        """Test only hot_size decompressed configs stay in memory"""
+        registry = PipelineRegistry(self.pool, hot_size=3)
+        for i in range(20):
+            registry.register(f"app-{i}", 'jenkins', f"config {i}")
+
+        self.assertEqual(len(registry), 20)
+        self.assertEqual(len(registry.hot), 3)
+        self.assertEqual(registry.get('app-0')['config'], 'config 0')
+
+    def test_reregistering_updates_config(self):
+        """Test a changed config replaces the stored one in place"""
+        registry = PipelineRegistry(self.pool)
+        first = registry.register('app', 'jenkins', 'config v1')
+        second = registry.register('app', 'jenkins', 'config v2')
+
+        self.assertEqual(first['id'], second['id'])
+        self.assertEqual(PipelineRegistry(self.pool).get('app')['config'], 'config v2')
+
+    def test_list_pages_by_id(self):
+        """Test listing pages through pipelines without their configs"""
+        registry = PipelineRegistry(self.pool)
+        for i in range(5):
+            registry.register(f"app-{i}", 'jenkins' if i % 2 else 'gitlab', f"config {i}")
+
+        first = registry.list(limit=2)
+        second = registry.list(after_id=first['next_after_id'], limit=2)
+        jenkins = registry.list(pipeline_type='jenkins')
+
+        self.assertEqual([p['app_name'] for p in first['pipelines']], ['app-0', 'app-1'])
+        self.assertEqual([p['app_name'] for p in second['pipelines']], ['app-2', 'app-3'])
+        self.assertNotIn('config', first['pipelines'][0])
+        self.assertEqual([p['app_name'] for p in jenkins['pipelines']], ['app-1', 'app-3'])
+        self.assertIsNone(jenkins['next_after_id'])
+
+    def test_endpoints(self):
+        """Test the list and get pipeline endpoints"""
+        engine = CICDPipelineEngine(pool=self.pool)
+        engine.create_jenkins_pipeline('app', 'https://example.com/app.git')
+        client = devops_platform.app.test_client()
+
+        with mock.patch.object(devops_platform, 'cicd_engine', engine):
+            listing = client.get('/api/pipelines').get_json()
+            found = client.get('/api/pipelines/app')
+            missing = client.get('/api/pipelines/app?type=gitlab')
+
+        self.assertEqual([p['app_name'] for p in listing['pipelines']], ['app'])
+        self.assertIn("APP_NAME = 'app'", found.get_json()['pipeline']['config'])
+        self.assertEqual(missing.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the local DAG pipeline runner
+"""
+
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import devops_platform
+from devops_platform import CICDPipelineEngine
+from pipeline_runner import (MAX_STAND_IN_SECONDS, PipelineDAG, PipelineRunner, Stage,
+                             default_stages, _sleep_command)
+
+
+class TestPipelineDAG(unittest.TestCase):
+    """Test cases for stage graph validation and analysis"""
+
+    def test_invalid_graphs_are_rejected(self):
+        """Test unknown dependencies, duplicates and cycles raise ValueError"""
+        with self.assertRaises(ValueError):
+            PipelineDAG([Stage('build', 'true', ['test'])])
+        with self.assertRaises(ValueError):
+            PipelineDAG([Stage('build', 'true'), Stage('build', 'true')])
+        with self.assertRaises(ValueError):
+            PipelineDAG([Stage('a', 'true', ['b']), Stage('b', 'true', ['a'])])
+
+    def test_critical_path_follows_slowest_chain(self):
+        """Test the critical path is the longest chain by duration"""
+        dag = PipelineDAG(default_stages())
+        path = dag.critical_path({'checkout': 1, 'unit_tests': 1, 'bandit': 5, 'build': 1})
+
+        self.assertEqual(path[:3], ['checkout', 'bandit', 'build'])
+        self.assertEqual(path[-1], 'integration_tests')
+
+    def test_sequential_chains_every_stage(self):
+        """Test the sequential form depends on the previous stage only"""
+        dag = PipelineDAG(default_stages()).sequential()
+
+        self.assertEqual(dag.stages['coverage'].depends_on, ('unit_tests',))
+        self.assertEqual(dag.critical_path({}), dag.order)
+
+
+class TestPipelineRunner(unittest.TestCase):
+    """Test cases for running stages as subprocesses"""
+
+    def test_independent_stages_run_in_parallel(self):
+        """Test ready stages overlap and the report times them"""
+        dag = PipelineDAG([
+            Stage('lint', _sleep_command(0.3)),
+            Stage('test', _sleep_command(0.3)),
+            Stage('build', _sleep_command(0.05), ['lint', 'test']),
+        ])
+        report = PipelineRunner(max_workers=2).run(dag)
+
+        self.assertEqual(report['status'], 'success')
+        # Overlap saves at least most of one 0.3s sleep
+        self.assertLess(report['wall_time'], report['serial_time'] - 0.2)
+        self.assertGreaterEqual(report['stages']['build']['start'],
+                                report['stages']['lint']['end'])
+        self.assertEqual(report['critical_path'][-1], 'build')
+
+    def test_failure_skips_downstream_only(self):
+        """Test a failed stage skips its dependents but not other branches"""
+        dag = PipelineDAG([
+            Stage('checkout', 'exit 0'),
+            Stage('test', 'exit 3', ['checkout']),
+            Stage('scan', 'exit 0', ['checkout']),
+            Stage('build', 'exit 0', ['test', 'scan']),
+            Stage('deploy', 'exit 0', ['build']),
+        ])
+        report = PipelineRunner().run(dag)
+
+        self.assertEqual(report['status'], 'failed')
+        self.assertEqual(report['stages']['test']['returncode'], 3)
+        self.assertEqual(report['stages']['scan']['status'], 'success')
+        self.assertEqual(report['stages']['build']['status'], 'skipped')
+        self.assertEqual(report['stages']['deploy']['skipped_because'], 'test')
+
+    def test_engine_records_builds(self):
+        """Test local runs are stored in the engine's build history"""
+        engine = CICDPipelineEngine()
+        report = engine.run_local_pipeline('app', default_stages(scale=0.01))
+
+        self.assertEqual(report['build_id'], 'app-1')
+        self.assertIs(engine.builds.get('app-1'), report)
+        self.assertEqual(len(report['stages']), len(default_stages()))
+
+    def test_stage_timeout(self):
+        """Test stages without their own timeout fail after the runner's"""
+        dag = PipelineDAG([Stage('hang', _sleep_command(5)), Stage('after', 'exit 0', ['hang'])])
+        report = PipelineRunner(stage_timeout=0.2).run(dag)
+
+        self.assertEqual(report['stages']['hang']['status'], 'failed')
+        self.assertIn('Timed out after 0.2s', report['stages']['hang']['output'])
+        self.assertEqual(report['stages']['after']['status'], 'skipped')
+
+    def test_stand_in_durations_are_validated_and_capped(self):
+        """Test request-supplied scale and durations are checked and clamped"""
+        stages = {stage.name: stage for stage in default_stages(scale=1e6)}
+        self.assertEqual(stages['build'].command, _sleep_command(MAX_STAND_IN_SECONDS))
+
+        for scale, durations in ((float('nan'), None), (-1, None), ("2", None), (None, None),
+                                 (1, {'build': "1"}), (1, {'build': float('inf')}),
+                                 (1, {'nope': 1}), (1, ['build'])):
+            with self.assertRaises(ValueError):
+                default_stages(scale=scale, durations=durations)
+
+    def test_run_endpoint_rejects_bad_input(self):
+        """Test invalid scale and durations are a 400, not a 500"""
+        client = devops_platform.app.test_client()
+        for body in ({'scale': 'fast'}, {'scale': [1]}, {'durations': {'build': 'slow'}}):
+            response = client.post('/api/pipelines/app/run', json=body)
+            self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Unit tests for agile project management
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import json
+from unittest import mock
+
+import devops_platform
+from devops_platform import AgileProjectManager
+
+
+class TestSprintRollups(unittest.TestCase):
+    """Test cases for incrementally maintained sprint rollups"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_db = tempfile.mktemp(suffix='.db')
+        self.manager = AgileProjectManager(self.test_db)
+        self.sprint_id = self.manager.create_sprint("Rollup Sprint")
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.manager.pool.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.test_db + suffix):
+                os.remove(self.test_db + suffix)
+
+    def test_rollups_follow_story_changes(self):
+        """Test inserts, status changes, point changes and deletes"""
+        story_ids = self.manager.add_user_stories(
+            self.sprint_id, [{'title': f"Story {i}", 'points': 3} for i in range(4)]
+        )
+        self.manager.update_user_story(story_ids[0], status='done')
+        self.manager.update_user_story(story_ids[1], story_points=8)
+        self.manager.delete_user_story(story_ids[2])
+
+        metrics = self.manager.get_sprint_metrics(self.sprint_id)
+
+        self.assertEqual(metrics['story_metrics'], {
+            'backlog': {'count': 2, 'points': 11},
+            'done': {'count': 1, 'points': 3}
+        })
+        self.assertEqual(metrics['total_points'], 14)
+        self.assertEqual(metrics['completed_points'], 3)
+        self.assertEqual(self.manager.check_sprint_rollups(), [])
+
+    def test_empty_status_rows_are_removed(self):
+        """Test a status disappears from the rollup once its last story leaves"""
+        story_id = self.manager.add_user_story(self.sprint_id, "Story", "Description", 5)
+        self.manager.update_user_story(story_id, status='done')
+
+        metrics = self.manager.get_sprint_metrics(self.sprint_id)
+
+        self.assertNotIn('backlog', metrics['story_metrics'])
+        self.assertEqual(metrics['completion_rate'], 100)
+
+    def test_check_and_rebuild_drift(self):
+        """Test drift is reported and repaired by a rebuild"""
+        self.manager.add_user_stories(self.sprint_id, [{'title': "Story", 'points': 2}] * 3)
+        with self.manager.pool.transaction() as conn:
+            conn.execute('UPDATE sprint_rollups SET story_points = 0')
+
+        drift = self.manager.check_sprint_rollups()
+        self.assertEqual(len(drift), 1)
+        self.assertEqual(drift[0]['expected'], {'count': 3, 'points': 6})
+
+        self.manager.rebuild_sprint_rollups()
+        self.assertEqual(self.manager.check_sprint_rollups(), [])
+        self.assertEqual(self.manager.get_sprint_metrics(self.sprint_id)['total_points'], 6)
+
+    def test_update_requires_changes(self):
+        """Test updates without fields are rejected"""
+        story_id = self.manager.add_user_story(self.sprint_id, "Story", "Description")
+        with self.assertRaises(ValueError):
+            self.manager.update_user_story(story_id)
+        self.assertFalse(self.manager.update_user_story(story_id + 100, status='done'))
+
+class TestBurndown(unittest.TestCase):
+    """Test cases for event-sourced burndown data"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_db = tempfile.mktemp(suffix='.db')
+        self.manager = AgileProjectManager(self.test_db)
+        self.sprint_id = self.manager.create_sprint("Burndown Sprint", duration_weeks=1)
+        self.story_ids = self.manager.add_user_stories(
+            self.sprint_id, [{'title': f"Story {i}", 'points': 5} for i in range(4)]
+        )
+        # Move the sprint and its creation events three days into the past
+        with self.manager.pool.transaction() as conn:
+            conn.execute("""
+                UPDATE sprints SET start_date = date('now', 'localtime', '-3 days'),
+                                   end_date = date('now', 'localtime', '+4 days')
+            """)
+            conn.execute("UPDATE story_events SET created_at = datetime('now', '-3 days')")
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.manager.pool.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.test_db + suffix):
+                os.remove(self.test_db + suffix)
+
+    def test_status_changes_are_logged(self):
+        """Test status and point changes append events"""
+        self.manager.update_user_story(self.story_ids[0], status='done')
+        self.manager.update_user_story(self.story_ids[1], story_points=8)
+        self.manager.delete_user_story(self.story_ids[2])
+
+        with self.manager.pool.connection() as conn:
+            events = [row[0] for row in conn.execute(
+                'SELECT event_type FROM story_events WHERE story_id IN (?, ?, ?) ORDER BY id',
+                tuple(self.story_ids[:3])
+            )]
+        self.assertEqual(events, ['created', 'created', 'created', 'updated', 'updated', 'deleted'])
+
+    def test_burndown_replays_events(self):
+        """Test remaining points per day follow the event log"""
+        self.manager.update_user_story(self.story_ids[0], status='done')
+        self.manager.update_user_story(self.story_ids[1], story_points=8)
+
+        burndown = self.manager.get_burndown(self.sprint_id)
+
+        # Open sprints stop at today: start day plus three elapsed days
+        self.assertEqual(len(burndown), 4)
+        self.assertEqual(burndown[0]['remaining_points'], 20)
+        self.assertEqual(burndown[-2]['remaining_points'], 20)
+        self.assertEqual(burndown[-1]['remaining_points'], 18)
+        self.assertEqual(burndown[-1]['total_points'], 23)
+
+    def test_closed_sprint_burndown_is_cached(self):
+        """Test closed sprints run to their close day and are served from cache"""
+        self.manager.close_sprint(self.sprint_id)
+
+        burndown = self.manager.get_burndown(self.sprint_id)
+
+        # Closed today, four days before the planned end
+        self.assertEqual(len(burndown), 4)
+        self.assertIs(self.manager.get_burndown(self.sprint_id), burndown)
+
+        with self.manager.pool.transaction() as conn:
+            conn.execute("UPDATE sprints SET closed_at = NULL")
+        self.manager._burndown_cache.clear()
+        self.assertEqual(len(self.manager.get_burndown(self.sprint_id)), 8)
+
+    def test_closed_sprint_rejects_story_changes(self):
+        """Test stories of a closed sprint can no longer be added, changed or deleted"""
+        self.manager.close_sprint(self.sprint_id)
+        burndown = self.manager.get_burndown(self.sprint_id)
+
+        for write in (lambda: self.manager.update_user_story(self.story_ids[0], status='done'),
+                      lambda: self.manager.delete_user_story(self.story_ids[0]),
+                      lambda: self.manager.add_user_story(self.sprint_id, "Late", ""),
+                      lambda: self.manager.add_user_stories(self.sprint_id, [{'title': "Late"}])):
+            with self.assertRaises(ValueError):
+                write()
+
+        client = devops_platform.app.test_client()
+        with mock.patch.object(devops_platform, 'project_manager', self.manager):
+            patched = client.patch(f'/api/stories/{self.story_ids[0]}', json={'status': 'done'})
+            deleted = client.delete(f'/api/stories/{self.story_ids[0]}')
+        self.assertEqual((patched.status_code, deleted.status_code), (400, 400))
+        self.assertEqual(self.manager.get_sprint_metrics(self.sprint_id)['completed_points'], 0)
+        self.assertEqual(burndown[-1]['remaining_points'], 20)
+
+    def test_unknown_sprint(self):
+        """Test unknown sprints have no burndown"""
+        self.assertEqual(self.manager.get_burndown(self.sprint_id + 100), [])
+
+class TestPortfolioMetrics(unittest.TestCase):
+    """Test cases for multi-sprint portfolio metrics"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_db = tempfile.mktemp(suffix='.db')
+        self.manager = AgileProjectManager(self.test_db)
+        self.sprint_ids = []
+        for i, done_points in enumerate([10, 20, 30]):
+            sprint_id = self.manager.create_sprint(f"Sprint {i}")
+            story_ids = self.manager.add_user_stories(sprint_id, [
+                {'title': "Done", 'points': done_points},
+                {'title': "Open", 'points': 10}
+            ])
+            self.manager.update_user_story(story_ids[0], status='done')
+            self.sprint_ids.append(sprint_id)
+        with self.manager.pool.transaction() as conn:
+            for offset, sprint_id in enumerate(self.sprint_ids):
+                conn.execute("UPDATE sprints SET start_date = date('2026-01-01', ?) WHERE id = ?",
+                             (f"+{offset * 14} days", sprint_id))
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.manager.pool.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.test_db + suffix):
+                os.remove(self.test_db + suffix)
+
+    def test_per_sprint_totals_and_rolling_velocity(self):
+        """Test totals, completion rates and rolling velocity"""
+        metrics = self.manager.get_portfolio_metrics(velocity_window=2)
+        sprints = metrics['sprints']
+
+        self.assertEqual([sprint['sprint_id'] for sprint in sprints], self.sprint_ids)
+        self.assertEqual([sprint['total_points'] for sprint in sprints], [20, 30, 40])
+        self.assertEqual(sprints[2]['completion_rate'], 75)
+        self.assertEqual([sprint['rolling_velocity'] for sprint in sprints], [10, 15, 25])
+        self.assertEqual(metrics['summary']['completed_points'], 60)
+
+    def test_filter_by_ids_and_dates(self):
+        """Test sprint selection by ID list and start date range"""
+        by_ids = self.manager.get_portfolio_metrics(sprint_ids=self.sprint_ids[:2])
+        by_dates = self.manager.get_portfolio_metrics(start_date='2026-01-10', end_date='2026-01-31')
+
+        self.assertEqual(by_ids['summary']['sprint_count'], 2)
+        self.assertEqual([sprint['sprint_id'] for sprint in by_dates['sprints']], self.sprint_ids[1:])
+
+    def test_velocity_is_stored_for_closed_sprints(self):
+        """Test closing a sprint and portfolio reads persist velocity"""
+        self.manager.close_sprint(self.sprint_ids[0])
+        # Closed outside close_sprint, so its velocity was never recorded
+        with self.manager.pool.transaction() as conn:
+            conn.execute("UPDATE sprints SET status = 'closed' WHERE id = ?",
+                         (self.sprint_ids[1],))
+
+        metrics = self.manager.get_portfolio_metrics()
+
+        with self.manager.pool.connection() as conn:
+            velocities = [row[0] for row in conn.execute('SELECT velocity FROM sprints ORDER BY id')]
+        self.assertEqual(velocities, [10, 20, None])
+        self.assertEqual(metrics['summary']['average_velocity'], 15)
+
+    def test_stored_zero_velocity_is_kept(self):
+        """Test a sprint closed with nothing done keeps velocity 0 on later reads"""
+        sprint_id = self.manager.create_sprint("Empty Sprint")
+        story_id = self.manager.add_user_story(sprint_id, "Open", "", 5)
+        self.manager.close_sprint(sprint_id)
+        # Written behind the write guard's back, e.g. by an older release
+        with self.manager.pool.transaction() as conn:
+            conn.execute("UPDATE user_stories SET status = 'done' WHERE id = ?", (story_id,))
+
+        metrics = self.manager.get_portfolio_metrics(sprint_ids=[sprint_id])
+
+        with self.manager.pool.connection() as conn:
+            stored = conn.execute('SELECT velocity FROM sprints WHERE id = ?',
+                                  (sprint_id,)).fetchone()[0]
+        self.assertEqual(stored, 0)
+        self.assertEqual(metrics['sprints'][0]['velocity'], 0)
+        self.assertEqual(metrics['sprints'][0]['rolling_velocity'], 0)
+
+class TestStoryExport(unittest.TestCase):
+    """Test cases for streaming user story export"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_db = tempfile.mktemp(suffix='.db')
+        self.manager = AgileProjectManager(self.test_db)
+        self.sprint_id = self.manager.create_sprint("Export Sprint")
+        self.story_ids = self.manager.add_user_stories(
+            self.sprint_id, [{'title': f"Story {i}"} for i in range(30)]
+        )
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.manager.pool.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.test_db + suffix):
+                os.remove(self.test_db + suffix)
+
+    def test_iterate_and_resume(self):
+        """Test stories stream in id order and resume after an id"""
+        stories = list(self.manager.iter_user_stories(batch_size=7))
+        resumed = list(self.manager.iter_user_stories(after_id=self.story_ids[19]))
+
+        self.assertEqual([story['id'] for story in stories], self.story_ids)
+        self.assertEqual([story['title'] for story in resumed], [f"Story {i}" for i in range(20, 30)])
+
+    def test_ndjson_endpoint(self):
+        """Test the export endpoint emits one JSON document per line"""
+        with mock.patch.object(devops_platform, 'project_manager', self.manager):
+            response = devops_platform.app.test_client().get('/api/export/user_stories?limit=3')
+        lines = response.get_data(as_text=True).splitlines()
+
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertEqual(len(lines), 3)
+        self.assertIn('story_points', json.loads(lines[0]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Unit tests for Prometheus scrape sharding estimates
+"""
+
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from prometheus_sharding import SCRAPE_SERIES_PER_TARGET, estimate_series_per_shard, hashmod
+
+ADDRESSES = [f"10.0.{i // 250}.{i % 250}:8080" for i in range(4000)]
+
+
+class TestPrometheusSharding(unittest.TestCase):
+    """Test cases for hashmod placement and series per shard"""
+
+    def test_hashmod_matches_prometheus(self):
+        """Test the last 8 bytes of the MD5 decide the shard, as in Prometheus"""
+        # md5('foo') = acbd18db4cc2f85cedef654fccc4a4d8
+        self.assertEqual(hashmod('foo', 2 ** 64), 0xedef654fccc4a4d8)
+        self.assertEqual(hashmod('foo', 3), 0xedef654fccc4a4d8 % 3)
+
+    def test_addresses_are_placed_exactly(self):
+        """Test address lists are split as hashmod splits them"""
+        estimate = estimate_series_per_shard({'web-app': ADDRESSES}, 4, series_per_target=95)
+        per_shard = estimate['per_shard']
+        expected = [sum(1 for address in ADDRESSES if hashmod(address, 4) == shard)
+                    for shard in range(4)]
+
+        self.assertEqual([entry['targets'] for entry in per_shard], expected)
+        self.assertEqual(estimate['series'], 4000 * (95 + SCRAPE_SERIES_PER_TARGET))
+        self.assertEqual(estimate['max_shard_series'], max(expected) * 100)
+        self.assertGreater(estimate['imbalance'], 1)
+
+    def test_counts_allow_for_hashing_skew(self):
+        """Test target counts are planned above the even split, close to exact placement"""
+        counted = estimate_series_per_shard({'web-app': 4000}, 4, series_per_target=95)
+        exact = estimate_series_per_shard({'web-app': ADDRESSES}, 4, series_per_target=95)
+
+        self.assertEqual(counted['per_shard'][0]['series'], 100000)
+        self.assertGreater(counted['max_shard_series'], 100000)
+        self.assertLess(abs(counted['max_shard_series'] - exact['max_shard_series']), 2000)
+        single = estimate_series_per_shard({'web-app': 4000}, 1, series_per_target=95)
+        self.assertEqual(single['max_shard_series'], 400000)
+
+    def test_recommended_shards(self):
+        """Test the fewest shards within max_series_per_shard is recommended"""
+        estimate = estimate_series_per_shard({'web-app': 5000, 'nodes': 200}, 1,
+                                             series_per_target={'nodes': 3000},
+                                             max_series_per_shard=1000000)
+        shards = estimate['recommended_shards']
+
+        fits = estimate_series_per_shard({'web-app': 5000, 'nodes': 200}, shards,
+                                         series_per_target={'nodes': 3000})
+        fewer = estimate_series_per_shard({'web-app': 5000, 'nodes': 200}, shards - 1,
+                                          series_per_target={'nodes': 3000})
+        self.assertLessEqual(fits['max_shard_series'], 1000000)
+        self.assertGreater(fewer['max_shard_series'], 1000000)
+        too_big = estimate_series_per_shard({'web-app': 10}, 1, series_per_target=2000,
+                                            max_series_per_shard=1000)
+        self.assertIsNone(too_big['recommended_shards'])
+
+    def test_invalid_input(self):
+        """Test invalid shard counts and targets raise ValueError"""
+        for targets, shards in (({'web-app': 10}, 0), ({'web-app': 10}, True), ({}, 2),
+                                ({'web-app': -1}, 2), ({'web-app': [1, 2]}, 2)):
+            with self.assertRaises(ValueError):
+                estimate_series_per_shard(targets, shards)
+        with self.assertRaises(ValueError):
+            estimate_series_per_shard({'web-app': 10}, 2, series_per_target=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
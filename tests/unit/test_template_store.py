@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the content-addressed template store
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from devops_platform import InfrastructureAsCode
+from template_store import TemplateStore
+
+
+class TestTemplateStore(unittest.TestCase):
+    """Test cases for deduplicated template storage"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_projects_share_blobs(self):
+        """Test generated modules differing only in the name are stored once"""
+        iac = InfrastructureAsCode()
+        rendered = {name: iac.create_terraform_infrastructure(name)
+                    for name in ('web-app', 'api-gateway', 'billing-service')}
+
+        self.assertEqual(len(iac.templates), 3)
+        self.assertEqual(iac.templates.stats()['blobs'], 3)
+        for name, files in rendered.items():
+            stored = iac.templates.get(name)
+            self.assertEqual((stored['main.tf'], stored['variables.tf'], stored['outputs.tf']), files)
+            self.assertIn('created_at', stored)
+
+    def test_name_not_factored_out_unless_it_round_trips(self):
+        """Test contents are returned exactly even when the name is a common substring"""
+        store = TemplateStore()
+        store.put('a', {'main.tf': 'resource "aws_vpc" "a" {}'})
+        store.put('b', {'main.tf': 'value = "\0"'})
+
+        self.assertEqual(store.get('a')['main.tf'], 'resource "aws_vpc" "a" {}')
+        self.assertEqual(store.get('b')['main.tf'], 'value = "\0"')
+        self.assertIsNone(store.get('missing'))
+
+    def test_unreferenced_blobs_are_dropped(self):
+        """Test replacing and removing projects releases blobs nobody uses"""
+        store = TemplateStore(self.root)
+        store.put('web', {'main.tf': 'one', 'outputs.tf': 'shared'})
+        store.put('api', {'main.tf': 'two', 'outputs.tf': 'shared'})
+        store.put('web', {'main.tf': 'three', 'outputs.tf': 'shared'})
+        self.assertEqual(store.stats()['blobs'], 3)
+
+        self.assertTrue(store.remove('api'))
+        self.assertFalse(store.remove('api'))
+        self.assertEqual(store.stats()['blobs'], 2)
+        self.assertEqual(len(os.listdir(os.path.join(self.root, 'objects'))), 2)
+
+    def test_persisted_store_reloads(self):
+        """Test a store under root is restored by a new instance"""
+        store = TemplateStore(self.root)
+        store.put('web', {'main.tf': 'module "web" {}', 'outputs.tf': 'shared'})
+
+        reloaded = TemplateStore(self.root)
+        self.assertIn('web', reloaded)
+        self.assertEqual(reloaded.get('web')['main.tf'], 'module "web" {}')
+        self.assertEqual(reloaded.get('web')['created_at'], store.get('web')['created_at'])
+
+    def test_resident_blobs_are_capped(self):
+        """Test least recently used blobs are evicted and reloaded on demand"""
+        store = TemplateStore(max_resident_bytes=250)
+        for i in range(5):
+            store.put(f"p{i}", {'main.tf': f"{i}" * 100})
+
+        stats = store.stats()
+        self.assertLessEqual(stats['resident_bytes'], 250)
+        self.assertEqual(stats['evictions'], 3)
+        self.assertEqual(store.get('p0')['main.tf'], '0' * 100)
+        self.assertEqual(store.stats()['misses'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Unit tests for Terraform dependency analysis
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import devops_platform
+from devops_platform import InfrastructureAsCode
+from terraform_analysis import TerraformGraph, analyze, parse_resources
+
+NETWORK_TF = '''
+# resource "aws_vpc" "commented_out" { }
+resource "aws_vpc" "main" {
+  cidr_block = "10.0.0.0/16"
+  tags = {
+    Name = "${var.project_name}-vpc"
+  }
+}
+
+data "aws_availability_zones" "available" {
+  state = "available"
+}
+
+resource "aws_subnet" "app" {
+  count             = 3
+  vpc_id            = aws_vpc.main.id
+  availability_zone = data.aws_availability_zones.available.names[count.index]
+  tags = {
+    Name = "app-${count.index + 1}-{literal}"
+  }
+}
+
+resource "aws_instance" "web" {
+  subnet_id  = aws_subnet.app[0].id
+  depends_on = [aws_security_group.web]
+}
+'''
+
+
+class TestTerraformAnalysis(unittest.TestCase):
+    """Test cases for the resource graph and parallelism report"""
+
+    def test_parse_references_and_counts(self):
+        """Test references, depends_on and count are read from each block"""
+        resources = parse_resources(NETWORK_TF)
+
+        self.assertEqual(list(resources), ['aws_vpc.main', 'data.aws_availability_zones.available',
+                                           'aws_subnet.app', 'aws_instance.web'])
+        self.assertEqual(resources['aws_subnet.app']['instances'], 3)
+        self.assertEqual(resources['aws_subnet.app']['depends_on'],
+                         ['aws_vpc.main', 'data.aws_availability_zones.available'])
+        self.assertEqual(resources['aws_instance.web']['depends_on'],
+                         ['aws_security_group.web', 'aws_subnet.app'])
+
+    def test_string_literals_are_not_references(self):
+        """Test quoted text is skipped while interpolated expressions still count"""
+        resources = parse_resources('''
+resource "aws_instance" "web" {
+  ami  = "ami_base.v2-${data.aws_ami.base.id}"
+  tags = {
+    Name = "web_app.prod-web"
+    Note = "escaped \\" quote aws_x.y ${aws_subnet.app[0].id == "a_b.c" ? 1 : 2}"
+    Raw  = "$${aws_literal.only}"
+  }
+}
+''')
+
+        self.assertEqual(resources['aws_instance.web']['depends_on'],
+                         ['aws_subnet.app', 'data.aws_ami.base'])
+
+    def test_dotted_project_name_adds_no_resources(self):
+        """Test a project name like web_app.prod in resource names is not read as a reference"""
+        iac = InfrastructureAsCode()
+        dotted = iac.analyze_terraform('web_app.prod')
+        plain = iac.analyze_terraform('web')
+
+        self.assertEqual([r['address'] for r in dotted['resources']],
+                         [r['address'] for r in plain['resources']])
+        self.assertEqual(dotted['critical_path'], plain['critical_path'])
+        self.assertEqual(dotted['estimated_apply_seconds'], plain['estimated_apply_seconds'])
+
+    def test_undeclared_references_are_reported(self):
+        """Test referenced but undeclared resources become leaf nodes"""
+        graph = TerraformGraph.from_hcl(NETWORK_TF)
+
+        self.assertEqual(graph.undeclared, ['aws_security_group.web'])
+        self.assertFalse(graph.resources['aws_security_group.web']['declared'])
+        self.assertLess(graph.order.index('aws_security_group.web'),
+                        graph.order.index('aws_instance.web'))
+
+    def test_cycle_is_rejected(self):
+        """Test a dependency cycle raises ValueError"""
+        cyclic = '''
+resource "aws_a" "x" { depends_on = [aws_b.y] }
+resource "aws_b" "y" { depends_on = [aws_a.x] }
+'''
+        with self.assertRaises(ValueError):
+            TerraformGraph.from_hcl(cyclic)
+
+    def test_depth_width_and_critical_path(self):
+        """Test the report's graph shape and critical path"""
+        durations = {'aws_vpc': 10, 'aws_subnet': 20, 'aws_instance': 30,
+                     'aws_security_group': 5, 'data': 1}
+        report = analyze(NETWORK_TF, durations)
+
+        self.assertEqual(report['depth'], 3)
+        self.assertEqual(report['width_by_level'], [3, 3, 1])
+        self.assertEqual(report['width'], 3)
+        self.assertEqual(report['critical_path'],
+                         ['aws_vpc.main', 'aws_subnet.app', 'aws_instance.web'])
+        self.assertEqual(report['critical_path_seconds'], 60.0)
+        self.assertEqual(report['serial_seconds'], 106.0)
+
+    def test_recommended_parallelism(self):
+        """Test the smallest parallelism reaching the critical path is recommended"""
+        report = analyze(NETWORK_TF, {'aws_vpc': 10, 'aws_subnet': 20, 'aws_instance': 30})
+
+        self.assertEqual(report['recommended_parallelism'], 3)
+        self.assertEqual(report['estimated_apply_seconds']['recommended_parallelism'],
+                         report['critical_path_seconds'])
+        self.assertEqual(report['estimated_apply_seconds']['serial'], report['serial_seconds'])
+
+    def test_generated_module_report(self):
+        """Test the analysis endpoint reports on the generated main.tf"""
+        client = devops_platform.app.test_client()
+        with mock.patch.object(devops_platform, 'iac_manager', InfrastructureAsCode()):
+            response = client.post('/api/infrastructure/analysis', json={'project_name': 'web'})
+            invalid = client.post('/api/infrastructure/analysis',
+                                  json={'project_name': 'web', 'durations': {'aws_vpc': -1}})
+
+        self.assertEqual(response.status_code, 200)
+        analysis = response.get_json()['analysis']
+        self.assertEqual(analysis['critical_path'][-1], 'aws_eks_node_group.main')
+        self.assertIn('aws_iam_role.cluster', analysis['undeclared_references'])
+        self.assertLessEqual(analysis['estimated_apply_seconds']['default_parallelism'],
+                             analysis['estimated_apply_seconds']['serial'])
+        self.assertEqual(invalid.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()